@@ -1,12 +1,13 @@
 import os
-import yaml
 
-BASE_PATH = os.path.join("vault", "adventures")
+WORLD_ENTITY_TYPES = ["npcs", "factions", "locations", "story_lines"]
 
-def load_yaml(path):
-    if not os.path.exists(path): return {}
-    with open(path, "r") as f:
-        return yaml.safe_load(f) or {}
+def load_document(read, *args):
+    # Missing or unreadable documents leave a gap in the context rather than failing the narration
+    try:
+        return read(*args) or {}
+    except Exception:
+        return {}
 
 def merge_custom_fields(data):
     if "custom_fields" in data and isinstance(data["custom_fields"], dict):
@@ -16,41 +17,39 @@ def merge_custom_fields(data):
         del data["custom_fields"]
     return data
 
-def build_adventure_context(adventure_name):
-    base = os.path.join(BASE_PATH, adventure_name)
+def build_adventure_context(adventure_name, data_access):
+    # data_access is the caller's adventure data access object (YAML or SQLite engine),
+    # so the configured storage is honoured without scripts/ depending on server/
 
-    # Core files
-    world_state = load_yaml(os.path.join(base, "world_state.yaml"))
-    player_index = load_yaml(os.path.join(base, "player_states.yaml"))
-    session_data = load_yaml(os.path.join(base, "active_session.yaml"))
+    # Core documents; the active session includes log entries not yet compacted
+    world_state = load_document(data_access.get_world_state, adventure_name)
+    player_index = load_document(data_access.get_player_states, adventure_name)
+    session_data = load_document(data_access.get_active_session, adventure_name)
 
     # Expand player details
     players = []
     for filename in player_index.get("players", []):
-        path = os.path.join(base, "players", filename)
-        data = load_yaml(path)
+        data = load_document(data_access.get_player, adventure_name, filename)
+        data.pop("filename", None)
         players.append(merge_custom_fields(data))
 
     # Expand world references
-    def load_entity(folder):
-        path = os.path.join(base, "world", folder)
-        if not os.path.exists(path): return {}
+    def load_entity(entity_type):
+        filenames = load_document(data_access.list_world_entities, adventure_name, entity_type)
         return {
-            os.path.splitext(f)[0]: merge_custom_fields(load_yaml(os.path.join(path, f)))
-            for f in os.listdir(path) if f.endswith(".yaml")
+            os.path.splitext(f)[0]: merge_custom_fields(
+                load_document(data_access.get_world_entity, adventure_name, entity_type, f))
+            for f in filenames
         }
 
-    npcs = load_entity("npcs")
-    factions = load_entity("factions")
-    locations = load_entity("locations")
-    story_lines = load_entity("story_lines")
+    entities = {entity_type: load_entity(entity_type) for entity_type in WORLD_ENTITY_TYPES}
 
     return {
         "session": session_data,
         "world": world_state,
         "players": players,
-        "npcs": npcs,
-        "factions": factions,
-        "locations": locations,
-        "story_lines": story_lines
+        "npcs": entities["npcs"],
+        "factions": entities["factions"],
+        "locations": entities["locations"],
+        "story_lines": entities["story_lines"]
     }
@@ -1,12 +1,13 @@
-import yaml
 import random
+from scripts.utils.yaml_codec import load_file
+from scripts.utils.dice import roll_parsed_dice
+from scripts.utils.monster_stats import normalize_monster
 
 _current_combat_state = {}
 
 
 def load_player_combat_data(path):
-    with open(path, 'r') as f:
-        data = yaml.safe_load(f)
+    data = load_file(path)
 
     return [
         {
@@ -23,21 +24,22 @@ def load_player_combat_data(path):
 
 
 def load_monster_data(monster_names):
-    with open("vault/lookup/monsters/monsters.yaml", 'r') as f:
-        monsters = yaml.safe_load(f)["entries"]
+    monsters = load_file("vault/lookup/monsters/monsters.yaml")["entries"]
 
     enemies = []
     for name in monster_names:
         m = next((m for m in monsters if m["name"] == name), None)
         if m:
-            hp = int(m["hit_dice"].split('(')[1].split('hp')[0])  # crude hp extract
+            stats = normalize_monster(m)["stats"]
             enemies.append({
                 "name": m["name"],
                 "type": "monster",
-                "ac": m["armor_class"],
-                "hp": hp,
+                # Hits are resolved against ascending AC when the stat block gives one
+                "ac": stats["aac"] if stats["aac"] is not None else stats["ac"],
+                "hp": stats["hp"] if stats["hp"] is not None else 1,
                 "to_hit": m.get("to_hit", 0),
                 "damage": m["attacks"],
+                "attacks": stats["attacks"],
                 "morale": m.get("morale", 7),
             })
     return enemies
@@ -72,7 +74,9 @@ def resolve_attack(attacker, defender):
     }
 
     if hit:
-        damage = random.randint(1, 6)  # temp default
+        # First attack with parsed damage dice; d6 for players and unparsed attacks
+        dice = next((a["damage"] for a in attacker.get("attacks", []) if a.get("damage")), None)
+        damage = roll_parsed_dice(dice) if dice else random.randint(1, 6)
         defender["hp"] -= damage
         result["damage"] = damage
         result["defender_hp"] = defender["hp"]
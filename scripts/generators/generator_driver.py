@@ -21,7 +21,7 @@ def roll_from_yaml(path, table_id, return_entry=False):
     table = get_table_by_id(data, table_id)
     if not table:
         raise ValueError(f"Table with id '{table_id}' not found in {path}.")
-    return roll_on_table(table, return_entry)
+    return roll_on_table(table, return_entry, source=path)
 
 
 def get_all_tables(path):
@@ -11,6 +11,32 @@ def log_to_session(content, session_type="lookup"):
     except ImportError:
         print(f"Session logging not available: {content}")
 
+RULE_CONTEXT_MAX_CHARS = 1200
+
+def retrieve_rule_context(question, system=None, k=3):
+    """
+    Rule sections closest in meaning to question, formatted for a prompt.
+    Each section is headed by its breadcrumbs and cut to RULE_CONTEXT_MAX_CHARS.
+    Returns an empty string when no sections match or the rule index is unavailable.
+    """
+    try:
+        from server.data_access.rules_data import RuleDataAccess
+        sections = RuleDataAccess().semantic_search_rules(question, system=system, limit=k)
+    except Exception as e:
+        print(f"Rule retrieval not available: {e}")
+        return ""
+    return "\n\n".join(
+        f"[{' > '.join(section['breadcrumbs'])}]\n{section['content'].strip()[:RULE_CONTEXT_MAX_CHARS]}"
+        for section in sections
+    )
+
+def _rules_prompt(question, **kwargs):
+    """Relevant rules block for narrate_* prompts called with rules=True (and optionally system=...)"""
+    if not kwargs.get("rules"):
+        return ""
+    rule_context = retrieve_rule_context(question, system=kwargs.get("system"))
+    return f"Relevant rules:\n{rule_context}\n" if rule_context else ""
+
 def narrate_yesno(question, result, context=None, **kwargs):
     llm = get_llm()
 
@@ -26,7 +52,7 @@ When there is an exceptional result the answer should take the yes and approach,
 Question: {question}
 Answer: {result}
 Adventure context: {context}
-"""
+{_rules_prompt(question, **kwargs)}"""
     response = llm(prompt, max_tokens=500)
     result_text = response["choices"][0]["text"].strip()
     
@@ -73,7 +99,7 @@ And the oracle generated you these keywords: {keyword_str}. Feel free to use onl
 
 Keep your response just to answering the question but do so with flavor inspired by the keywords and any of the following context.
 {context}
-"""
+{_rules_prompt(question, **kwargs)}"""
     # response = llm(prompt, max_tokens=250, stop=["\n\n"])
     response = llm(prompt, max_tokens=300) 
     result_text = response["choices"][0]["text"].strip()
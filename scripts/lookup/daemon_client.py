@@ -0,0 +1,60 @@
+"""
+Thin client for the lookup daemon
+
+The lookup CLIs call query_daemon() first; it returns None when no daemon is
+listening so they fall back to loading the vault in-process. Only the
+standard library is imported here to keep CLI startup cheap.
+
+Request and response are one JSON document per line:
+    {"command": "lookup", "domain": "monsters", "cwd": "...", "filters": {...}}
+    {"ok": true, "results": [...]}
+"""
+
+import os
+import json
+import socket
+import tempfile
+
+SOCKET_ENV = "ORACLE_FORGE_LOOKUP_SOCKET"
+CONNECT_TIMEOUT = 0.5
+RESPONSE_TIMEOUT = 30.0
+
+
+def get_socket_path():
+    """Socket the daemon listens on: $ORACLE_FORGE_LOOKUP_SOCKET or a per-user temp path"""
+    return os.environ.get(SOCKET_ENV) or os.path.join(
+        tempfile.gettempdir(), f"oracle-forge-lookup-{os.getuid()}.sock"
+    )
+
+
+def send_request(request, socket_path=None):
+    """Send one request and return the decoded response; raises OSError if the daemon is unreachable"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(CONNECT_TIMEOUT)
+        sock.connect(socket_path or get_socket_path())
+        sock.settimeout(RESPONSE_TIMEOUT)
+        sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as stream:
+            line = stream.readline()
+    if not line:
+        raise ConnectionError("lookup daemon closed the connection")
+    return json.loads(line)
+
+
+def query_daemon(domain, filters=None, path=None, socket_path=None):
+    """
+    Look up records through the daemon
+
+    Returns the matching records, or None when the daemon is not running
+    or failed, in which case the caller should search in-process.
+    """
+    request = {"command": "lookup", "domain": domain, "cwd": os.getcwd(), "filters": filters or {}}
+    if path:
+        request["path"] = path
+    try:
+        response = send_request(request, socket_path)
+    except (OSError, ValueError):
+        return None
+    if not response.get("ok"):
+        return None
+    return response["results"]
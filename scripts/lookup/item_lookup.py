@@ -1,4 +1,3 @@
-import yaml
 import json
 import argparse
 import os
@@ -6,9 +5,16 @@ import glob
 import random
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from llm.flavoring import narrate_items
+from utils.yaml_codec import load_file
+from lookup.daemon_client import query_daemon
 
-def load_items_from_directory(directory="vault/lookup/items/"):
+ITEMS_PATH = "vault/lookup/items/"
+
+def item_files(directory=ITEMS_PATH):
+    """YAML files the items are loaded from"""
+    return sorted(glob.glob(os.path.join(directory, "*.yaml")))
+
+def load_items_from_directory(directory=ITEMS_PATH):
     """Load all items from all YAML files in the items directory."""
     all_items = []
     
@@ -16,14 +22,11 @@ def load_items_from_directory(directory="vault/lookup/items/"):
         return all_items
     
     # Find all YAML files in the items directory
-    yaml_files = glob.glob(os.path.join(directory, "*.yaml"))
-    
-    for file_path in yaml_files:
+    for file_path in item_files(directory):
         try:
-            with open(file_path, "r") as f:
-                data = yaml.safe_load(f)
-                if data and "entries" in data:
-                    all_items.extend(data["entries"])
+            data = load_file(file_path)
+            if data and "entries" in data:
+                all_items.extend(data["entries"])
         except Exception as e:
             print(f"Warning: Could not load {file_path}: {e}")
     
@@ -38,6 +41,30 @@ def find_items(query, items):
            query in item.get("description", "").lower()
     ]
 
+def filter_items(items, query=None, category=None, subcategory=None, system=None, tag=None):
+    """Apply the CLI's text, category, subcategory, system and tag filters"""
+    matches = items
+
+    if query:
+        matches = find_items(query, matches)
+
+    if category:
+        matches = [i for i in matches if i.get("category", "").lower() == category.lower()]
+
+    if subcategory:
+        matches = [i for i in matches if i.get("subcategory", "").lower() == subcategory.lower()]
+
+    if system:
+        matches = [i for i in matches if system.lower() in i.get("system", "").lower()]
+
+    if tag:
+        tag_query = tag.lower()
+        matches = [
+            i for i in matches
+            if any(tag_query in t.lower() for t in i.get("tags", []))
+        ]
+    return matches
+
 def get_random_items(items, count=1):
     """Get a random selection of items from the provided list."""
     if not items:
@@ -126,30 +153,15 @@ if __name__ == "__main__":
     parser.add_argument("--theme", type=str, help="Apply thematic flavoring (e.g., elven, dwarven, orcish)")
     parser.add_argument("--context", type=str, help="Player context for flavoring")
     parser.add_argument("--narrate", action="store_true", help="Generate LLM narration for results")
+    parser.add_argument("--no-daemon", action="store_true", help="Search in-process even if the lookup daemon is running")
 
     args = parser.parse_args()
 
-    items = load_items_from_directory()
-    matches = items
-
-    if args.query:
-        matches = find_items(args.query, matches)
-
-    if args.category:
-        matches = [i for i in matches if i.get("category", "").lower() == args.category.lower()]
-
-    if args.subcategory:
-        matches = [i for i in matches if i.get("subcategory", "").lower() == args.subcategory.lower()]
-
-    if args.system:
-        matches = [i for i in matches if args.system.lower() in i.get("system", "").lower()]
-
-    if args.tag:
-        tag_query = args.tag.lower()
-        matches = [
-            i for i in matches
-            if any(tag_query in t.lower() for t in i.get("tags", []))
-        ]
+    filters = {"query": args.query, "category": args.category, "subcategory": args.subcategory,
+               "system": args.system, "tag": args.tag}
+    matches = None if args.no_daemon else query_daemon("items", filters)
+    if matches is None:
+        matches = filter_items(load_items_from_directory(), **filters)
 
     # Apply random selection if requested
     if args.random and args.random > 0:
@@ -159,7 +171,8 @@ if __name__ == "__main__":
         print("No match found.")
     else:
         if args.narrate:
-            # Generate LLM narration
+            # Generate LLM narration; imported here since loading the LLM stack is slow
+            from llm.flavoring import narrate_items
             narration = narrate_items(
                 matches, 
                 context=args.context,
@@ -0,0 +1,215 @@
+"""
+Long-lived lookup daemon for the scripts/lookup CLIs
+
+Each CLI invocation used to re-read the monster, spell and item YAML and
+the rule markdown before filtering. The daemon keeps the parsed sources in
+memory and answers lookups over a Unix socket, so a CLI run in a shell loop
+only pays for its own startup and one round trip.
+
+Sources are cached per absolute path and re-read when a file's
+(st_mtime_ns, st_size) changes or files are added or removed, so edits
+made while the daemon runs are picked up on the next lookup. Relative
+vault paths are resolved against the client's working directory.
+
+Usage:
+    python scripts/lookup/lookup_daemon.py start    # serve in the background
+    python scripts/lookup/lookup_daemon.py serve    # serve in the foreground
+    python scripts/lookup/lookup_daemon.py status
+    python scripts/lookup/lookup_daemon.py stop
+
+The socket defaults to a per-user path in the temp directory; set
+ORACLE_FORGE_LOOKUP_SOCKET to override it. The CLIs fall back to searching
+in-process when nothing is listening.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import subprocess
+import socketserver
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from lookup.daemon_client import get_socket_path, send_request
+from lookup import monster_lookup, spell_lookup, item_lookup, rule_search
+
+START_TIMEOUT = 10.0
+
+
+def _single_file(path):
+    return [path] if os.path.isfile(path) else []
+
+
+# domain -> (default path, list source files, load records, filter records)
+DOMAINS = {
+    "monsters": (monster_lookup.MONSTERS_PATH, _single_file,
+                 monster_lookup.load_monsters, monster_lookup.filter_monsters),
+    "spells": (spell_lookup.SPELLS_PATH, _single_file,
+               spell_lookup.load_spells, spell_lookup.filter_spells),
+    "items": (item_lookup.ITEMS_PATH, item_lookup.item_files,
+              item_lookup.load_items_from_directory, item_lookup.filter_items),
+    "rules": (rule_search.VAULT_PATH, rule_search.rule_files,
+              rule_search.load_rules, rule_search.filter_rules),
+}
+
+
+class SourceCache:
+    """Parsed lookup sources keyed by (domain, absolute path), reloaded when their files change"""
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.loads = 0
+
+    @staticmethod
+    def _signature(files):
+        signature = []
+        for file_path in files:
+            try:
+                st = os.stat(file_path)
+            except OSError:
+                continue
+            signature.append((file_path, st.st_mtime_ns, st.st_size))
+        return tuple(signature)
+
+    def get(self, domain, path):
+        _, list_files, load, _ = DOMAINS[domain]
+        signature = self._signature(list_files(path))
+        key = (domain, path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == signature:
+                self.hits += 1
+                return entry[1]
+            records = load(path) if signature else []
+            self._entries[key] = (signature, records)
+            self.loads += 1
+            return records
+
+    def stats(self):
+        with self._lock:
+            return {"sources": len(self._entries), "hits": self.hits, "loads": self.loads}
+
+
+class LookupRequestHandler(socketserver.StreamRequestHandler):
+    """Answers one JSON request per connection"""
+
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return
+        try:
+            response = self.server.dispatch(json.loads(line))
+        except Exception as e:
+            response = {"ok": False, "error": str(e)}
+        self.wfile.write(json.dumps(response, default=str).encode("utf-8") + b"\n")
+        self.wfile.flush()
+        if response.get("stopping"):
+            # Stop only after answering, or the client sees a dropped connection
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+
+
+class LookupDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix socket server answering lookups from the hot source cache"""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path):
+        self.socket_path = socket_path
+        self.cache = SourceCache()
+        self.started_at = time.time()
+        super().__init__(socket_path, LookupRequestHandler)
+
+    def dispatch(self, request):
+        command = request.get("command")
+        if command == "ping":
+            return {"ok": True, "pid": os.getpid(), "uptime": round(time.time() - self.started_at, 1),
+                    "cache": self.cache.stats()}
+        if command == "shutdown":
+            return {"ok": True, "stopping": True}
+        if command == "lookup":
+            domain = request.get("domain")
+            if domain not in DOMAINS:
+                return {"ok": False, "error": f"Unknown lookup domain: {domain}"}
+            default_path, _, _, filter_records = DOMAINS[domain]
+            path = os.path.join(request.get("cwd") or os.getcwd(), request.get("path") or default_path)
+            records = self.cache.get(domain, os.path.abspath(path))
+            return {"ok": True, "results": filter_records(records, **request.get("filters", {}))}
+        return {"ok": False, "error": f"Unknown command: {command}"}
+
+
+def _ping(socket_path):
+    try:
+        return send_request({"command": "ping"}, socket_path)
+    except (OSError, ValueError):
+        return None
+
+
+def serve(socket_path):
+    """Serve until stopped; replaces a stale socket file left by a crashed daemon"""
+    if os.path.exists(socket_path):
+        if _ping(socket_path):
+            print(f"Lookup daemon already running on {socket_path}")
+            return 1
+        os.unlink(socket_path)
+
+    server = LookupDaemon(socket_path)
+    print(f"Lookup daemon listening on {socket_path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+    return 0
+
+
+def start(socket_path):
+    """Start serving in a detached process and wait until it answers"""
+    if _ping(socket_path):
+        print(f"Lookup daemon already running on {socket_path}")
+        return 0
+    subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "serve", "--socket", socket_path],
+        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    deadline = time.monotonic() + START_TIMEOUT
+    while time.monotonic() < deadline:
+        status = _ping(socket_path)
+        if status:
+            print(f"Lookup daemon started on {socket_path} (pid {status['pid']})")
+            return 0
+        time.sleep(0.1)
+    print(f"Lookup daemon did not start on {socket_path}")
+    return 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Lookup daemon for the monster, spell, item and rule CLIs")
+    parser.add_argument("command", choices=["start", "serve", "status", "stop"])
+    parser.add_argument("--socket", type=str, help="Unix socket path (default: $ORACLE_FORGE_LOOKUP_SOCKET "
+                                                   "or a per-user temp path)")
+    args = parser.parse_args()
+    socket_path = args.socket or get_socket_path()
+
+    if args.command == "serve":
+        sys.exit(serve(socket_path))
+    if args.command == "start":
+        sys.exit(start(socket_path))
+
+    status = _ping(socket_path)
+    if status is None:
+        print(f"Lookup daemon not running on {socket_path}")
+        sys.exit(1)
+    if args.command == "stop":
+        send_request({"command": "shutdown"}, socket_path)
+        print(f"Stopped lookup daemon (pid {status['pid']})")
+    else:
+        print(f"Lookup daemon running on {socket_path} (pid {status['pid']}, up {status['uptime']}s, "
+              f"cache {status['cache']})")
+    sys.exit(0)
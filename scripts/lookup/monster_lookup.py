@@ -1,16 +1,19 @@
-import yaml
 import json
 import argparse
 import random
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from llm.flavoring import narrate_monsters
+from utils.yaml_codec import load_file
+from lookup.daemon_client import query_daemon
+from utils.dice import roll_parsed_dice
+from utils.monster_stats import normalize_monster
 
-def load_monsters(path="vault/lookup/monsters/monsters.yaml"):
-    with open(path, "r") as f:
-        data = yaml.safe_load(f)
-    return data["entries"]
+MONSTERS_PATH = "vault/lookup/monsters/monsters.yaml"
+
+def load_monsters(path=MONSTERS_PATH):
+    data = load_file(path)
+    return [normalize_monster(m) for m in data["entries"]]
 
 def find_monster(name_query, monsters):
     name_query = name_query.strip().lower()
@@ -19,6 +22,27 @@ def find_monster(name_query, monsters):
         if name_query in m.get("name", "").lower()
     ]
 
+def filter_monsters(monsters, query=None, system=None, tag=None):
+    """Apply the CLI's name, system and tag filters"""
+    matches = monsters
+
+    if query:
+        matches = find_monster(query, matches)
+
+    if system:
+        matches = [
+            m for m in matches
+            if system.lower() in m.get("system", "").lower()
+        ]
+    
+    if tag:
+        tag_query = tag.lower()
+        matches = [
+            m for m in matches
+            if any(tag_query in t.lower() for t in m.get("tags", []))
+        ]
+    return matches
+
 def get_random_monsters(monsters, count=1):
     """Get a random selection of monsters from the provided list."""
     if not monsters:
@@ -27,13 +51,12 @@ def get_random_monsters(monsters, count=1):
     count = min(count, len(monsters))
     return random.sample(monsters, count)
 
-def roll_number_appearing(monster):
-    import re
-    match = re.search(r"(\d+)d(\d+)(?:\s*\((\d+)d(\d+)\))?", monster["number_appearing"])
-    if match:
-        d1, d2 = int(match.group(1)), int(match.group(2))
-        return sum(random.randint(1, d2) for _ in range(d1))
-    return 1
+def roll_number_appearing(monster, lair=False):
+    """Roll the wandering (or lair) number appearing from the parsed stats"""
+    if "stats" not in monster:
+        normalize_monster(monster)
+    dice = monster["stats"]["number_appearing"]["lair" if lair else "wandering"]
+    return roll_parsed_dice(dice) if dice else 1
 
 def display_monster(monster, as_json=False):
     def trait_to_str(trait):
@@ -63,7 +86,8 @@ def display_monster(monster, as_json=False):
             "alignment": monster.get("alignment"),
             "tags": monster.get("tags", []),
             "system": monster.get("system", ""),
-            "source": monster.get("source", "")
+            "source": monster.get("source", ""),
+            "stats": monster.get("stats")
         }
     else:
         return f"""{monster['name']} ({monster['hit_dice']} HD)
@@ -88,27 +112,14 @@ if __name__ == "__main__":
     parser.add_argument("--theme", type=str, help="Apply thematic flavoring (e.g., elven, dwarven, orcish)")
     parser.add_argument("--context", type=str, help="Player context for flavoring")
     parser.add_argument("--narrate", action="store_true", help="Generate LLM narration for results")
+    parser.add_argument("--no-daemon", action="store_true", help="Search in-process even if the lookup daemon is running")
 
     args = parser.parse_args()
 
-    monsters = load_monsters()
-    matches = monsters
-
-    if args.query:
-        matches = find_monster(args.query, matches)
-
-    if args.system:
-        matches = [
-            m for m in matches
-            if args.system.lower() in m.get("system", "").lower()
-        ]
-    
-    if args.tag:
-        tag_query = args.tag.lower()
-        matches = [
-            m for m in matches
-            if any(tag_query in t.lower() for t in m.get("tags", []))
-        ]
+    filters = {"query": args.query, "system": args.system, "tag": args.tag}
+    matches = None if args.no_daemon else query_daemon("monsters", filters)
+    if matches is None:
+        matches = filter_monsters(load_monsters(), **filters)
 
     # Apply random selection if requested
     if args.random and args.random > 0:
@@ -118,7 +129,8 @@ if __name__ == "__main__":
         print("No match found.")
     else:
         if args.narrate:
-            # Generate LLM narration
+            # Generate LLM narration; imported here since loading the LLM stack is slow
+            from llm.flavoring import narrate_monsters
             narration = narrate_monsters(
                 matches, 
                 context=args.context,
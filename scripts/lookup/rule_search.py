@@ -1,6 +1,9 @@
 import os
+import sys
 import argparse
-import yaml
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils import yaml_codec
+from lookup.daemon_client import query_daemon
 
 VAULT_PATH = "vault/lookup/rules/"
 
@@ -11,46 +14,66 @@ def parse_frontmatter(text):
             front = text[3:end].strip()
             body = text[end + 3:].strip()
             try:
-                data = yaml.safe_load(front)
+                data = yaml_codec.load(front)
                 return data, body
-            except yaml.YAMLError:
+            except yaml_codec.YAMLError:
                 return {}, text
     return {}, text
 
-def search_rules(query=None, system=None, tag=None):
-    results = []
+def rule_files(path=VAULT_PATH):
+    """Markdown rule files under path"""
+    return [
+        os.path.join(dirpath, fname)
+        for dirpath, _, filenames in os.walk(path)
+        for fname in filenames
+        if fname.endswith(".md")
+    ]
+
+def load_rules(path=VAULT_PATH):
+    """Parse every rule file into its filename, frontmatter and body"""
+    rules = []
+    for file_path in rule_files(path):
+        with open(file_path, 'r') as f:
+            meta, body = parse_frontmatter(f.read())
+        rules.append({"filename": os.path.basename(file_path), "meta": meta, "body": body})
+    return rules
 
-    for dirpath, _, filenames in os.walk(VAULT_PATH):
-        for fname in filenames:
-            if fname.endswith(".md"):
-                path = os.path.join(dirpath, fname)
-                with open(path, 'r') as f:
-                    content = f.read()
-                    meta, body = parse_frontmatter(content)
+def filter_rules(rules, query=None, system=None, tag=None):
+    """Apply the body text and frontmatter tag filters"""
+    results = []
+    for rule in rules:
+        meta, body = rule["meta"], rule["body"]
 
-                    if query and query.lower() not in body.lower():
-                        continue
-                    if system and not any(system.lower() in str(t).lower() for t in meta.get("tags", [])):
-                        continue
-                    if tag and not any(tag.lower() == str(t).lower() for t in meta.get("tags", [])):
-                        continue
+        if query and query.lower() not in body.lower():
+            continue
+        if system and not any(system.lower() in str(t).lower() for t in meta.get("tags", [])):
+            continue
+        if tag and not any(tag.lower() == str(t).lower() for t in meta.get("tags", [])):
+            continue
 
-                    results.append({
-                        "filename": fname,
-                        "tags": meta.get("tags", []),
-                        "content": body.strip()
-                    })
+        results.append({
+            "filename": rule["filename"],
+            "tags": meta.get("tags", []),
+            "content": body.strip()
+        })
     return results
 
+def search_rules(query=None, system=None, tag=None):
+    return filter_rules(load_rules(), query, system, tag)
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Search Markdown rules with optional system/tag filters.")
     parser.add_argument("query", type=str, nargs="?", help="Search term (optional)")
     parser.add_argument("--system", type=str, help="Filter by system in frontmatter tags")
     parser.add_argument("--tag", type=str, help="Filter by exact tag in frontmatter")
     parser.add_argument("--json", action="store_true", help="Return results as JSON")
+    parser.add_argument("--no-daemon", action="store_true", help="Search in-process even if the lookup daemon is running")
 
     args = parser.parse_args()
-    matches = search_rules(args.query, args.system, args.tag)
+    filters = {"query": args.query, "system": args.system, "tag": args.tag}
+    matches = None if args.no_daemon else query_daemon("rules", filters)
+    if matches is None:
+        matches = search_rules(**filters)
 
     if not matches:
         print("No match found.")
@@ -1,21 +1,46 @@
-import yaml
 import json
 import argparse
 import random
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from llm.flavoring import narrate_spells
+from utils.yaml_codec import load_file
+from lookup.daemon_client import query_daemon
 
-def load_spells(path="vault/lookup/spells/spells.yaml"):
-    with open(path, "r") as f:
-        data = yaml.safe_load(f)
+SPELLS_PATH = "vault/lookup/spells/spells.yaml"
+
+def load_spells(path=SPELLS_PATH):
+    data = load_file(path)
     return data["entries"]
 
 def find_spells(query, spells):
     query = query.lower()
     return [s for s in spells if query in s["name"].lower()]
 
+def filter_spells(spells, query=None, spell_class=None, level=None, tag=None, system=None):
+    """Apply the CLI's name, class, level, tag and system filters"""
+    matches = spells
+
+    if query:
+        matches = find_spells(query, matches)
+
+    if spell_class:
+        matches = [s for s in matches if s.get("class", "").lower() == spell_class.lower()]
+
+    if level is not None:
+        matches = [s for s in matches if s.get("level") == level]
+    
+    if tag:
+        tag_query = tag.lower()
+        matches = [
+            s for s in matches
+            if any(tag_query in t.lower() for t in s.get("tags", []))
+        ]
+
+    if system:
+        matches = [s for s in matches if system.lower() in s.get("system", "").lower()]
+    return matches
+
 def get_random_spells(spells, count=1):
     """Get a random selection of spells from the provided list."""
     if not spells:
@@ -58,30 +83,15 @@ if __name__ == "__main__":
     parser.add_argument("--theme", type=str, help="Apply thematic flavoring (e.g., arcane, divine)")
     parser.add_argument("--context", type=str, help="Player context for flavoring")
     parser.add_argument("--narrate", action="store_true", help="Generate LLM narration for results")
+    parser.add_argument("--no-daemon", action="store_true", help="Search in-process even if the lookup daemon is running")
 
     args = parser.parse_args()
 
-    spells = load_spells()
-    matches = spells
-
-    if args.query:
-        matches = find_spells(args.query, matches)
-
-    if args.spell_class:
-        matches = [s for s in matches if s.get("class", "").lower() == args.spell_class.lower()]
-
-    if args.level is not None:
-        matches = [s for s in matches if s.get("level") == args.level]
-    
-    if args.tag:
-        tag_query = args.tag.lower()
-        matches = [
-            s for s in matches
-            if any(tag_query in t.lower() for t in s.get("tags", []))
-        ]
-
-    if args.system:
-        matches = [s for s in matches if args.system.lower() in s.get("system", "").lower()]
+    filters = {"query": args.query, "spell_class": args.spell_class, "level": args.level,
+               "tag": args.tag, "system": args.system}
+    matches = None if args.no_daemon else query_daemon("spells", filters)
+    if matches is None:
+        matches = filter_spells(load_spells(), **filters)
 
     # Apply random selection if requested
     if args.random and args.random > 0:
@@ -91,7 +101,8 @@ if __name__ == "__main__":
         print("No match found.")
     else:
         if args.narrate:
-            # Generate LLM narration
+            # Generate LLM narration; imported here since loading the LLM stack is slow
+            from llm.flavoring import narrate_spells
             narration = narrate_spells(
                 matches, 
                 context=args.context,
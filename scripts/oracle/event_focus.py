@@ -1,20 +1,22 @@
-from scripts.utils.table_parser import load_yaml, roll_on_table
+import os
+from scripts.utils.table_compiler import compile_table
+from scripts.oracle.table_store import get_oracle_table_store
 
 def load_event_focus(path="vault/tables/oracle/event_focus.yaml"):
-    data = load_yaml(path)
-    return data[0]["table"]
+    # Served from the resident table store; the file is only re-read after it changes
+    tables = get_oracle_table_store(os.path.dirname(path)).tables(os.path.basename(path))
+    if not tables:
+        raise FileNotFoundError(f"Event focus table not found: {path}")
+    return tables[0]["table"]
 
 def resolve_event_focus(table):
     # Instead of returning only .get("result"), return the full matched dict
-    import random
-    roll = random.randint(1, 100)
-    for entry in table:
-        start, end = entry["range"][0], entry["range"][-1]
-        if start <= roll <= end:
-            return {
-                "roll": roll,
-                "result": entry["result"],
-                "description": entry.get("description", "")
-            }
+    roll, entry = compile_table(table, "d100", "event_focus").roll()
+    if entry is not None:
+        return {
+            "roll": roll,
+            "result": entry["result"],
+            "description": entry.get("description", "")
+        }
     return {"roll": roll, "result": "Unknown", "description": ""}
 
@@ -1,30 +1,17 @@
-import os
-from scripts.utils.table_parser import load_yaml
 from scripts.utils.dice import d100
+from scripts.utils.table_compiler import compile_table
+from scripts.oracle.table_store import get_oracle_table_store
+
+# Rolled when no table is chosen: the two action columns of the meaning tables.
+# Other files in the oracle directory, such as event_focus.yaml, are not meaning tables.
+DEFAULT_MEANING_TABLE = "actions.yaml"
 
 def load_meaning_tables(selected_file=None, directory="vault/tables/oracle/"):
-    tables = []
-
-    # Load specific file if requested
-    if selected_file:
-        path = os.path.join(directory, selected_file)
-        if os.path.exists(path):
-            data = load_yaml(path)
-            if isinstance(data, list):
-                tables.extend(data)
-            elif isinstance(data, dict):
-                tables.append(data)
-        return tables
-
-    # Otherwise, load all valid YAMLs
-    for filename in os.listdir(directory):
-        if filename.endswith(".yaml") and not filename.startswith("_"):
-            path = os.path.join(directory, filename)
-            data = load_yaml(path)
-            if isinstance(data, list):
-                tables.extend(data)
-            elif isinstance(data, dict):
-                tables.append(data)
+    # Served from the resident table store: the requested file's tables, or those of
+    # DEFAULT_MEANING_TABLE; files are only re-read after they change
+    tables = get_oracle_table_store(directory).tables(selected_file or DEFAULT_MEANING_TABLE)
+    if not tables and not selected_file:
+        raise ValueError(f"No default meaning table: {DEFAULT_MEANING_TABLE} is missing from {directory}")
     return tables
 
 
@@ -35,22 +22,17 @@ def roll_meaning(meanings):
     roll1 = d100()
     roll2 = d100()
 
-    table1 = meanings[0]["table"]
-    table2 = meanings[1]["table"] if len(meanings) > 1 else table1
-
-    def find_result(table, roll):
-        for entry in table:
-            rng = entry["range"]
-            if isinstance(rng, list):
-                if rng[0] <= roll <= rng[-1]:
-                    return entry["result"]
-            elif isinstance(rng, int):
-                if rng == roll:
-                    return entry["result"]
-        raise ValueError(f"No matching entry for roll {roll}")
-
-    word1 = find_result(table1, roll1)
-    word2 = find_result(table2, roll2)
+    meaning1 = meanings[0]
+    meaning2 = meanings[1] if len(meanings) > 1 else meaning1
+
+    def find_result(meaning, roll):
+        entry = compile_table(meaning["table"], "d100", meaning.get("name", "")).resolve(roll)
+        if entry is None:
+            raise ValueError(f"No matching entry for roll {roll}")
+        return entry["result"]
+
+    word1 = find_result(meaning1, roll1)
+    word2 = find_result(meaning2, roll2)
 
     return {
         "keywords": [word1, word2],
@@ -13,7 +13,7 @@ def handle_yes_no(question, odds="50/50", chaos=5):
 
 def handle_yesno_flavor(question, outcome, event_trigger):
     adv = _session_service.get_active_adventure()
-    context = build_adventure_context(adv) if adv else None
+    context = build_adventure_context(adv, _session_service.data_access) if adv else None
     narration = narrate_yesno(question=question, result=outcome, context=context)
     if event_trigger:
         narration += "\n\nThere was an interruption! Generate event flavor with the meaning oracle?"
@@ -25,7 +25,7 @@ def handle_scene_test(chaos=5, flavor=False):
 
 def handle_scene_flavor(focus, expectation):
     adv = _session_service.get_active_adventure()
-    context = build_adventure_context(adv) if adv else None
+    context = build_adventure_context(adv, _session_service.data_access) if adv else None
     narration = narrate_event_interrupt(focus, expectation, context=context)
     return narration
 
@@ -35,7 +35,7 @@ def handle_meaning(question, table=None):
 
 def handle_meaning_flavor(question, keywords):
     adv = _session_service.get_active_adventure()
-    context = build_adventure_context(adv) if adv else None
+    context = build_adventure_context(adv, _session_service.data_access) if adv else None
     narration = narrate_keywords(question=question, keywords=keywords, context=context)
     return narration
 
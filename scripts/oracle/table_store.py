@@ -0,0 +1,123 @@
+"""
+Resident oracle tables
+
+The scene and meaning oracles used to re-read their YAML on every roll:
+load_event_focus() parsed event_focus.yaml for each interrupt scene and
+load_meaning_tables() parsed every file in the oracle directory whenever no
+table was chosen. OracleTableStore keeps each file's parsed tables, with
+their roll entries compiled, in memory and serves rolls from there.
+
+Files are checked against their (st_mtime_ns, st_size) at most once per
+REFRESH_INTERVAL seconds; only changed files are re-parsed, and added or
+removed files are picked up on the same check. Between checks a roll does
+not touch the disk. Each table's entries are pinned with the table compiler
+while the store holds them, so rolls on them reuse the compiled table, and
+unpinned when their file is re-parsed or removed.
+"""
+
+import os
+import time
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from scripts.utils.table_parser import load_yaml
+from scripts.utils.table_compiler import Signature, pin_table, unpin_table, source_signature
+
+logger = logging.getLogger(__name__)
+
+ORACLE_DIRECTORY = "vault/tables/oracle/"
+REFRESH_INTERVAL = 2.0
+
+
+class OracleTableStore:
+    """Parsed and compiled tables of one oracle directory, refreshed when files change"""
+
+    def __init__(self, directory: str, refresh_interval: float = REFRESH_INTERVAL):
+        self.directory = directory
+        self.refresh_interval = refresh_interval
+        self._lock = threading.RLock()
+        self._files: Dict[str, Tuple[Signature, List[Dict[str, Any]]]] = {}
+        self._names: List[str] = []
+        self._refreshed_at: Optional[float] = None
+        self.loads = 0
+
+    def _forget(self, filename: str) -> None:
+        """Drop a file's tables and unpin their entries"""
+        cached = self._files.pop(filename, None)
+        for table in cached[1] if cached is not None else []:
+            if isinstance(table, dict) and isinstance(table.get("table"), list):
+                unpin_table(table["table"])
+
+    def _load(self, filename: str, signature: Signature) -> List[Dict[str, Any]]:
+        """Parse one file into its list of tables and compile their entries"""
+        path = os.path.join(self.directory, filename)
+        try:
+            data = load_yaml(path)
+        except Exception as e:
+            logger.warning(f"Skipping oracle table file {filename}: {e}")
+            data = None
+        tables = data if isinstance(data, list) else [data] if isinstance(data, dict) else []
+        for table in tables:
+            if isinstance(table, dict) and isinstance(table.get("table"), list):
+                pin_table(table["table"], "d100", str(table.get("name", "")), path)
+        self._forget(filename)
+        self._files[filename] = (signature, tables)
+        self.loads += 1
+        return tables
+
+    def _check(self, filename: str) -> List[Dict[str, Any]]:
+        """A file's tables, re-parsed if its signature changed; [] and forgotten if it is gone"""
+        signature = source_signature(os.path.join(self.directory, filename))
+        if signature is None:
+            self._forget(filename)
+            return []
+        cached = self._files.get(filename)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        return self._load(filename, signature)
+
+    def refresh(self) -> None:
+        """Re-stat every known and listed file, re-parsing the changed ones"""
+        with self._lock:
+            try:
+                listed = sorted(name for name in os.listdir(self.directory) if name.endswith(".yaml"))
+            except OSError:
+                listed = []
+            for filename in set(listed) | set(self._files):
+                self._check(filename)
+            self._names = [name for name in listed if not name.startswith("_") and name in self._files]
+            self._refreshed_at = time.monotonic()
+
+    def refresh_if_due(self) -> None:
+        with self._lock:
+            if self._refreshed_at is None or time.monotonic() - self._refreshed_at >= self.refresh_interval:
+                self.refresh()
+
+    def tables(self, filename: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Tables of one file, or of every .yaml file not starting with "_" in name order
+
+        The returned tables are shared; callers must not modify them.
+        """
+        with self._lock:
+            self.refresh_if_due()
+            if filename:
+                cached = self._files.get(filename)
+                return list(cached[1]) if cached is not None else list(self._check(filename))
+            return [table for name in self._names for table in self._files[name][1]]
+
+
+_stores: Dict[str, OracleTableStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_oracle_table_store(directory: str = ORACLE_DIRECTORY) -> OracleTableStore:
+    """The process-wide store for an oracle directory"""
+    key = os.path.abspath(directory)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = OracleTableStore(key)
+            _stores[key] = store
+        return store
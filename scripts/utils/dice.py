@@ -1,3 +1,4 @@
+import re
 import random
 
 def d100():
@@ -25,3 +26,52 @@ def d6():
 def d4():
     return random.randint(1, 4)
 
+
+# Dice expressions ("1d8", "2d6+1", "d4", "3") as plain dicts:
+# {"expression": "2d6+1", "count": 2, "sides": 6, "modifier": 1}
+_DICE_PATTERN = re.compile(r"(\d*)\s*d\s*(\d+)(?:\s*([+-])\s*(\d+))?", re.IGNORECASE)
+_CONSTANT_PATTERN = re.compile(r"^\s*([+-]?\d+)\s*$")
+
+def format_dice(count: int, sides: int, modifier: int = 0) -> str:
+    """Render dice back into NdS+M notation"""
+    expression = f"{count}d{sides}" if sides else str(modifier)
+    if sides and modifier:
+        expression += f"{modifier:+d}"
+    return expression
+
+def parse_dice(text):
+    """
+    Parse the first dice expression in text
+
+    A bare integer parses as a constant (sides 0). Returns None when text
+    holds no dice expression.
+    """
+    if text is None:
+        return None
+    if isinstance(text, int):
+        text = str(text)
+    constant = _CONSTANT_PATTERN.match(text)
+    if constant:
+        count, sides, modifier = 0, 0, int(constant.group(1))
+    else:
+        match = _DICE_PATTERN.search(text)
+        if not match:
+            return None
+        count = int(match.group(1)) if match.group(1) else 1
+        sides = int(match.group(2))
+        modifier = int(match.group(4)) if match.group(4) else 0
+        if match.group(3) == "-":
+            modifier = -modifier
+    return {"expression": format_dice(count, sides, modifier), "count": count, "sides": sides, "modifier": modifier}
+
+def roll_parsed_dice(dice) -> int:
+    """Roll a dice expression returned by parse_dice"""
+    if not dice["sides"]:
+        return dice["modifier"]
+    return sum(random.randint(1, dice["sides"]) for _ in range(dice["count"])) + dice["modifier"]
+
+def average_parsed_dice(dice) -> float:
+    """Expected value of a dice expression returned by parse_dice"""
+    if not dice["sides"]:
+        return dice["modifier"]
+    return dice["count"] * (dice["sides"] + 1) / 2 + dice["modifier"]
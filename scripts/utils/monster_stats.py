@@ -0,0 +1,149 @@
+"""
+Structured monster stats
+
+Monster entries keep their stat block as display strings: hit_dice "2+1 (10hp)",
+number_appearing "1d8 (1d20)", attacks "2 x claw (1d3), 1 x bite (1d6)".
+normalize_monster() parses them once, when monsters are loaded or indexed,
+into a "stats" dict of typed fields so combat, encounter building and lookup
+filters work on numbers instead of reparsing strings:
+
+    hd                hit dice count (0.5 for "1/2"), None if unparseable
+    hd_modifier       the +N / -N after the count ("2+1" -> 1)
+    hp                hit points printed in the stat block, else the average
+    ac                armor class as printed first
+    aac               ascending armor class from "7 [12]", None if not given
+    attacks           [{"count", "name", "damage"}]; damage is a parse_dice dict or None
+    number_appearing  {"wandering": dice, "lair": dice}; either may be None
+    xp                experience value as an int, None if not given
+
+The original string fields are left untouched for display.
+"""
+
+import re
+from typing import Any, Dict, List, Optional
+
+from .dice import parse_dice
+
+# Average hit points per hit die (d8)
+HP_PER_HD = 4.5
+
+_HD_PATTERN = re.compile(r"^\s*(\d+)(?:\s*/\s*(\d+))?\s*(?:d8)?\s*(?:([+-])\s*(\d+))?", re.IGNORECASE)
+_HP_PATTERN = re.compile(r"(\d+)\s*hp", re.IGNORECASE)
+_AC_PATTERN = re.compile(r"^\s*(-?\d+)(?:\s*\[\s*(-?\d+)\s*\])?")
+_ATTACK_PATTERN = re.compile(r"^(?:(\d+)\s*[x×]\s*)?(.*?)\s*(?:\((.*)\))?$")
+_ATTACK_SEPARATORS = re.compile(r"\s*(?:[,;]|\band\b|\bor\b)\s*", re.IGNORECASE)
+
+
+def parse_hit_dice(value: Any) -> Dict[str, Any]:
+    """Parse hit_dice ("1 (4hp)", "2+1", "1/2", 3) into hd, hd_modifier and hp"""
+    text = str(value) if value is not None else ""
+    hd: Optional[float] = None
+    modifier = 0
+
+    match = _HD_PATTERN.match(text)
+    if match:
+        hd = int(match.group(1))
+        if match.group(2):
+            hd = hd / int(match.group(2))
+        if match.group(4):
+            modifier = int(match.group(4)) * (-1 if match.group(3) == "-" else 1)
+        if isinstance(hd, float) and hd.is_integer():
+            hd = int(hd)
+
+    hp_match = _HP_PATTERN.search(text)
+    if hp_match:
+        hp: Optional[int] = int(hp_match.group(1))
+    elif hd is not None:
+        hp = max(1, round(hd * HP_PER_HD + modifier))
+    else:
+        hp = None
+    return {"hd": hd, "hd_modifier": modifier, "hp": hp}
+
+
+def parse_armor_class(value: Any) -> Dict[str, Optional[int]]:
+    """Parse armor_class (2, "7 [12]") into ac and, when bracketed, aac"""
+    if isinstance(value, bool):
+        return {"ac": None, "aac": None}
+    if isinstance(value, int):
+        return {"ac": value, "aac": None}
+    match = _AC_PATTERN.match(str(value)) if value is not None else None
+    if not match:
+        return {"ac": None, "aac": None}
+    return {"ac": int(match.group(1)), "aac": int(match.group(2)) if match.group(2) else None}
+
+
+def _split_attacks(text: str) -> List[str]:
+    """Split an attack line on separators outside parentheses"""
+    # Mask parenthesised text so separators inside "(1d6 or poison)" are ignored
+    masked, depth = [], 0
+    for char in text:
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth = max(0, depth - 1)
+        masked.append("#" if depth and char != "(" else char)
+    masked_text = "".join(masked)
+    parts, start = [], 0
+    for match in _ATTACK_SEPARATORS.finditer(masked_text):
+        parts.append(text[start:match.start()])
+        start = match.end()
+    parts.append(text[start:])
+    return [part.strip() for part in parts if part.strip()]
+
+
+def parse_attacks(value: Any) -> List[Dict[str, Any]]:
+    """Parse attacks ("2 x claw (1d3), 1 x bite (1d6)" or a list) into count, name and damage"""
+    if value is None:
+        return []
+    lines = value if isinstance(value, (list, tuple)) else [value]
+    attacks = []
+    for line in lines:
+        text = str(line).strip().strip("[]")
+        for part in _split_attacks(text):
+            match = _ATTACK_PATTERN.match(part)
+            count, name, detail = match.group(1), match.group(2), match.group(3)
+            damage = parse_dice(detail) if detail else None
+            if damage is not None and not damage["sides"]:
+                damage = None
+            attacks.append({
+                "count": int(count) if count else 1,
+                "name": name.strip() or part,
+                "damage": damage,
+            })
+    return attacks
+
+
+def parse_number_appearing(value: Any) -> Dict[str, Optional[Dict[str, Any]]]:
+    """Parse number_appearing ("1d8 (1d20)") into wandering and lair dice"""
+    if value is None:
+        return {"wandering": None, "lair": None}
+    text = str(value)
+    wandering, _, lair = text.partition("(")
+    return {"wandering": parse_dice(wandering.strip()), "lair": parse_dice(lair.rstrip(") "))}
+
+
+def _parse_int(value: Any) -> Optional[int]:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    match = re.search(r"-?\d+", str(value).replace(",", "")) if value is not None else None
+    return int(match.group()) if match else None
+
+
+def parse_monster_stats(monster: Dict[str, Any]) -> Dict[str, Any]:
+    """Typed stats parsed from a monster's stat block strings"""
+    stats = parse_hit_dice(monster.get("hit_dice"))
+    stats.update(parse_armor_class(monster.get("armor_class")))
+    stats["attacks"] = parse_attacks(monster.get("attacks"))
+    stats["number_appearing"] = parse_number_appearing(monster.get("number_appearing"))
+    stats["xp"] = _parse_int(monster.get("experience"))
+    return stats
+
+
+def normalize_monster(monster: Dict[str, Any]) -> Dict[str, Any]:
+    """Add the parsed "stats" dict to a monster entry in place and return it"""
+    if isinstance(monster, dict):
+        monster["stats"] = parse_monster_stats(monster)
+    return monster
+
@@ -0,0 +1,228 @@
+"""
+Compiled roll tables
+
+Oracle, meaning, event focus and generator tables list entries by roll:
+
+    - {range: [1, 5], result: ...}    # inclusive range
+    - {range: 6, result: ...}         # single value
+    - {roll: 7, result: ...}          # older single-roll format
+
+compile_table() turns those entries into a dense list with one slot per
+possible roll holding the index of the entry it selects, so resolving a roll
+is a single list index instead of a scan that re-checks each entry's range
+shape. Gaps (rolls no entry covers) and overlaps (rolls claimed by more than
+one entry; the first entry wins, as the scans did) are found while compiling
+and logged once per table.
+
+Compiled tables are reused in two ways:
+- tables loaded from a file are cached by (source path, table name, dice)
+  and the file's (st_mtime_ns, st_size), so callers that receive a fresh
+  copy of the table on every load still compile it once per file version
+- resident tables (OracleTableStore) are pinned: their entries list maps
+  to its compiled table until the store unpins it on reload
+
+Tables with neither are compiled on every call.
+"""
+
+import os
+import copy
+import random
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from scripts.utils.dice import parse_dice, roll_parsed_dice
+
+logger = logging.getLogger(__name__)
+
+COMPILED_CACHE_MAX_ENTRIES = 512
+
+Signature = Tuple[int, int]
+
+
+def entry_span(entry: Any) -> Optional[Tuple[int, int]]:
+    """Inclusive (low, high) rolls of a table entry, or None if it has no usable range or roll"""
+    if not isinstance(entry, dict):
+        return None
+    value = entry.get("range", entry.get("roll"))
+    if isinstance(value, (list, tuple)) and value:
+        low, high = value[0], value[-1]
+    else:
+        low = high = value
+    if isinstance(low, bool) or isinstance(high, bool) or not isinstance(low, int) or not isinstance(high, int):
+        return None
+    return (low, high) if low <= high else None
+
+
+def _runs(values: List[int]) -> List[Tuple[int, int]]:
+    """Collapse sorted integers into inclusive (start, end) runs"""
+    runs: List[Tuple[int, int]] = []
+    for value in values:
+        if runs and runs[-1][1] == value - 1:
+            runs[-1] = (runs[-1][0], value)
+        else:
+            runs.append((value, value))
+    return runs
+
+
+def _rolls_text(start: int, end: int) -> str:
+    return f"rolls {start}-{end}" if start != end else f"roll {start}"
+
+
+class CompiledTable:
+    """A roll table resolved ahead of time into one entry index per possible roll"""
+
+    def __init__(self, entries: List[Any], dice: Optional[str] = None):
+        self.entries = entries
+        self.dice_text = dice
+        self.dice = parse_dice(dice) if dice else None
+        spans = [(position, entry_span(entry)) for position, entry in enumerate(entries)]
+        self.unusable = [position for position, span in spans if span is None]
+        spans = [(position, span) for position, span in spans if span is not None]
+
+        if self.dice and self.dice["sides"]:
+            self.min_roll = self.dice["count"] + self.dice["modifier"]
+            self.max_roll = self.dice["count"] * self.dice["sides"] + self.dice["modifier"]
+        elif spans:
+            self.min_roll = min(low for _, (low, _) in spans)
+            self.max_roll = max(high for _, (_, high) in spans)
+        else:
+            self.min_roll = self.max_roll = 0
+
+        # Slots cover the die and every entry, so rolls passed in by hand still resolve
+        self._base = min([self.min_roll] + [low for _, (low, _) in spans])
+        top = max([self.max_roll] + [high for _, (_, high) in spans])
+        self._slots = [-1] * (top - self._base + 1)
+        overlapping: Dict[Tuple[int, int], List[int]] = {}
+        for position, (low, high) in spans:
+            for roll in range(low, high + 1):
+                claimed = self._slots[roll - self._base]
+                if claimed < 0:
+                    self._slots[roll - self._base] = position
+                else:
+                    overlapping.setdefault((claimed, position), []).append(roll)
+
+        self.gaps = _runs([roll for roll in range(self.min_roll, self.max_roll + 1)
+                           if self._slots[roll - self._base] < 0]) if spans else []
+        # (start, end, entry that wins, entry it shadows)
+        self.overlaps = [(start, end, kept, shadowed)
+                         for (kept, shadowed), rolls in overlapping.items()
+                         for start, end in _runs(rolls)]
+
+    def bind(self, entries: List[Any]) -> "CompiledTable":
+        """This compilation resolving into an equal entries list, e.g. a fresh copy of the same file"""
+        if entries is self.entries:
+            return self
+        bound = copy.copy(self)
+        bound.entries = entries
+        return bound
+
+    def resolve(self, roll: int) -> Optional[Dict[str, Any]]:
+        """The entry a roll selects, or None if no entry covers it"""
+        offset = roll - self._base
+        if 0 <= offset < len(self._slots):
+            position = self._slots[offset]
+            if position >= 0:
+                return self.entries[position]
+        return None
+
+    def roll(self) -> Tuple[int, Optional[Dict[str, Any]]]:
+        """Roll the table's dice (or uniformly over its entries' span) and resolve the result"""
+        if self.dice:
+            roll = roll_parsed_dice(self.dice)
+        else:
+            roll = random.randint(self.min_roll, self.max_roll)
+        return roll, self.resolve(roll)
+
+    def problems(self) -> List[str]:
+        """Human-readable gaps, overlaps and entries without a usable range"""
+        problems = [f"no entry for {_rolls_text(start, end)}" for start, end in self.gaps]
+        problems += [f"entries {kept + 1} and {shadowed + 1} both cover {_rolls_text(start, end)}; "
+                     f"entry {kept + 1} is used" for start, end, kept, shadowed in self.overlaps]
+        problems += [f"entry {position + 1} has no usable range or roll" for position in self.unusable]
+        return problems
+
+
+_by_source: "OrderedDict[Tuple[str, str, Optional[str]], Tuple[Signature, CompiledTable]]" = OrderedDict()
+_pinned: Dict[int, Tuple[List[Any], CompiledTable]] = {}
+_compiled_lock = threading.Lock()
+
+
+def source_signature(path: str) -> Optional[Signature]:
+    """(st_mtime_ns, st_size) of a table file, or None if it cannot be stat'ed"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _label(name: str, source: Optional[str]) -> str:
+    """How logged problems name a table: file, file:table or table"""
+    if not source:
+        return name or "(unnamed)"
+    filename = os.path.basename(source)
+    return f"{filename}:{name}" if name and name != filename else filename
+
+
+def _compile(entries: List[Any], dice: Optional[str], label: str) -> CompiledTable:
+    compiled = CompiledTable(entries, dice)
+    for problem in compiled.problems():
+        logger.warning(f"Table {label}: {problem}")
+    return compiled
+
+
+def compile_table(entries: List[Any], dice: Optional[str] = None, name: str = "",
+                  source: Optional[str] = None, signature: Optional[Signature] = None) -> CompiledTable:
+    """
+    Compile a table's entries, reusing a pinned or cached compilation when there is one
+
+    Args:
+        entries: The table's entries
+        dice: Dice the table is rolled with, e.g. "d100"
+        name: Table name within source; also used in logged problems
+        source: File the table was loaded from; enables the per-file-version cache
+        signature: source's signature if the caller already has it; stat'ed otherwise
+    """
+    with _compiled_lock:
+        pinned = _pinned.get(id(entries))
+        if pinned is not None and pinned[0] is entries and pinned[1].dice_text == dice:
+            return pinned[1]
+
+    if source is None:
+        return _compile(entries, dice, _label(name, None))
+
+    signature = signature or source_signature(source)
+    key = (source, name, dice)
+    with _compiled_lock:
+        cached = _by_source.get(key)
+        if cached is not None and signature is not None and cached[0] == signature:
+            _by_source.move_to_end(key)
+            return cached[1].bind(entries)
+
+    compiled = _compile(entries, dice, _label(name, source))
+    if signature is not None:
+        with _compiled_lock:
+            _by_source[key] = (signature, compiled)
+            _by_source.move_to_end(key)
+            while len(_by_source) > COMPILED_CACHE_MAX_ENTRIES:
+                _by_source.popitem(last=False)
+    return compiled
+
+
+def pin_table(entries: List[Any], dice: Optional[str] = None, name: str = "",
+              source: Optional[str] = None) -> CompiledTable:
+    """Compile a resident entries list and serve it by identity until unpin_table()"""
+    compiled = _compile(entries, dice, _label(name, source))
+    with _compiled_lock:
+        _pinned[id(entries)] = (entries, compiled)
+    return compiled
+
+
+def unpin_table(entries: List[Any]) -> None:
+    """Forget a pinned entries list, e.g. when its file was reloaded"""
+    with _compiled_lock:
+        pinned = _pinned.get(id(entries))
+        if pinned is not None and pinned[0] is entries:
+            del _pinned[id(entries)]
@@ -1,10 +1,10 @@
-import yaml
 import random
+from scripts.utils.yaml_codec import load_file
+from scripts.utils.table_compiler import compile_table
 
 def load_yaml(path):
     """Load any YAML file and return its parsed object."""
-    with open(path, 'r') as f:
-        return yaml.safe_load(f)
+    return load_file(path)
 
 def roll_dice(dice_str):
     """Roll dice from notation like 'd6', '2d8', or 'd100'."""
@@ -23,18 +23,18 @@ def get_table_by_id(data, table_id):
             return table
     return None
 
-def roll_on_table(table, return_entry=False):
-    """Roll on a specific table and return result or full entry."""
-    dice = table.get('dice', 'd6')
-    roll = roll_dice(dice)
-    entries = table.get('entries', [])
+def roll_on_table(table, return_entry=False, source=None):
+    """Roll on a specific table and return result or full entry.
 
-    for entry in entries:
-        if isinstance(entry, dict) and 'range' in entry:
-            start, end = entry['range'][0], entry['range'][-1]
-            if start <= roll <= end:
-                return entry if return_entry else entry['result']
-    return None
+    source is the file the table came from; its compiled entries are then reused until the file changes.
+    """
+    entries = table.get('entries')
+    if not entries:
+        return None
+    _, entry = compile_table(entries, table.get('dice', 'd6'), str(table.get('id', '')), source=source).roll()
+    if entry is None:
+        return None
+    return entry if return_entry else entry['result']
 
 def roll_from_yaml(path, table_id, return_entry=False):
     """Load a YAML, retrieve a table by ID, and roll on it."""
@@ -42,4 +42,4 @@ def roll_from_yaml(path, table_id, return_entry=False):
     table = get_table_by_id(data, table_id)
     if not table:
         raise ValueError(f"Table with id '{table_id}' not found.")
-    return roll_on_table(table, return_entry)
+    return roll_on_table(table, return_entry, source=path)
@@ -0,0 +1,84 @@
+import os
+import sys
+import time
+import argparse
+import yaml
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.yaml_codec import LIBYAML_AVAILABLE
+
+DEFAULT_PATHS = ["vault", "vault_templates"]
+
+
+def collect_yaml_files(paths):
+    """Read every .yaml file under the given paths into memory."""
+    documents = []
+    for root_path in paths:
+        for dirpath, _, filenames in os.walk(root_path):
+            for fname in sorted(filenames):
+                if fname.endswith((".yaml", ".yml")):
+                    path = os.path.join(dirpath, fname)
+                    with open(path, "r", encoding="utf-8") as f:
+                        documents.append((path, f.read()))
+    return documents
+
+
+def time_codec(documents, loader, dumper, repeat):
+    """Return (load_seconds, dump_seconds, per_file_load_seconds) for one codec."""
+    per_file = {}
+    parsed = []
+    start = time.perf_counter()
+    for _ in range(repeat):
+        parsed = []
+        for path, text in documents:
+            t0 = time.perf_counter()
+            parsed.append(yaml.load(text, Loader=loader))
+            per_file[path] = per_file.get(path, 0.0) + time.perf_counter() - t0
+    load_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for data in parsed:
+            yaml.dump(data, Dumper=dumper, default_flow_style=False, indent=2)
+    dump_seconds = time.perf_counter() - start
+    return load_seconds, dump_seconds, per_file
+
+
+def print_row(label, load_seconds, dump_seconds, repeat, count):
+    per_load = load_seconds / (repeat * count) * 1000
+    per_dump = dump_seconds / (repeat * count) * 1000
+    print(f"{label:<14} load {load_seconds:8.3f}s ({per_load:7.3f} ms/file)   "
+          f"dump {dump_seconds:8.3f}s ({per_dump:7.3f} ms/file)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare pure-Python and libyaml YAML codecs on vault files")
+    parser.add_argument("paths", type=str, nargs="*", default=DEFAULT_PATHS, help="Directories to scan for YAML files")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of passes over the files")
+    parser.add_argument("--top", type=int, default=5, help="Show the N slowest files to parse")
+
+    args = parser.parse_args()
+
+    documents = collect_yaml_files(args.paths)
+    if not documents:
+        print("No YAML files found.")
+        sys.exit(1)
+
+    total_bytes = sum(len(text) for _, text in documents)
+    print(f"{len(documents)} files, {total_bytes / 1024:.1f} KiB, {args.repeat} passes")
+
+    py_load, py_dump, py_files = time_codec(documents, yaml.SafeLoader, yaml.SafeDumper, args.repeat)
+    print_row("SafeLoader", py_load, py_dump, args.repeat, len(documents))
+
+    if not LIBYAML_AVAILABLE:
+        print("CSafeLoader    unavailable (PyYAML built without libyaml)")
+        sys.exit(0)
+
+    c_load, c_dump, _ = time_codec(documents, yaml.CSafeLoader, yaml.CSafeDumper, args.repeat)
+    print_row("CSafeLoader", c_load, c_dump, args.repeat, len(documents))
+    print(f"Speedup        load x{py_load / c_load:.1f}, dump x{py_dump / c_dump:.1f}")
+
+    if args.top > 0:
+        print(f"\nSlowest {args.top} files with SafeLoader:")
+        slowest = sorted(py_files.items(), key=lambda kv: kv[1], reverse=True)[:args.top]
+        for path, seconds in slowest:
+            print(f"  {seconds / args.repeat * 1000:8.3f} ms  {path}")
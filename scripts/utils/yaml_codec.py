@@ -0,0 +1,40 @@
+"""
+YAML codec for Oracle Forge
+
+Single entry point for parsing and emitting YAML across the server and the
+scripts. Uses libyaml's CSafeLoader/CSafeDumper when PyYAML was built with
+them and falls back to the pure-Python SafeLoader/SafeDumper otherwise.
+"""
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+    LIBYAML_AVAILABLE = True
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+    LIBYAML_AVAILABLE = False
+
+YAMLError = yaml.YAMLError
+
+
+def load(stream):
+    """Parse a YAML string or stream with the fastest safe loader"""
+    return yaml.load(stream, Loader=SafeLoader)
+
+
+def load_file(path):
+    """Parse a YAML file with the fastest safe loader"""
+    with open(path, "r", encoding="utf-8") as f:
+        return load(f)
+
+
+def dump(data, stream=None, **kwargs):
+    """Emit YAML with the fastest safe dumper; returns a string when stream is None"""
+    return yaml.dump(data, stream, Dumper=SafeDumper, **kwargs)
+
+
+def dump_file(path, data, **kwargs):
+    """Write data to a YAML file with the fastest safe dumper"""
+    with open(path, "w", encoding="utf-8") as f:
+        dump(data, f, **kwargs)
@@ -1,3 +1,4 @@
+import atexit
 import logging
 from flask import Flask
 from flask_cors import CORS
@@ -7,10 +8,21 @@ from .routes.adventure_routes import adventure
 from .routes.generators_routes import generators
 from .routes.combat_routes import combat_bp
 from .routes.session_routes import session
+from .routes.template_routes import templates
+from .routes.search_routes import search
+from .routes.export_routes import export
 from .config import get_config, config_manager
 from .middleware.error_handlers import register_error_handlers
 from .middleware.rate_limiting import register_rate_limiting
 from .services.adventure_service import AdventureService
+from .data_access.yaml_cache import get_yaml_cache
+from .utils.dir_cache import get_directory_cache
+from .data_access.vault_snapshot import warm_from_snapshot
+from .data_access.template_registry import get_template_registry
+from .data_access.index_store import load_persisted_indexes, save_dirty_indexes
+from .data_access.rule_embeddings import save_rule_embeddings
+from .data_access.lookup_data import LookupDataAccess
+from .data_access.lookup_cache import get_lookup_cache
 
 # Configure logging
 logging.basicConfig(
@@ -43,6 +55,18 @@ app.register_blueprint(adventure)
 app.register_blueprint(generators)
 app.register_blueprint(combat_bp)
 app.register_blueprint(session)
+app.register_blueprint(templates)
+app.register_blueprint(search)
+app.register_blueprint(export)
+
+# Load the compiled vault snapshot instead of re-parsing the vault
+warm_from_snapshot()
+get_template_registry()
+
+# Adopt the persisted search indexes; indexes that changed are saved on exit
+load_persisted_indexes()
+atexit.register(save_dirty_indexes)
+atexit.register(save_rule_embeddings)
 
 # Game Init - clears active adventure on startup
 adventure_service = AdventureService()
@@ -67,6 +91,12 @@ def config_status():
             "host": config.server.host,
             "port": config.server.port,
             "debug": config.server.debug,
+        },
+        "caches": {
+            "yaml": get_yaml_cache().get_stats(),
+            "directories": get_directory_cache().get_stats(),
+            "lookup_indexes": LookupDataAccess().get_index_stats(),
+            "lookup_results": get_lookup_cache().get_stats(),
         }
     }
 
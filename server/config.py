@@ -27,6 +27,7 @@ class DatabaseConfig:
     lookup_path: str = "vault/lookup"
     rules_path: str = "vault/rules"
     index_path: str = "vault/index"
+    adventure_storage: str = "yaml"  # "yaml" (one file per document) or "sqlite" (adventure.db per adventure)
 
 
 @dataclass
@@ -60,6 +61,20 @@ class AppConfig:
     log_level: str = "INFO"
     enable_rate_limiting: bool = True
     max_file_size: int = 10 * 1024 * 1024  # 10MB
+    yaml_cache_max_bytes: int = 32 * 1024 * 1024  # 32MB of source YAML, 0 disables
+    session_journal_fsync_every: int = 8  # fsync the session log journal every N appends
+    session_journal_fsync_interval: float = 1.0  # ...or after this many seconds
+    session_journal_compact_every: int = 200  # fold the journal into active_session.yaml every N entries
+    lookup_fuzzy_threshold: float = 0.3  # minimum trigram similarity for fuzzy lookups
+    lookup_fuzzy_limit: int = 50  # maximum ranked results returned by a fuzzy lookup
+    lookup_cache_max_entries: int = 256  # cached lookup results, 0 disables
+    lookup_cache_ttl: float = 60.0  # seconds a cached lookup result stays valid
+    search_domain_boosts: Dict[str, float] = field(default_factory=dict)  # /search score multiplier per domain, default 1.0
+    search_refresh_interval: float = 2.0  # seconds between lookup, rule, table and /search checks for vault files changed outside the server
+    encounter_xp_per_level: float = 20.0  # default encounter XP budget per character level in the party
+    encounter_min_budget_share: float = 0.5  # encounter groups must be worth at least this share of the budget
+    rule_import_workers: int = 8  # threads writing rule files during a bulk import
+    rule_embedding_model: str = ""  # GGUF model embedding rule sections via llama_cpp; empty uses the built-in hashing embedder
 
 
 class ConfigManager:
@@ -107,6 +122,7 @@ class ConfigManager:
             base_config.database.lookup_path = db_data.get('lookup_path', base_config.database.lookup_path)
             base_config.database.rules_path = db_data.get('rules_path', base_config.database.rules_path)
             base_config.database.index_path = db_data.get('index_path', base_config.database.index_path)
+            base_config.database.adventure_storage = db_data.get('adventure_storage', base_config.database.adventure_storage)
         
         # LLM config
         if 'llm' in yaml_data:
@@ -130,6 +146,20 @@ class ConfigManager:
         base_config.log_level = yaml_data.get('log_level', base_config.log_level)
         base_config.enable_rate_limiting = yaml_data.get('enable_rate_limiting', base_config.enable_rate_limiting)
         base_config.max_file_size = yaml_data.get('max_file_size', base_config.max_file_size)
+        base_config.yaml_cache_max_bytes = yaml_data.get('yaml_cache_max_bytes', base_config.yaml_cache_max_bytes)
+        base_config.session_journal_fsync_every = yaml_data.get('session_journal_fsync_every', base_config.session_journal_fsync_every)
+        base_config.session_journal_fsync_interval = yaml_data.get('session_journal_fsync_interval', base_config.session_journal_fsync_interval)
+        base_config.session_journal_compact_every = yaml_data.get('session_journal_compact_every', base_config.session_journal_compact_every)
+        base_config.lookup_fuzzy_threshold = yaml_data.get('lookup_fuzzy_threshold', base_config.lookup_fuzzy_threshold)
+        base_config.lookup_fuzzy_limit = yaml_data.get('lookup_fuzzy_limit', base_config.lookup_fuzzy_limit)
+        base_config.lookup_cache_max_entries = yaml_data.get('lookup_cache_max_entries', base_config.lookup_cache_max_entries)
+        base_config.lookup_cache_ttl = yaml_data.get('lookup_cache_ttl', base_config.lookup_cache_ttl)
+        base_config.search_domain_boosts = yaml_data.get('search_domain_boosts', base_config.search_domain_boosts)
+        base_config.search_refresh_interval = yaml_data.get('search_refresh_interval', base_config.search_refresh_interval)
+        base_config.encounter_xp_per_level = yaml_data.get('encounter_xp_per_level', base_config.encounter_xp_per_level)
+        base_config.encounter_min_budget_share = yaml_data.get('encounter_min_budget_share', base_config.encounter_min_budget_share)
+        base_config.rule_import_workers = yaml_data.get('rule_import_workers', base_config.rule_import_workers)
+        base_config.rule_embedding_model = yaml_data.get('rule_embedding_model', base_config.rule_embedding_model)
         
         return base_config
     
@@ -147,6 +177,7 @@ class ConfigManager:
         config.database.lookup_path = os.getenv('ORACLE_FORGE_LOOKUP_PATH', config.database.lookup_path)
         config.database.rules_path = os.getenv('ORACLE_FORGE_RULES_PATH', config.database.rules_path)
         config.database.index_path = os.getenv('ORACLE_FORGE_INDEX_PATH', config.database.index_path)
+        config.database.adventure_storage = os.getenv('ORACLE_FORGE_ADVENTURE_STORAGE', config.database.adventure_storage)
         
         # LLM settings
         config.llm.model_path = os.getenv('ORACLE_FORGE_MODEL_PATH', config.llm.model_path)
@@ -169,6 +200,27 @@ class ConfigManager:
         config.log_level = os.getenv('ORACLE_FORGE_LOG_LEVEL', config.log_level)
         config.enable_rate_limiting = os.getenv('ORACLE_FORGE_RATE_LIMITING', str(config.enable_rate_limiting)).lower() == 'true'
         config.max_file_size = int(os.getenv('ORACLE_FORGE_MAX_FILE_SIZE', str(config.max_file_size)))
+        config.yaml_cache_max_bytes = int(os.getenv('ORACLE_FORGE_YAML_CACHE_MAX_BYTES', str(config.yaml_cache_max_bytes)))
+        config.session_journal_fsync_every = int(os.getenv('ORACLE_FORGE_SESSION_JOURNAL_FSYNC_EVERY', str(config.session_journal_fsync_every)))
+        config.session_journal_fsync_interval = float(os.getenv('ORACLE_FORGE_SESSION_JOURNAL_FSYNC_INTERVAL', str(config.session_journal_fsync_interval)))
+        config.session_journal_compact_every = int(os.getenv('ORACLE_FORGE_SESSION_JOURNAL_COMPACT_EVERY', str(config.session_journal_compact_every)))
+        config.lookup_fuzzy_threshold = float(os.getenv('ORACLE_FORGE_LOOKUP_FUZZY_THRESHOLD', str(config.lookup_fuzzy_threshold)))
+        config.lookup_fuzzy_limit = int(os.getenv('ORACLE_FORGE_LOOKUP_FUZZY_LIMIT', str(config.lookup_fuzzy_limit)))
+        config.lookup_cache_max_entries = int(os.getenv('ORACLE_FORGE_LOOKUP_CACHE_MAX_ENTRIES', str(config.lookup_cache_max_entries)))
+        config.lookup_cache_ttl = float(os.getenv('ORACLE_FORGE_LOOKUP_CACHE_TTL', str(config.lookup_cache_ttl)))
+        config.search_refresh_interval = float(os.getenv('ORACLE_FORGE_SEARCH_REFRESH_INTERVAL', str(config.search_refresh_interval)))
+        config.encounter_xp_per_level = float(os.getenv('ORACLE_FORGE_ENCOUNTER_XP_PER_LEVEL', str(config.encounter_xp_per_level)))
+        config.encounter_min_budget_share = float(os.getenv('ORACLE_FORGE_ENCOUNTER_MIN_BUDGET_SHARE', str(config.encounter_min_budget_share)))
+        config.rule_import_workers = int(os.getenv('ORACLE_FORGE_RULE_IMPORT_WORKERS', str(config.rule_import_workers)))
+        config.rule_embedding_model = os.getenv('ORACLE_FORGE_RULE_EMBEDDING_MODEL', config.rule_embedding_model)
+        
+        # Search domain boosts (comma-separated domain=boost pairs)
+        search_domain_boosts = os.getenv('ORACLE_FORGE_SEARCH_DOMAIN_BOOSTS')
+        if search_domain_boosts:
+            config.search_domain_boosts = {
+                domain.strip(): float(boost)
+                for domain, _, boost in (pair.partition('=') for pair in search_domain_boosts.split(','))
+            }
         
         return config
     
@@ -191,6 +243,9 @@ class ConfigManager:
             if not Path(path).exists():
                 errors.append(f"Required path '{name}' does not exist: {path}")
         
+        if config.database.adventure_storage not in ("yaml", "sqlite"):
+            errors.append(f"Adventure storage must be 'yaml' or 'sqlite', got: {config.database.adventure_storage}")
+        
         # Validate LLM model path
         if not Path(config.llm.model_path).exists():
             errors.append(f"LLM model not found: {config.llm.model_path}")
@@ -202,7 +257,30 @@ class ConfigManager:
         # Validate server port
         if not 1 <= config.server.port <= 65535:
             errors.append(f"Server port must be between 1 and 65535, got: {config.server.port}")
-        
+
+        # Validate fuzzy lookup similarity threshold
+        if not 0 < config.lookup_fuzzy_threshold <= 1:
+            errors.append(f"Lookup fuzzy threshold must be in (0, 1], got: {config.lookup_fuzzy_threshold}")
+
+        # Validate search domain boosts
+        for domain, boost in (config.search_domain_boosts or {}).items():
+            if not isinstance(boost, (int, float)) or boost < 0:
+                errors.append(f"Search boost for '{domain}' must be a non-negative number, got: {boost}")
+
+        # Validate encounter budget settings
+        if config.encounter_xp_per_level <= 0:
+            errors.append(f"Encounter XP per level must be positive, got: {config.encounter_xp_per_level}")
+        if not 0 <= config.encounter_min_budget_share <= 1:
+            errors.append(f"Encounter minimum budget share must be in [0, 1], got: {config.encounter_min_budget_share}")
+
+        # Validate rule import parallelism
+        if config.rule_import_workers < 1:
+            errors.append(f"Rule import workers must be at least 1, got: {config.rule_import_workers}")
+
+        # Validate rule embedding model path
+        if config.rule_embedding_model and not Path(config.rule_embedding_model).exists():
+            errors.append(f"Rule embedding model not found: {config.rule_embedding_model}")
+
         if errors:
             error_msg = "Configuration validation failed:\n" + "\n".join(f"  - {error}" for error in errors)
             logger.error(error_msg)
@@ -253,6 +331,7 @@ class ConfigManager:
                 'lookup_path': self.config.database.lookup_path,
                 'rules_path': self.config.database.rules_path,
                 'index_path': self.config.database.index_path,
+                'adventure_storage': self.config.database.adventure_storage,
             },
             'llm': {
                 'model_path': self.config.llm.model_path,
@@ -270,6 +349,20 @@ class ConfigManager:
             'log_level': self.config.log_level,
             'enable_rate_limiting': self.config.enable_rate_limiting,
             'max_file_size': self.config.max_file_size,
+            'yaml_cache_max_bytes': self.config.yaml_cache_max_bytes,
+            'session_journal_fsync_every': self.config.session_journal_fsync_every,
+            'session_journal_fsync_interval': self.config.session_journal_fsync_interval,
+            'session_journal_compact_every': self.config.session_journal_compact_every,
+            'lookup_fuzzy_threshold': self.config.lookup_fuzzy_threshold,
+            'lookup_fuzzy_limit': self.config.lookup_fuzzy_limit,
+            'lookup_cache_max_entries': self.config.lookup_cache_max_entries,
+            'lookup_cache_ttl': self.config.lookup_cache_ttl,
+            'search_domain_boosts': self.config.search_domain_boosts,
+            'search_refresh_interval': self.config.search_refresh_interval,
+            'encounter_xp_per_level': self.config.encounter_xp_per_level,
+            'encounter_min_budget_share': self.config.encounter_min_budget_share,
+            'rule_import_workers': self.config.rule_import_workers,
+            'rule_embedding_model': self.config.rule_embedding_model,
         }
         
         with open(path, 'w') as f:
@@ -6,18 +6,34 @@ in Oracle Forge, including adventures, lookup data, tables, and rules.
 """
 
 from .base_data import BaseDataAccess, DataAccessError, TemplateNotFoundError, ValidationError
+from .yaml_cache import YAMLCache, get_yaml_cache
+from .session_journal import SessionJournal, get_session_journal
+from .template_registry import TemplateRegistry, get_template_registry
+from .lookup_index import LookupIndex
 from .adventure_data import AdventureDataAccess
+from .adventure_sqlite import SQLiteAdventureDataAccess, create_adventure_data_access
 from .lookup_data import LookupDataAccess
 from .tables_data import TableDataAccess
 from .rules_data import RuleDataAccess
+from .search_data import SearchDataAccess
 
 __all__ = [
     'BaseDataAccess',
     'DataAccessError', 
     'TemplateNotFoundError',
     'ValidationError',
+    'YAMLCache',
+    'get_yaml_cache',
+    'SessionJournal',
+    'get_session_journal',
+    'TemplateRegistry',
+    'get_template_registry',
+    'LookupIndex',
     'AdventureDataAccess',
+    'SQLiteAdventureDataAccess',
+    'create_adventure_data_access',
     'LookupDataAccess',
     'TableDataAccess',
     'RuleDataAccess',
+    'SearchDataAccess',
 ] 
\ No newline at end of file
@@ -6,16 +6,27 @@ world entities (NPCs, factions, locations, story lines), and players.
 """
 
 import os
+from datetime import datetime
 from typing import Dict, List, Optional, Any
 from pathlib import Path
 
 from .base_data import BaseDataAccess, DataAccessError, ValidationError
+from .session_journal import JOURNAL_SEQ_FIELD, get_session_journal, close_session_journal
+from .adventure_locks import READ, WRITE, get_adventure_lock, reads_adventure, writes_adventure
+from .lookup_index import LookupIndex, get_lookup_index, get_built_index
+from ..config import get_config
+from ..utils.dir_cache import get_directory_cache
 from ..utils.paths import (
     get_adventures_path,
     get_adventure_path,
     get_adventure_file_path,
 )
 
+WORLD_ENTITY_TYPES = ["npcs", "factions", "locations", "story_lines"]
+
+# Facet posting lists of the world entity index
+WORLD_INDEX_FACETS = ("adventure", "entity_type", "status")
+
 
 class AdventureDataAccess(BaseDataAccess):
     """Data access class for adventure-related operations"""
@@ -31,6 +42,7 @@ class AdventureDataAccess(BaseDataAccess):
         names = self._list_directories(adventures_path)
         return [{"id": name, "name": name} for name in names]
     
+    @writes_adventure
     def create_adventure(self, adventure_name: str) -> Dict[str, Any]:
         """Create a new adventure with default files"""
         adventure_path = get_adventure_path(adventure_name)
@@ -78,6 +90,7 @@ class AdventureDataAccess(BaseDataAccess):
             "active_session": active_session
         }
     
+    @writes_adventure
     def delete_adventure(self, adventure_name: str) -> bool:
         """Delete an adventure and all its data"""
         adventure_path = get_adventure_path(adventure_name)
@@ -89,17 +102,25 @@ class AdventureDataAccess(BaseDataAccess):
         
         try:
             import shutil
+            close_session_journal(adventure_path)
             shutil.rmtree(adventure_path)
+            get_directory_cache().invalidate_tree(adventure_path)
             return True
         except Exception as e:
             raise DataAccessError(f"Failed to delete adventure {adventure_name}: {e}")
     
+    def lock_adventure(self, adventure_name: str, write: bool = True):
+        """Hold an adventure's lock across several data access calls"""
+        return get_adventure_lock(adventure_name).acquire(WRITE if write else READ)
+    
     # World State Management
+    @reads_adventure
     def get_world_state(self, adventure_name: str) -> Dict[str, Any]:
         """Get the world state for an adventure"""
         file_path = get_adventure_file_path(adventure_name, "world_state.yaml")
         return self._load_yaml(file_path)
     
+    @writes_adventure
     def update_world_state(self, adventure_name: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Update the world state for an adventure"""
         file_path = get_adventure_file_path(adventure_name, "world_state.yaml")
@@ -108,11 +129,13 @@ class AdventureDataAccess(BaseDataAccess):
         return data
     
     # Player Management
+    @reads_adventure
     def get_player_states(self, adventure_name: str) -> Dict[str, Any]:
         """Get player states for an adventure"""
         file_path = get_adventure_file_path(adventure_name, "player_states.yaml")
         return self._load_yaml(file_path)
     
+    @writes_adventure
     def create_player(self, adventure_name: str, player_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new player character"""
         # Generate safe filename from player name
@@ -140,6 +163,7 @@ class AdventureDataAccess(BaseDataAccess):
         self.log_operation("create_player", f"Created player {player_name} in {adventure_name}")
         return player_data
     
+    @reads_adventure
     def get_player(self, adventure_name: str, player_filename: str) -> Dict[str, Any]:
         """Get a specific player character"""
         player_path = os.path.join(get_adventure_path(adventure_name), "players", player_filename)
@@ -148,6 +172,7 @@ class AdventureDataAccess(BaseDataAccess):
         data['filename'] = player_filename
         return data
     
+    @writes_adventure
     def update_player(self, adventure_name: str, player_filename: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Update a player character"""
         player_path = os.path.join(get_adventure_path(adventure_name), "players", player_filename)
@@ -155,6 +180,7 @@ class AdventureDataAccess(BaseDataAccess):
         self.log_operation("update_player", f"Updated {player_filename} in {adventure_name}")
         return data
     
+    @writes_adventure
     def delete_player(self, adventure_name: str, player_filename: str) -> bool:
         """Delete a player character"""
         player_path = os.path.join(get_adventure_path(adventure_name), "players", player_filename)
@@ -170,6 +196,7 @@ class AdventureDataAccess(BaseDataAccess):
         # Delete the file
         return self._delete_file(player_path)
     
+    @writes_adventure
     def update_player_states(self, adventure_name: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Update player states for an adventure"""
         file_path = get_adventure_file_path(adventure_name, "player_states.yaml")
@@ -177,17 +204,60 @@ class AdventureDataAccess(BaseDataAccess):
         return data
     
     # Session Management
+    @reads_adventure
     def get_active_session(self, adventure_name: str) -> Dict[str, Any]:
-        """Get the active session for an adventure"""
+        """Get the active session for an adventure, including journaled log entries"""
         file_path = get_adventure_file_path(adventure_name, "active_session.yaml")
-        return self._load_yaml(file_path)
+        journal = get_session_journal(get_adventure_path(adventure_name))
+        data = journal.merge_into(self._load_yaml(file_path))
+        # The journal bookkeeping field is internal to the YAML engine
+        data.pop(JOURNAL_SEQ_FIELD, None)
+        return data
     
+    @writes_adventure
     def update_active_session(self, adventure_name: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Update the active session for an adventure"""
         file_path = get_adventure_file_path(adventure_name, "active_session.yaml")
-        self._save_yaml(file_path, data)
+        journal = get_session_journal(get_adventure_path(adventure_name))
+        # The caller's document supersedes everything journaled so far
+        self._save_yaml(file_path, {**data, JOURNAL_SEQ_FIELD: journal.last_seq})
+        journal.truncate()
         return data
     
+    @writes_adventure
+    def append_session_log(self, adventure_name: str, log_entry: Dict[str, Any]) -> int:
+        """Append an entry to the active session log without rewriting the session file"""
+        file_path = get_adventure_file_path(adventure_name, "active_session.yaml")
+        if not os.path.exists(file_path):
+            raise DataAccessError(f"No active session for adventure {adventure_name}")
+        
+        journal = get_session_journal(get_adventure_path(adventure_name))
+        seq = journal.append(log_entry)
+        
+        if journal.pending >= get_config().session_journal_compact_every:
+            self.compact_session_journal(adventure_name)
+        return seq
+    
+    @writes_adventure
+    def compact_session_journal(self, adventure_name: str) -> int:
+        """Fold journaled log entries into active_session.yaml and truncate the journal"""
+        file_path = get_adventure_file_path(adventure_name, "active_session.yaml")
+        journal = get_session_journal(get_adventure_path(adventure_name))
+        if journal.pending == 0:
+            return 0
+        
+        data = self._load_yaml(file_path)
+        log_length = len(data.get("log") or [])
+        data = journal.merge_into(data)
+        folded = len(data.get("log") or []) - log_length
+        data[JOURNAL_SEQ_FIELD] = journal.last_seq
+        self._save_yaml(file_path, data)
+        journal.truncate()
+        
+        self.log_operation("compact_session_journal", f"Folded {folded} log entries into {adventure_name}")
+        return folded
+    
+    @writes_adventure
     def create_session(self, adventure_name: str, session_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new session"""
         # Generate session filename
@@ -205,16 +275,80 @@ class AdventureDataAccess(BaseDataAccess):
         self.log_operation("create_session", f"Created session {session_id} in {adventure_name}")
         return session_data
     
+    @reads_adventure
     def get_session(self, adventure_name: str, session_filename: str) -> Dict[str, Any]:
         """Get a specific session"""
         session_path = os.path.join(get_adventure_path(adventure_name), "sessions", session_filename)
         return self._load_yaml(session_path)
     
+    @writes_adventure
+    def save_session(self, adventure_name: str, session_filename: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Save a session document as-is, e.g. when archiving the active session"""
+        session_path = os.path.join(get_adventure_path(adventure_name), "sessions", session_filename)
+        # Archives keep the session's own key order and readable non-ASCII text
+        self._save_yaml(session_path, data, sort_keys=False, allow_unicode=True)
+        self.log_operation("save_session", f"Saved {session_filename} in {adventure_name}")
+        return data
+    
+    def new_active_session_from_template(self, adventure_name: str, session_id: str) -> Dict[str, Any]:
+        """Build a fresh, empty active session document from the template; it is not saved"""
+        session_data = self._load_template("adventures/active_session.yaml")
+        session_data["adventure"] = adventure_name
+        session_data["session_id"] = session_id
+        session_data["log"] = []
+        if "metadata" in session_data:
+            session_data["metadata"]["start_time"] = datetime.now().isoformat()
+            session_data["metadata"]["duration"] = ""
+            session_data["metadata"]["scene_count"] = 0
+            session_data["metadata"]["oracle_questions"] = 0
+        return session_data
+    
+    @reads_adventure
     def list_sessions(self, adventure_name: str) -> List[str]:
         """List all sessions for an adventure"""
         sessions_path = os.path.join(get_adventure_path(adventure_name), "sessions")
         return self._list_files(sessions_path)
     
+    # World Entity Index
+    # Signature of a world index source; None compares file (mtime, size)
+    _world_source_signature = None
+    
+    def get_world_index(self) -> LookupIndex:
+        """Get the process-wide index of world entities across every adventure ("world")"""
+        return get_lookup_index("world", lambda: LookupIndex(
+            "world", WORLD_INDEX_FACETS, self._list_world_sources, self._load_world_source,
+            signature=self._world_source_signature
+        ))
+    
+    def _list_world_sources(self) -> List[str]:
+        sources = []
+        for adventure_name in self._list_directories(get_adventures_path()):
+            for entity_type in WORLD_ENTITY_TYPES:
+                entity_dir = self._get_world_entity_path(adventure_name, entity_type)
+                sources.extend(os.path.join(entity_dir, filename) for filename in self._list_files(entity_dir))
+        return sources
+    
+    def _load_world_source(self, file_path: str) -> List[Dict[str, Any]]:
+        entity = self._load_yaml(file_path)
+        if not isinstance(entity, dict) or not entity:
+            return []
+        entity_dir = os.path.dirname(file_path)
+        entity['adventure'] = os.path.basename(os.path.dirname(os.path.dirname(entity_dir)))
+        entity['entity_type'] = os.path.basename(entity_dir)
+        entity['filename'] = os.path.basename(file_path)
+        return [entity]
+    
+    def _world_source(self, adventure_name: str, entity_type: str, entity_filename: str) -> str:
+        """Index source holding a world entity"""
+        return os.path.join(self._get_world_entity_path(adventure_name, entity_type), entity_filename)
+    
+    def _reindex_world_entities(self, adventure_name: str, entity_type: str, entity_filenames: List[str]) -> None:
+        """Reindex written world entities, if the world index has been built"""
+        index = get_built_index("world")
+        if index is not None:
+            for source in {self._world_source(adventure_name, entity_type, name) for name in entity_filenames}:
+                index.reindex_source(source)
+    
     # World Entity Management (NPCs, Factions, Locations, Story Lines)
     def _get_world_entity_path(self, adventure_name: str, entity_type: str) -> str:
         """Get the path for a world entity type"""
@@ -232,11 +366,13 @@ class AdventureDataAccess(BaseDataAccess):
         singular_type = singular_map.get(entity_type, entity_type.rstrip('s'))
         return f"adventures/world/{entity_type}/{singular_type}_template.yaml"
     
+    @reads_adventure
     def list_world_entities(self, adventure_name: str, entity_type: str) -> List[str]:
         """List all entities of a specific type"""
         entity_path = self._get_world_entity_path(adventure_name, entity_type)
         return self._list_files(entity_path)
     
+    @writes_adventure
     def create_world_entity(self, adventure_name: str, entity_type: str, 
                           entity_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new world entity (NPC, faction, location, story line)"""
@@ -254,24 +390,80 @@ class AdventureDataAccess(BaseDataAccess):
         
         # Update world state to include the new entity
         self._update_world_state_with_entity(adventure_name, entity_type, entity_name)
+        self._reindex_world_entities(adventure_name, entity_type, [safe_filename])
         
         self.log_operation("create_world_entity", f"Created {entity_type} {entity_name} in {adventure_name}")
         return entity_data
     
+    @writes_adventure
+    def bulk_upsert_world_entities(self, adventure_name: str, entity_type: str,
+                                   entities: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Create or update many world entities with one world state write
+        
+        New entities are merged with the entity template; existing ones are
+        replaced with the given data, as the single-entity endpoint does.
+        """
+        template_path = self._get_entity_template_path(entity_type)
+        entity_dir = self._get_world_entity_path(adventure_name, entity_type)
+        existing = set(self.list_world_entities(adventure_name, entity_type))
+        
+        created, updated, written = [], [], []
+        for entity_data in entities:
+            entity_name = entity_data.get('name', 'unknown')
+            safe_filename = self._safe_filename(entity_name) + '.yaml'
+            written.append(safe_filename)
+            
+            if safe_filename in existing:
+                self._save_yaml(os.path.join(entity_dir, safe_filename), entity_data)
+                updated.append(entity_data)
+                continue
+            
+            merged_data = self._build_from_template(template_path, entity_data)
+            self._save_yaml(os.path.join(entity_dir, safe_filename), merged_data)
+            existing.add(safe_filename)
+            created.append(merged_data)
+        
+        if created:
+            world_state = self.get_world_state(adventure_name)
+            entity_list = world_state.get(entity_type) or []
+            new_names = [data.get('name', 'unknown') for data in created]
+            entity_list.extend(name for name in new_names if name not in entity_list)
+            world_state[entity_type] = entity_list
+            self.update_world_state(adventure_name, world_state)
+        self._reindex_world_entities(adventure_name, entity_type, written)
+        
+        self.log_operation("bulk_upsert_world_entities",
+                           f"Created {len(created)} and updated {len(updated)} {entity_type} in {adventure_name}")
+        return {"created": created, "updated": updated}
+    
+    @reads_adventure
     def get_world_entity(self, adventure_name: str, entity_type: str, 
                         entity_filename: str) -> Dict[str, Any]:
         """Get a specific world entity"""
         entity_path = os.path.join(self._get_world_entity_path(adventure_name, entity_type), entity_filename)
         return self._load_yaml(entity_path)
     
+    @reads_adventure
+    def find_world_entity(self, adventure_name: str, entity_type: str,
+                         entity_name: str) -> Optional[Dict[str, Any]]:
+        """Find a world entity by its display name"""
+        entity_filename = self._safe_filename(entity_name) + '.yaml'
+        entity_path = os.path.join(self._get_world_entity_path(adventure_name, entity_type), entity_filename)
+        data = self._load_yaml(entity_path)
+        return data if data.get('name') == entity_name else None
+    
+    @writes_adventure
     def update_world_entity(self, adventure_name: str, entity_type: str, 
                           entity_filename: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Update a world entity"""
         entity_path = os.path.join(self._get_world_entity_path(adventure_name, entity_type), entity_filename)
         self._save_yaml(entity_path, data)
+        self._reindex_world_entities(adventure_name, entity_type, [entity_filename])
         self.log_operation("update_world_entity", f"Updated {entity_type} {entity_filename} in {adventure_name}")
         return data
     
+    @writes_adventure
     def delete_world_entity(self, adventure_name: str, entity_type: str, 
                           entity_filename: str) -> bool:
         """Delete a world entity"""
@@ -282,6 +474,7 @@ class AdventureDataAccess(BaseDataAccess):
         
         # Delete the file
         success = self._delete_file(entity_path)
+        self._reindex_world_entities(adventure_name, entity_type, [entity_filename])
         
         if success:
             # Update world state to remove the entity
@@ -0,0 +1,182 @@
+"""
+Per-adventure reader/writer locks for Oracle Forge
+
+Adventure documents are updated with read-modify-write sequences (entity
+create plus world state, player plus player index, session log appends), which
+lose updates when two threads or worker processes interleave. Every
+AdventureDataAccess operation takes its adventure's lock: reads share it,
+writes hold it exclusively.
+
+Each lock has two layers. A writer-preferring reader/writer lock coordinates
+threads in this process. An fcntl.flock on index_path/locks/<adventure>.lock
+coordinates worker processes: shared for readers, exclusive for writers.
+Where fcntl is unavailable (Windows) only the in-process layer applies.
+
+Locks are reentrant per thread, so a write may call other reads and writes on
+the same adventure. Upgrading a held read lock to a write lock is refused
+rather than left to deadlock.
+"""
+
+import os
+import functools
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+from ..utils.paths import get_index_path, safe_filename, ensure_directory_exists
+
+LOCKS_DIRNAME = "locks"
+
+READ = "read"
+WRITE = "write"
+_NESTED = "nested"
+
+
+class AdventureLock:
+    """Reentrant reader/writer lock for one adventure, across threads and processes"""
+
+    def __init__(self, lock_path: str):
+        self.lock_path = lock_path
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = None
+        self._waiting_writers = 0
+        self._local = threading.local()
+
+    def _held(self) -> list:
+        """Per-thread stack of (mode, file handle) acquisitions"""
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def _lock_file(self, exclusive: bool):
+        """Take the cross-process lock; returns the open handle, or None without fcntl"""
+        if fcntl is None:
+            return None
+        ensure_directory_exists(os.path.dirname(self.lock_path))
+        handle = open(self.lock_path, "a")
+        try:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        except Exception:
+            handle.close()
+            raise
+        return handle
+
+    @staticmethod
+    def _unlock_file(handle) -> None:
+        if handle is not None:
+            try:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+            finally:
+                handle.close()
+
+    def _acquire_read(self) -> None:
+        held = self._held()
+        if held:
+            # Already reading or writing on this thread
+            held.append((_NESTED, None))
+            return
+
+        with self._cond:
+            while self._writer is not None or self._waiting_writers:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            handle = self._lock_file(exclusive=False)
+        except Exception:
+            self._release_reader_slot()
+            raise
+        held.append((READ, handle))
+
+    def _release_reader_slot(self) -> None:
+        with self._cond:
+            self._readers -= 1
+            if self._readers == 0:
+                self._cond.notify_all()
+
+    def _acquire_write(self) -> None:
+        held = self._held()
+        if self._writer == threading.get_ident():
+            held.append((_NESTED, None))
+            return
+        if held:
+            raise RuntimeError(f"Cannot upgrade a read lock to a write lock on {self.lock_path}")
+
+        with self._cond:
+            self._waiting_writers += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._cond.wait()
+            finally:
+                self._waiting_writers -= 1
+            self._writer = threading.get_ident()
+        try:
+            handle = self._lock_file(exclusive=True)
+        except Exception:
+            self._release_writer_slot()
+            raise
+        held.append((WRITE, handle))
+
+    def _release_writer_slot(self) -> None:
+        with self._cond:
+            self._writer = None
+            self._cond.notify_all()
+
+    def _release(self) -> None:
+        mode, handle = self._held().pop()
+        if mode == _NESTED:
+            return
+        try:
+            self._unlock_file(handle)
+        finally:
+            if mode == READ:
+                self._release_reader_slot()
+            else:
+                self._release_writer_slot()
+
+    @contextmanager
+    def acquire(self, mode: str) -> Iterator[None]:
+        """Hold the lock in READ or WRITE mode for the duration of the block"""
+        if mode == WRITE:
+            self._acquire_write()
+        else:
+            self._acquire_read()
+        try:
+            yield
+        finally:
+            self._release()
+
+
+_locks: Dict[str, AdventureLock] = {}
+_locks_lock = threading.Lock()
+
+
+def get_adventure_lock(adventure_name: str) -> AdventureLock:
+    """Get the process-wide lock for an adventure"""
+    with _locks_lock:
+        lock = _locks.get(adventure_name)
+        if lock is None:
+            lock_path = os.path.join(get_index_path(), LOCKS_DIRNAME, f"{safe_filename(adventure_name)}.lock")
+            lock = AdventureLock(lock_path)
+            _locks[adventure_name] = lock
+        return lock
+
+
+def _locked_method(mode: str) -> Callable:
+    """Decorate a data access method whose first argument is the adventure name"""
+    def decorator(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(self, adventure_name: str, *args, **kwargs):
+            with get_adventure_lock(adventure_name).acquire(mode):
+                return method(self, adventure_name, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+reads_adventure = _locked_method(READ)
+writes_adventure = _locked_method(WRITE)
@@ -0,0 +1,590 @@
+"""
+SQLite-backed Adventure DataAccess for Oracle Forge
+
+Large campaigns keep thousands of NPCs, locations and log entries. The YAML
+layout stores one file per document and rewrites world_state.yaml on every
+entity create or delete; this engine stores the same documents as JSON rows
+in a per-adventure adventure.db instead:
+
+- documents(collection, key, name, data): one row per YAML file. collection is
+  "state" for world_state/player_states/active_session, "players", "sessions"
+  or a world entity type, and key is the filename the YAML layout would use,
+  so the public interface (and the filenames clients see) is unchanged.
+- session_log(seq, entry): active session log entries not yet folded into the
+  active_session document.
+
+The database runs in WAL mode so readers never block the writer, entity
+lookups by type and name are indexed, and every multi-row update (entity plus
+world state, player plus player index, log compaction) runs in one
+transaction. The active session methods also take the adventure lock, like
+the YAML engine's, so a service holding lock_adventure() (end_session
+archiving the log and resetting the session) cannot have an append land in
+between and be dropped by the reset.
+
+Select it with database.adventure_storage: sqlite. Adventures that only have
+the YAML layout are imported on first access, into a separate file that is
+linked into place once complete; `python -m server.manage
+adventure-db import|export` converts explicitly in either direction.
+"""
+
+import os
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Iterator, Tuple
+
+from .base_data import DataAccessError
+from ..config import get_config
+from .adventure_data import AdventureDataAccess, WORLD_ENTITY_TYPES
+from .adventure_locks import reads_adventure, writes_adventure
+from .session_journal import JOURNAL_SEQ_FIELD, get_session_journal
+from ..utils.paths import get_adventures_path, get_adventure_path, get_adventure_file_path
+
+DATABASE_FILENAME = "adventure.db"
+SCHEMA_VERSION = 1
+
+STATE_COLLECTION = "state"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    collection TEXT NOT NULL,
+    key TEXT NOT NULL,
+    name TEXT,
+    data TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (collection, key)
+);
+CREATE INDEX IF NOT EXISTS idx_documents_collection_name ON documents (collection, name);
+CREATE TABLE IF NOT EXISTS session_log (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    entry TEXT NOT NULL
+);
+"""
+
+
+def get_adventure_db_path(adventure_name: str) -> str:
+    """Get the SQLite database path for an adventure"""
+    return os.path.join(get_adventure_path(adventure_name), DATABASE_FILENAME)
+
+
+def _database_signature(db_path: str) -> Optional[Tuple[int, int]]:
+    """Signature of a database and its WAL, which takes writes until a checkpoint"""
+    signatures = []
+    for path in (db_path, db_path + "-wal"):
+        try:
+            st = os.stat(path)
+        except OSError:
+            if path == db_path:
+                return None
+            continue
+        signatures.append((st.st_mtime_ns, st.st_size))
+    return (max(mtime for mtime, _ in signatures), sum(size for _, size in signatures))
+
+
+def _collection_dir(adventure_name: str, collection: str) -> str:
+    """Directory the YAML layout uses for a collection"""
+    adventure_path = get_adventure_path(adventure_name)
+    if collection == STATE_COLLECTION:
+        return adventure_path
+    if collection in ("players", "sessions"):
+        return os.path.join(adventure_path, collection)
+    return os.path.join(adventure_path, "world", collection)
+
+
+class SQLiteAdventureDataAccess(AdventureDataAccess):
+    """Adventure data access backed by one SQLite database per adventure"""
+
+    # Connection and transaction handling
+    def _open(self, db_path: str) -> sqlite3.Connection:
+        """Open a connection in autocommit mode; transactions are explicit"""
+        conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _initialize_database(self, db_path: str) -> None:
+        """Create the schema in a new or existing database"""
+        conn = self._open(db_path)
+        try:
+            conn.executescript(SCHEMA)
+            conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        finally:
+            conn.close()
+
+    def _database_for(self, adventure_name: str) -> str:
+        """Return the adventure's database path, importing the YAML layout if needed"""
+        db_path = get_adventure_db_path(adventure_name)
+        if os.path.exists(db_path):
+            return db_path
+        if not os.path.isdir(get_adventure_path(adventure_name)):
+            raise DataAccessError(f"Adventure '{adventure_name}' not found")
+
+        # Import into a private file and link it into place only once it is complete, so
+        # no caller ever opens a half-imported database. os.link fails if another thread or
+        # process got there first; its database is kept and this import is discarded.
+        tmp_path = f"{db_path}.{os.getpid()}.{threading.get_ident()}.import"
+        try:
+            self._import_into(adventure_name, tmp_path)
+            try:
+                os.link(tmp_path, db_path)
+            except FileExistsError:
+                pass
+        finally:
+            for path in (tmp_path, f"{tmp_path}-wal", f"{tmp_path}-shm"):
+                if os.path.exists(path):
+                    os.remove(path)
+        return db_path
+
+    @contextmanager
+    def _transaction(self, adventure_name: str) -> Iterator[sqlite3.Connection]:
+        """Run a block as one write transaction, rolling back on error"""
+        conn = self._open(self._database_for(adventure_name))
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        except sqlite3.Error as e:
+            raise DataAccessError(f"Database error in adventure {adventure_name}: {e}")
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _reader(self, adventure_name: str) -> Iterator[sqlite3.Connection]:
+        """Open a connection for reads"""
+        conn = self._open(self._database_for(adventure_name))
+        try:
+            yield conn
+        except sqlite3.Error as e:
+            raise DataAccessError(f"Database error in adventure {adventure_name}: {e}")
+        finally:
+            conn.close()
+
+    # Row helpers
+    @staticmethod
+    def _encode(data: Dict[str, Any]) -> str:
+        # YAML may carry dates and timestamps; store them the way they print
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+    @staticmethod
+    def _get_document(conn: sqlite3.Connection, collection: str, key: str) -> Dict[str, Any]:
+        row = conn.execute(
+            "SELECT data FROM documents WHERE collection = ? AND key = ?", (collection, key)
+        ).fetchone()
+        return json.loads(row[0]) if row else {}
+
+    def _put_document(self, conn: sqlite3.Connection, collection: str, key: str,
+                      data: Dict[str, Any]) -> None:
+        name = data.get('name') if isinstance(data.get('name'), str) else None
+        conn.execute(
+            "INSERT INTO documents (collection, key, name, data, updated_at) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (collection, key) DO UPDATE SET "
+            "name = excluded.name, data = excluded.data, updated_at = excluded.updated_at",
+            (collection, key, name, self._encode(data), datetime.now().isoformat())
+        )
+
+    @staticmethod
+    def _delete_document(conn: sqlite3.Connection, collection: str, key: str) -> bool:
+        cursor = conn.execute("DELETE FROM documents WHERE collection = ? AND key = ?", (collection, key))
+        return cursor.rowcount > 0
+
+    @staticmethod
+    def _list_keys(conn: sqlite3.Connection, collection: str) -> List[str]:
+        rows = conn.execute(
+            "SELECT key FROM documents WHERE collection = ? ORDER BY key", (collection,)
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def _read_document(self, adventure_name: str, collection: str, key: str) -> Dict[str, Any]:
+        with self._reader(adventure_name) as conn:
+            return self._get_document(conn, collection, key)
+
+    def _write_document(self, adventure_name: str, collection: str, key: str,
+                        data: Dict[str, Any]) -> Dict[str, Any]:
+        with self._transaction(adventure_name) as conn:
+            self._put_document(conn, collection, key, data)
+        return data
+
+    # Adventure Management
+    def create_adventure(self, adventure_name: str) -> Dict[str, Any]:
+        """Create a new adventure database with default documents"""
+        adventure_path = get_adventure_path(adventure_name)
+
+        if os.path.exists(adventure_path):
+            raise DataAccessError(f"Adventure '{adventure_name}' already exists")
+
+        self.log_operation("create_adventure", f"Creating {adventure_name}")
+
+        # Maps and uploaded images still live on disk next to the database
+        self._ensure_directory(os.path.join(adventure_path, "world", "custom_maps"))
+
+        world_state = self._build_from_template(
+            "adventures/world_state.yaml",
+            {"chaos_factor": 5, "current_scene": 1, "days_passed": 0}
+        )
+        player_states = self._build_from_template("adventures/player_states.yaml", {"players": []})
+        active_session = self._build_from_template(
+            "adventures/active_session.yaml",
+            {"adventure": adventure_name, "session_id": "session_01"}
+        )
+
+        self._initialize_database(get_adventure_db_path(adventure_name))
+        with self._transaction(adventure_name) as conn:
+            self._put_document(conn, STATE_COLLECTION, "world_state.yaml", world_state)
+            self._put_document(conn, STATE_COLLECTION, "player_states.yaml", player_states)
+            self._put_document(conn, STATE_COLLECTION, "active_session.yaml", active_session)
+
+        return {
+            "adventure_name": adventure_name,
+            "world_state": world_state,
+            "player_states": player_states,
+            "active_session": active_session
+        }
+
+    # World State Management
+    def get_world_state(self, adventure_name: str) -> Dict[str, Any]:
+        """Get the world state for an adventure"""
+        return self._read_document(adventure_name, STATE_COLLECTION, "world_state.yaml")
+
+    def update_world_state(self, adventure_name: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Update the world state for an adventure"""
+        self._write_document(adventure_name, STATE_COLLECTION, "world_state.yaml", data)
+        self.log_operation("update_world_state", f"Updated {adventure_name}")
+        return data
+
+    # Player Management
+    def get_player_states(self, adventure_name: str) -> Dict[str, Any]:
+        """Get player states for an adventure"""
+        return self._read_document(adventure_name, STATE_COLLECTION, "player_states.yaml")
+
+    def update_player_states(self, adventure_name: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Update player states for an adventure"""
+        return self._write_document(adventure_name, STATE_COLLECTION, "player_states.yaml", data)
+
+    def create_player(self, adventure_name: str, player_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Create a new player character and register it in player states"""
+        player_name = player_data.get('name', 'unknown')
+        safe_filename = self._safe_filename(player_name) + '.yaml'
+        player_data = self._build_from_template("adventures/players/player_template.yaml", player_data)
+
+        with self._transaction(adventure_name) as conn:
+            self._put_document(conn, "players", safe_filename, player_data)
+            player_states = self._get_document(conn, STATE_COLLECTION, "player_states.yaml")
+            players = player_states.get('players', [])
+            if safe_filename not in players:
+                players.append(safe_filename)
+                player_states['players'] = players
+                self._put_document(conn, STATE_COLLECTION, "player_states.yaml", player_states)
+
+        player_data['filename'] = safe_filename
+        self.log_operation("create_player", f"Created player {player_name} in {adventure_name}")
+        return player_data
+
+    def get_player(self, adventure_name: str, player_filename: str) -> Dict[str, Any]:
+        """Get a specific player character"""
+        data = self._read_document(adventure_name, "players", player_filename)
+        data['filename'] = player_filename
+        return data
+
+    def update_player(self, adventure_name: str, player_filename: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Update a player character"""
+        self._write_document(adventure_name, "players", player_filename, data)
+        self.log_operation("update_player", f"Updated {player_filename} in {adventure_name}")
+        return data
+
+    def delete_player(self, adventure_name: str, player_filename: str) -> bool:
+        """Delete a player character and remove it from player states"""
+        with self._transaction(adventure_name) as conn:
+            player_states = self._get_document(conn, STATE_COLLECTION, "player_states.yaml")
+            players = player_states.get('players', [])
+            if player_filename in players:
+                players.remove(player_filename)
+                player_states['players'] = players
+                self._put_document(conn, STATE_COLLECTION, "player_states.yaml", player_states)
+            return self._delete_document(conn, "players", player_filename)
+
+    # Session Management
+    @reads_adventure
+    def get_active_session(self, adventure_name: str) -> Dict[str, Any]:
+        """Get the active session, including log entries not yet compacted"""
+        with self._reader(adventure_name) as conn:
+            data = self._get_document(conn, STATE_COLLECTION, "active_session.yaml")
+            pending = [json.loads(row[0]) for row in conn.execute("SELECT entry FROM session_log ORDER BY seq")]
+        if pending:
+            data["log"] = list(data.get("log") or []) + pending
+        return data
+
+    @writes_adventure
+    def update_active_session(self, adventure_name: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Replace the active session; the caller's document supersedes pending log entries"""
+        document = {key: value for key, value in data.items() if key != JOURNAL_SEQ_FIELD}
+        with self._transaction(adventure_name) as conn:
+            self._put_document(conn, STATE_COLLECTION, "active_session.yaml", document)
+            conn.execute("DELETE FROM session_log")
+        return data
+
+    @writes_adventure
+    def append_session_log(self, adventure_name: str, log_entry: Dict[str, Any]) -> int:
+        """Append an entry to the active session log as a single row insert"""
+        with self._transaction(adventure_name) as conn:
+            cursor = conn.execute("INSERT INTO session_log (entry) VALUES (?)", (self._encode(log_entry),))
+            seq = cursor.lastrowid
+            pending = conn.execute("SELECT COUNT(*) FROM session_log").fetchone()[0]
+
+        if pending >= self.config.session_journal_compact_every:
+            self.compact_session_journal(adventure_name)
+        return seq
+
+    @writes_adventure
+    def compact_session_journal(self, adventure_name: str) -> int:
+        """Fold pending log rows into the active session document"""
+        with self._transaction(adventure_name) as conn:
+            rows = conn.execute("SELECT entry FROM session_log ORDER BY seq").fetchall()
+            if not rows:
+                return 0
+            data = self._get_document(conn, STATE_COLLECTION, "active_session.yaml")
+            data["log"] = list(data.get("log") or []) + [json.loads(row[0]) for row in rows]
+            self._put_document(conn, STATE_COLLECTION, "active_session.yaml", data)
+            conn.execute("DELETE FROM session_log")
+
+        self.log_operation("compact_session_journal", f"Folded {len(rows)} log entries into {adventure_name}")
+        return len(rows)
+
+    def create_session(self, adventure_name: str, session_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Create a new session"""
+        session_id = session_data.get('session_id', 'session_01')
+        session_data = self._build_from_template("adventures/sessions/session_template.yaml", session_data)
+        self._write_document(adventure_name, "sessions", f"{session_id}.yaml", session_data)
+        self.log_operation("create_session", f"Created session {session_id} in {adventure_name}")
+        return session_data
+
+    def get_session(self, adventure_name: str, session_filename: str) -> Dict[str, Any]:
+        """Get a specific session"""
+        return self._read_document(adventure_name, "sessions", session_filename)
+
+    def save_session(self, adventure_name: str, session_filename: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Save a session document as-is, e.g. when archiving the active session"""
+        self._write_document(adventure_name, "sessions", session_filename, data)
+        self.log_operation("save_session", f"Saved {session_filename} in {adventure_name}")
+        return data
+
+    def list_sessions(self, adventure_name: str) -> List[str]:
+        """List all sessions for an adventure"""
+        with self._reader(adventure_name) as conn:
+            return self._list_keys(conn, "sessions")
+
+    # World Entity Index
+    # One source per adventure database; its WAL takes writes until a checkpoint
+    _world_source_signature = staticmethod(_database_signature)
+
+    def _list_world_sources(self) -> List[str]:
+        return [get_adventure_db_path(name) for name in self._list_directories(get_adventures_path())]
+
+    def _load_world_source(self, db_path: str) -> List[Dict[str, Any]]:
+        adventure_name = os.path.basename(os.path.dirname(db_path))
+        placeholders = ", ".join("?" for _ in WORLD_ENTITY_TYPES)
+        conn = self._open(db_path)
+        try:
+            rows = conn.execute(
+                f"SELECT collection, key, data FROM documents WHERE collection IN ({placeholders}) "
+                "ORDER BY collection, key",
+                WORLD_ENTITY_TYPES
+            ).fetchall()
+        finally:
+            conn.close()
+
+        entities = []
+        for collection, key, data in rows:
+            entity = json.loads(data)
+            if isinstance(entity, dict):
+                entity.update(adventure=adventure_name, entity_type=collection, filename=key)
+                entities.append(entity)
+        return entities
+
+    def _world_source(self, adventure_name: str, entity_type: str, entity_filename: str) -> str:
+        return get_adventure_db_path(adventure_name)
+
+    # World Entity Management
+    def list_world_entities(self, adventure_name: str, entity_type: str) -> List[str]:
+        """List all entities of a specific type"""
+        with self._reader(adventure_name) as conn:
+            return self._list_keys(conn, entity_type)
+
+    def create_world_entity(self, adventure_name: str, entity_type: str,
+                          entity_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Create a world entity and register it in the world state in one transaction"""
+        entity_name = entity_data.get('name', 'unknown')
+        safe_filename = self._safe_filename(entity_name) + '.yaml'
+        entity_data = self._build_from_template(self._get_entity_template_path(entity_type), entity_data)
+
+        with self._transaction(adventure_name) as conn:
+            self._put_document(conn, entity_type, safe_filename, entity_data)
+            world_state = self._get_document(conn, STATE_COLLECTION, "world_state.yaml")
+            if self._add_to_world_state(world_state, entity_type, entity_name):
+                self._put_document(conn, STATE_COLLECTION, "world_state.yaml", world_state)
+        self._reindex_world_entities(adventure_name, entity_type, [safe_filename])
+
+        self.log_operation("create_world_entity", f"Created {entity_type} {entity_name} in {adventure_name}")
+        return entity_data
+
+    def bulk_upsert_world_entities(self, adventure_name: str, entity_type: str,
+                                   entities: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        """Create or update many world entities and the world state in one transaction"""
+        template_path = self._get_entity_template_path(entity_type)
+
+        created, updated, written = [], [], []
+        with self._transaction(adventure_name) as conn:
+            existing = set(self._list_keys(conn, entity_type))
+            world_state = self._get_document(conn, STATE_COLLECTION, "world_state.yaml")
+            world_state_changed = False
+
+            for entity_data in entities:
+                entity_name = entity_data.get('name', 'unknown')
+                safe_filename = self._safe_filename(entity_name) + '.yaml'
+                written.append(safe_filename)
+
+                if safe_filename in existing:
+                    self._put_document(conn, entity_type, safe_filename, entity_data)
+                    updated.append(entity_data)
+                    continue
+
+                merged_data = self._build_from_template(template_path, entity_data)
+                self._put_document(conn, entity_type, safe_filename, merged_data)
+                existing.add(safe_filename)
+                created.append(merged_data)
+                world_state_changed |= self._add_to_world_state(world_state, entity_type, entity_name)
+
+            if world_state_changed:
+                self._put_document(conn, STATE_COLLECTION, "world_state.yaml", world_state)
+        self._reindex_world_entities(adventure_name, entity_type, written)
+
+        self.log_operation("bulk_upsert_world_entities",
+                           f"Created {len(created)} and updated {len(updated)} {entity_type} in {adventure_name}")
+        return {"created": created, "updated": updated}
+
+    def get_world_entity(self, adventure_name: str, entity_type: str,
+                        entity_filename: str) -> Dict[str, Any]:
+        """Get a specific world entity"""
+        return self._read_document(adventure_name, entity_type, entity_filename)
+
+    def find_world_entity(self, adventure_name: str, entity_type: str,
+                         entity_name: str) -> Optional[Dict[str, Any]]:
+        """Find a world entity by its display name using the name index"""
+        with self._reader(adventure_name) as conn:
+            row = conn.execute(
+                "SELECT data FROM documents WHERE collection = ? AND name = ? LIMIT 1",
+                (entity_type, entity_name)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def update_world_entity(self, adventure_name: str, entity_type: str,
+                          entity_filename: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Update a world entity"""
+        self._write_document(adventure_name, entity_type, entity_filename, data)
+        self._reindex_world_entities(adventure_name, entity_type, [entity_filename])
+        self.log_operation("update_world_entity", f"Updated {entity_type} {entity_filename} in {adventure_name}")
+        return data
+
+    def delete_world_entity(self, adventure_name: str, entity_type: str,
+                          entity_filename: str) -> bool:
+        """Delete a world entity and drop it from the world state in one transaction"""
+        entity_name = entity_filename.replace('.yaml', '')
+
+        with self._transaction(adventure_name) as conn:
+            if not self._delete_document(conn, entity_type, entity_filename):
+                return False
+            world_state = self._get_document(conn, STATE_COLLECTION, "world_state.yaml")
+            entity_list = world_state.get(entity_type, [])
+            if entity_name in entity_list:
+                entity_list.remove(entity_name)
+                world_state[entity_type] = entity_list
+                self._put_document(conn, STATE_COLLECTION, "world_state.yaml", world_state)
+        self._reindex_world_entities(adventure_name, entity_type, [entity_filename])
+        return True
+
+    @staticmethod
+    def _add_to_world_state(world_state: Dict[str, Any], entity_type: str, entity_name: str) -> bool:
+        """Add an entity name to its world state list; returns True if the list changed"""
+        if entity_type not in WORLD_ENTITY_TYPES:
+            return False
+        entity_list = world_state.get(entity_type) or []
+        if entity_name in entity_list:
+            return False
+        entity_list.append(entity_name)
+        world_state[entity_type] = entity_list
+        return True
+
+    # YAML import/export
+    def _yaml_documents(self, adventure_name: str) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+        """Yield (collection, key, data) for every document in the YAML layout"""
+        for key in ("world_state.yaml", "player_states.yaml", "active_session.yaml"):
+            data = self._load_yaml(get_adventure_file_path(adventure_name, key))
+            if key == "active_session.yaml":
+                # Fold in log entries still sitting in the YAML engine's journal
+                data = get_session_journal(get_adventure_path(adventure_name)).merge_into(data)
+                data.pop(JOURNAL_SEQ_FIELD, None)
+            yield STATE_COLLECTION, key, data
+
+        for collection in ["players", "sessions"] + WORLD_ENTITY_TYPES:
+            directory = _collection_dir(adventure_name, collection)
+            for key in self._list_files(directory):
+                yield collection, key, self._load_yaml(os.path.join(directory, key))
+
+    def import_from_yaml(self, adventure_name: str) -> int:
+        """Import an adventure's YAML layout into its database, replacing existing rows"""
+        adventure_path = get_adventure_path(adventure_name)
+        if not os.path.isdir(adventure_path):
+            raise DataAccessError(f"Adventure '{adventure_name}' not found")
+        return self._import_into(adventure_name, get_adventure_db_path(adventure_name))
+
+    def _import_into(self, adventure_name: str, db_path: str) -> int:
+        """Import the YAML layout into the database at db_path in one transaction"""
+        self._initialize_database(db_path)
+        conn = self._open(db_path)
+        count = 0
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM documents")
+            conn.execute("DELETE FROM session_log")
+            for collection, key, data in self._yaml_documents(adventure_name):
+                self._put_document(conn, collection, key, data)
+                count += 1
+            conn.execute("COMMIT")
+        except Exception as e:
+            conn.execute("ROLLBACK")
+            raise DataAccessError(f"Failed to import adventure {adventure_name} from YAML: {e}")
+        finally:
+            conn.close()
+
+        self.log_operation("import_from_yaml", f"Imported {count} documents into {db_path}")
+        return count
+
+    def export_to_yaml(self, adventure_name: str) -> int:
+        """Write every document back out to the YAML layout"""
+        self.compact_session_journal(adventure_name)
+        with self._reader(adventure_name) as conn:
+            rows = conn.execute("SELECT collection, key, data FROM documents ORDER BY collection, key").fetchall()
+
+        for collection, key, data in rows:
+            # Archived sessions are written the way the YAML engine archives them
+            options = {"sort_keys": False, "allow_unicode": True} if collection == "sessions" else {}
+            self._save_yaml(os.path.join(_collection_dir(adventure_name, collection), key), json.loads(data),
+                            **options)
+
+        # The exported active_session.yaml is complete; don't let a stale journal replay onto it
+        get_session_journal(get_adventure_path(adventure_name)).truncate()
+
+        self.log_operation("export_to_yaml", f"Exported {len(rows)} documents from {adventure_name}")
+        return len(rows)
+
+
+def create_adventure_data_access() -> AdventureDataAccess:
+    """Create the adventure data access for the configured storage engine"""
+    if get_config().database.adventure_storage == "sqlite":
+        return SQLiteAdventureDataAccess()
+    return AdventureDataAccess()
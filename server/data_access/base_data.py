@@ -6,13 +6,17 @@ including file I/O, error handling, template loading, and validation.
 """
 
 import os
-import yaml
 import logging
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Union
 from abc import ABC, abstractmethod
 
+from scripts.utils import yaml_codec
+
 from ..config import get_config
+from .yaml_cache import get_yaml_cache
+from .template_registry import get_template_registry
+from ..utils.dir_cache import get_directory_cache
 from ..utils.paths import (
     get_vault_templates_path,
     get_vault_template_path,
@@ -50,43 +54,46 @@ class BaseDataAccess(ABC):
         self.templates_path = get_vault_templates_path()
     
     def _load_template(self, template_path: str) -> Dict[str, Any]:
-        """Load a template from the template vault"""
-        full_template_path = get_vault_template_path(template_path)
-        
-        if not file_exists(full_template_path):
-            raise TemplateNotFoundError(f"Template not found: {template_path}")
-        
+        """Load a deep copy of a template from the template registry"""
         try:
-            with open(full_template_path, 'r') as f:
-                template = yaml.safe_load(f)
-            return template or {}
+            template = get_template_registry().get(template_path)
         except Exception as e:
             raise DataAccessError(f"Failed to load template {template_path}: {e}")
+        
+        if template is None:
+            raise TemplateNotFoundError(f"Template not found: {template_path}")
+        return template
     
     def _load_yaml(self, file_path: str) -> Dict[str, Any]:
-        """Load a YAML file safely"""
+        """Load a YAML file safely, reusing the parsed copy while the file is unchanged"""
         if not file_exists(file_path):
             return {}
         
         try:
-            with open(file_path, 'r') as f:
-                data = yaml.safe_load(f)
+            data = get_yaml_cache().get(file_path, self._parse_yaml_file)
             return data or {}
         except Exception as e:
             raise DataAccessError(f"Failed to load YAML file {file_path}: {e}")
     
-    def _save_yaml(self, file_path: str, data: Dict[str, Any]) -> None:
-        """Save data to a YAML file safely"""
+    @staticmethod
+    def _parse_yaml_file(file_path: str) -> Any:
+        """Parse a YAML file from disk, bypassing the cache"""
+        return yaml_codec.load_file(file_path)
+    
+    def _save_yaml(self, file_path: str, data: Dict[str, Any], **dump_options: Any) -> None:
+        """Save data to a YAML file safely; dump_options override the emitter defaults"""
         try:
             # Ensure directory exists
             ensure_directory_exists(os.path.dirname(file_path))
             
-            with open(file_path, 'w') as f:
-                yaml.dump(data, f, default_flow_style=False, indent=2)
+            yaml_codec.dump_file(file_path, data, **{"default_flow_style": False, "indent": 2, **dump_options})
             
             logger.info(f"Saved data to {file_path}")
         except Exception as e:
             raise DataAccessError(f"Failed to save YAML file {file_path}: {e}")
+        finally:
+            get_yaml_cache().invalidate(file_path)
+            get_directory_cache().invalidate(os.path.dirname(os.path.abspath(file_path)))
     
     def _delete_file(self, file_path: str) -> bool:
         """Delete a file safely"""
@@ -95,6 +102,8 @@ class BaseDataAccess(ABC):
         
         try:
             os.remove(file_path)
+            get_yaml_cache().invalidate(file_path)
+            get_directory_cache().invalidate(os.path.dirname(os.path.abspath(file_path)))
             logger.info(f"Deleted file {file_path}")
             return True
         except Exception as e:
@@ -102,23 +111,13 @@ class BaseDataAccess(ABC):
     
     def _list_files(self, directory: str, pattern: str = "*.yaml") -> List[str]:
         """List files in a directory"""
-        if not directory_exists(directory):
-            return []
-        
         try:
-            files = []
-            for file in os.listdir(directory):
-                if file.endswith('.yaml') and not file.startswith('_'):
-                    files.append(file)
-            return sorted(files)
+            return list_yaml_files(directory)
         except Exception as e:
             raise DataAccessError(f"Failed to list files in {directory}: {e}")
     
     def _list_directories(self, parent_path: str) -> List[str]:
         """List directories in a parent path"""
-        if not directory_exists(parent_path):
-            return []
-        
         try:
             return list_directories(parent_path)
         except Exception as e:
@@ -136,27 +135,18 @@ class BaseDataAccess(ABC):
             if field in template and field not in data:
                 raise ValidationError(f"Required field '{field}' is missing")
     
-    def _merge_with_template(self, data: Dict[str, Any], template_path: str) -> Dict[str, Any]:
-        """Merge data with template defaults"""
+    def _build_from_template(self, template_path: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Merge data with a template and validate the result without saving it"""
         template = self._load_template(template_path)
-        
-        # Create a deep copy of the template
-        result = template.copy()
-        
-        # Override template values with provided data
-        result.update(data)
-        
-        return result
+        merged_data = dict(template)
+        merged_data.update(data)
+        self._validate_required_fields(merged_data, template)
+        return merged_data
     
     def _create_from_template(self, template_path: str, data: Dict[str, Any], 
                             target_path: str) -> Dict[str, Any]:
         """Create a new file from template with provided data"""
-        # Merge data with template
-        merged_data = self._merge_with_template(data, template_path)
-        
-        # Validate the merged data
-        template = self._load_template(template_path)
-        self._validate_required_fields(merged_data, template)
+        merged_data = self._build_from_template(template_path, data)
         
         # Save to target path
         self._save_yaml(target_path, merged_data)
@@ -0,0 +1,210 @@
+"""
+Persistent lookup and table indexes for Oracle Forge
+
+The lookup indexes (monsters, spells, items, rules), the table indexes
+(oracle tables, generators), the rule file and rule section indexes and the
+world entity index are built in memory from the vault. This module
+saves them under config.database.index_path/indexes so a restarted server
+adopts the built postings instead of re-reading and re-tokenizing the vault.
+
+Each domain is stored as two files:
+- <domain>.pickle: the exported index, with the store version and the vault
+  roots it was built against
+- <domain>.manifest.json: the store version, the index layout and the
+  (st_mtime_ns, st_size) of every source file, readable without unpickling
+
+A loaded index still compares source signatures on its first query, so files
+edited while the server was down are reindexed individually. Indexes built
+by another store version, index format or vault layout are ignored.
+
+Build or verify offline with `python -m server.manage index build|verify`.
+"""
+
+import os
+import json
+import time
+import pickle
+import logging
+from typing import Dict, Iterable, List, Optional, Any
+
+from .lookup_index import LookupIndex, get_built_indexes
+from .lookup_data import LookupDataAccess, LOOKUP_INDEX_FACETS
+from .tables_data import TableDataAccess
+from .rules_data import RuleDataAccess
+from .adventure_sqlite import create_adventure_data_access
+from ..utils.paths import (
+    get_index_path,
+    get_lookup_path,
+    get_tables_path,
+    get_rules_path,
+    get_adventures_path,
+    ensure_directory_exists,
+)
+
+logger = logging.getLogger(__name__)
+
+INDEX_STORE_VERSION = 1
+INDEX_DIRNAME = "indexes"
+
+LOOKUP_DOMAINS = tuple(LOOKUP_INDEX_FACETS)
+TABLE_DOMAINS = ("tables", "generators")
+INDEX_DOMAINS = LOOKUP_DOMAINS + TABLE_DOMAINS + ("rule_files", "rule_sections", "world")
+
+
+def get_index_store_path() -> str:
+    """Get the directory persisted indexes are stored in"""
+    return os.path.join(get_index_path(), INDEX_DIRNAME)
+
+
+def _index_file(domain: str) -> str:
+    return os.path.join(get_index_store_path(), f"{domain}.pickle")
+
+
+def _manifest_file(domain: str) -> str:
+    return os.path.join(get_index_store_path(), f"{domain}.manifest.json")
+
+
+def _source_roots() -> Dict[str, str]:
+    """Vault directories the indexes are built from"""
+    return {"lookup": get_lookup_path(), "tables": get_tables_path(),
+            "rules": get_rules_path(), "adventures": get_adventures_path()}
+
+
+def get_index(domain: str) -> LookupIndex:
+    """Get the process-wide index for any persisted domain"""
+    if domain in LOOKUP_DOMAINS:
+        return LookupDataAccess().get_index(domain)
+    if domain in TABLE_DOMAINS:
+        return TableDataAccess().get_index(domain)
+    if domain == "rule_files":
+        return RuleDataAccess().get_index()
+    if domain == "rule_sections":
+        return RuleDataAccess().get_section_index()
+    if domain == "world":
+        return create_adventure_data_access().get_world_index()
+    raise ValueError(f"Unknown index domain: {domain}")
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    ensure_directory_exists(os.path.dirname(path))
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def save_index(domain: str, index: LookupIndex) -> str:
+    """Write an index and its source manifest to the index store"""
+    state = index.export_state()
+    built_at = time.time()
+    payload = {
+        "version": INDEX_STORE_VERSION,
+        "roots": _source_roots(),
+        "built_at": built_at,
+        "state": state,
+    }
+    manifest = {
+        "version": INDEX_STORE_VERSION,
+        "layout": state["layout"],
+        "built_at": built_at,
+        "sources": {path: list(signature) if signature else None
+                    for path, signature in state["manifest"].items()},
+    }
+
+    path = _index_file(domain)
+    _atomic_write(path, pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL))
+    _atomic_write(_manifest_file(domain), json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8'))
+    logger.info(f"Saved {domain} index with {len(manifest['sources'])} sources to {path}")
+    return path
+
+
+def load_index(domain: str, index: LookupIndex) -> bool:
+    """Load a persisted index into index; returns False if it is missing, unreadable or outdated"""
+    path = _index_file(domain)
+    if not os.path.isfile(path):
+        return False
+
+    try:
+        with open(path, 'rb') as f:
+            payload = pickle.load(f)
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable {domain} index {path}: {e}")
+        return False
+
+    if payload.get("version") != INDEX_STORE_VERSION or payload.get("roots") != _source_roots():
+        logger.info(f"Ignoring {domain} index {path}: built for a different version or vault layout")
+        return False
+    if not index.load_state(payload["state"]):
+        logger.info(f"Ignoring {domain} index {path}: built with a different index layout")
+        return False
+    return True
+
+
+def load_persisted_indexes(domains: Optional[Iterable[str]] = None) -> Dict[str, int]:
+    """Adopt every usable persisted index at startup"""
+    loaded = missing = 0
+    for domain in domains or INDEX_DOMAINS:
+        if load_index(domain, get_index(domain)):
+            loaded += 1
+        else:
+            missing += 1
+    logger.info(f"Loaded persisted indexes: {loaded} loaded, {missing} missing or outdated")
+    return {"loaded": loaded, "missing": missing}
+
+
+def build_indexes(domains: Optional[Iterable[str]] = None, full: bool = False) -> Dict[str, Dict[str, int]]:
+    """
+    Bring indexes up to date and persist them
+
+    Starts from the persisted index unless full is set, so only sources that
+    changed since the last build are re-read.
+    """
+    results = {}
+    for domain in domains or INDEX_DOMAINS:
+        index = get_index(domain)
+        if not full:
+            load_index(domain, index)
+        stats = index.refresh()
+        save_index(domain, index)
+        results[domain] = stats
+    return results
+
+
+def save_dirty_indexes() -> List[str]:
+    """Persist every index that changed since it was loaded or saved"""
+    saved = []
+    for domain, index in get_built_indexes().items():
+        if domain in INDEX_DOMAINS and index.dirty:
+            try:
+                save_index(domain, index)
+                saved.append(domain)
+            except Exception as e:
+                logger.warning(f"Failed to persist {domain} index: {e}")
+    return saved
+
+
+def verify_indexes(domains: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """
+    Compare each persisted manifest with the source files on disk
+
+    Returns per domain either the changed/added/removed source lists or an
+    "error" explaining why the persisted index is unusable.
+    """
+    report: Dict[str, Any] = {}
+    for domain in domains or INDEX_DOMAINS:
+        index = get_index(domain)
+        try:
+            with open(_manifest_file(domain), 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            report[domain] = {"error": "not built"}
+            continue
+        except Exception as e:
+            report[domain] = {"error": f"unreadable manifest: {e}"}
+            continue
+
+        if manifest.get("version") != INDEX_STORE_VERSION or manifest.get("layout") != index.layout():
+            report[domain] = {"error": "built with a different version or layout"}
+            continue
+        report[domain] = index.diff_sources(manifest.get("sources", {}))
+    return report
@@ -0,0 +1,124 @@
+"""
+Lookup result cache for Oracle Forge
+
+The UI re-sends identical /lookup queries (switching tabs re-issues the same
+filters). This module caches the LookupPage of a query, keyed by the
+normalized lookup parameters, in a bounded LRU with a TTL.
+
+Every write through LookupDataAccess clears the cache, and so does an index
+refresh that finds sources changed outside this process (another worker or
+a hand edit), so a cached page never outlives the data it was built from.
+Random samples are never cached. A result computed before a clear is
+dropped rather than stored, so a query racing a write cannot cache the
+pre-write result.
+"""
+
+import copy
+import time
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from ..config import get_config
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LookupCacheStats:
+    """Counters for the lookup result cache"""
+    hits: int = 0
+    misses: int = 0
+    expirations: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    entries: int = 0
+    max_entries: int = 0
+
+
+class LookupResultCache:
+    """Thread-safe LRU cache of lookup results with a TTL"""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._stats = LookupCacheStats(max_entries=max_entries)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl > 0
+
+    @property
+    def generation(self) -> int:
+        """Incremented by every clear(); pass it to put() to detect intervening writes"""
+        return self._generation
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return a copy of the cached result for key, or None on a miss or expiry"""
+        if not self.enabled:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats.misses += 1
+                return None
+            stored_at, value = entry
+            if now - stored_at > self.ttl:
+                del self._entries[key]
+                self._stats.expirations += 1
+                self._stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            return copy.deepcopy(value)
+
+    def put(self, key: Hashable, value: Any, generation: Optional[int] = None) -> None:
+        """Store a copy of a result under key, unless the cache was cleared since generation"""
+        if not self.enabled:
+            return
+        value = copy.deepcopy(value)
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every cached result"""
+        with self._lock:
+            self._generation += 1
+            if self._entries:
+                self._entries.clear()
+                self._stats.invalidations += 1
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return a snapshot of the cache counters"""
+        with self._lock:
+            self._stats.entries = len(self._entries)
+            return asdict(self._stats)
+
+
+_lookup_cache: Optional[LookupResultCache] = None
+_lookup_cache_lock = threading.Lock()
+
+
+def get_lookup_cache() -> LookupResultCache:
+    """Get the process-wide lookup result cache"""
+    global _lookup_cache
+    if _lookup_cache is None:
+        with _lookup_cache_lock:
+            if _lookup_cache is None:
+                config = get_config()
+                _lookup_cache = LookupResultCache(config.lookup_cache_max_entries, config.lookup_cache_ttl)
+                logger.info(f"Lookup result cache enabled with {_lookup_cache.max_entries} entries, "
+                            f"{_lookup_cache.ttl}s TTL")
+    return _lookup_cache
@@ -9,22 +9,198 @@ This module provides data access operations for lookup data including:
 """
 
 import os
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from pathlib import Path
 
 from .base_data import BaseDataAccess, DataAccessError, ValidationError
+from .lookup_index import LookupIndex, LookupPage, CONTAINS, get_lookup_index, get_built_index, get_built_indexes
+from .lookup_cache import get_lookup_cache
+from .monster_table import MonsterTable, get_monster_table
+from ..utils.text import normalize_text
+from scripts.utils.monster_stats import normalize_monster
 from ..utils.paths import (
     get_lookup_path,
     get_lookup_file_path,
 )
 
 
+# Facet posting lists built for each lookup domain
+LOOKUP_INDEX_FACETS = {
+    "monsters": ("system", "tags", "environment", "stats.hd"),
+    "spells": ("system", "tags", "class", "level"),
+    "items": ("category", "system", "subcategory", "tags"),
+    "rules": ("system", "tags"),
+}
+
+
 class LookupDataAccess(BaseDataAccess):
     """Data access class for lookup-related operations"""
     
     def get_domain_name(self) -> str:
         return "Lookup"
     
+    # Lookup Indexes
+    def get_index(self, domain: str) -> LookupIndex:
+        """Get the process-wide index for a lookup domain (monsters, spells, items or rules)"""
+        sources = {
+            "monsters": (self._list_monster_sources, self._load_monster_source),
+            "spells": (self._list_spell_sources, self._load_spell_source),
+            "items": (self._list_item_sources, self._load_item_source),
+            "rules": (self._list_rule_sources, self._load_rule_source),
+        }
+        if domain not in sources:
+            raise DataAccessError(f"Unknown lookup index: {domain}")
+        list_sources, load_source = sources[domain]
+        text_fields = ("title", "content") if domain == "rules" else ("name", "description")
+        return get_lookup_index(
+            domain,
+            lambda: LookupIndex(domain, LOOKUP_INDEX_FACETS[domain], list_sources, load_source, text_fields)
+        )
+    
+    def _get_current_index(self, domain: str) -> LookupIndex:
+        """A lookup index, checked for outside edits at most once per search_refresh_interval"""
+        index = self.get_index(domain)
+        refreshed = index.refresh_if_due(self.config.search_refresh_interval)
+        if refreshed and (refreshed["updated"] or refreshed["removed"]):
+            # Sources changed outside this process since the cached results were built
+            get_lookup_cache().clear()
+        return index
+    
+    def get_monster_table(self) -> MonsterTable:
+        """Columnar stats of every indexed monster, refreshed from the monsters index"""
+        return get_monster_table(self._get_current_index("monsters"))
+    
+    def _reindex_lookup_source(self, domain: str, file_path: str) -> None:
+        """Reindex a source file after a write, if its index has been built"""
+        index = get_built_index(domain)
+        if index is not None:
+            index.reindex_source(file_path)
+    
+    def search_index(self, domain: str, query: str = "",
+                     filters: Optional[Dict[str, Tuple[str, Any]]] = None) -> List[Dict[str, Any]]:
+        """Query a lookup index; see LookupIndex.search for the filter format"""
+        return self._get_current_index(domain).search(query, filters)
+    
+    def fuzzy_search_index(self, domain: str, query: str,
+                           filters: Optional[Dict[str, Tuple[str, Any]]] = None,
+                           threshold: Optional[float] = None,
+                           limit: Optional[int] = None) -> List[Tuple[Dict[str, Any], float]]:
+        """Rank a lookup index by trigram similarity to query; see LookupIndex.fuzzy_search"""
+        return self._get_current_index(domain).fuzzy_search(
+            query, filters,
+            threshold=self.config.lookup_fuzzy_threshold if threshold is None else threshold,
+            limit=self.config.lookup_fuzzy_limit if limit is None else limit,
+        )
+    
+    def query_index(self, domain: str, query: str = "",
+                    filters: Optional[Dict[str, Tuple[str, Any]]] = None,
+                    fuzzy: bool = False, cursor: Optional[str] = None,
+                    limit: Optional[int] = None, fields: Optional[List[str]] = None,
+                    sample: int = 0) -> LookupPage:
+        """
+        Query a lookup index for one page of results; see LookupIndex.query
+
+        Results are served from the lookup result cache when the same
+        normalized query was answered recently. Random samples bypass it.
+        """
+        index = self._get_current_index(domain)
+        cache = get_lookup_cache()
+        generation = cache.generation
+
+        key = None
+        if sample <= 0:
+            key = self._lookup_cache_key(domain, query, filters, fuzzy, cursor, limit, fields)
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+
+        page = index.query(
+            query, filters, fuzzy=fuzzy,
+            threshold=self.config.lookup_fuzzy_threshold,
+            fuzzy_limit=self.config.lookup_fuzzy_limit,
+            cursor=cursor, limit=limit, fields=fields, sample=sample,
+        )
+        if key is not None:
+            cache.put(key, page, generation)
+        return page
+    
+    @staticmethod
+    def _lookup_cache_key(domain: str, query: str, filters: Optional[Dict[str, Tuple[str, Any]]],
+                          fuzzy: bool, cursor: Optional[str], limit: Optional[int],
+                          fields: Optional[List[str]]) -> tuple:
+        """Normalized lookup parameters; only CONTAINS needles are case-insensitive"""
+        normalized_filters = tuple(sorted(
+            (facet, mode, normalize_text(value) if mode == CONTAINS else value)
+            for facet, (mode, value) in (filters or {}).items()
+        ))
+        return (domain, normalize_text(query), normalized_filters, bool(fuzzy),
+                cursor or None, limit, tuple(fields) if fields else None)
+    
+    # Every write clears the lookup result cache
+    def _save_yaml(self, file_path: str, data: Dict[str, Any]) -> None:
+        try:
+            super()._save_yaml(file_path, data)
+        finally:
+            get_lookup_cache().clear()
+    
+    def _delete_file(self, file_path: str) -> bool:
+        try:
+            return super()._delete_file(file_path)
+        finally:
+            get_lookup_cache().clear()
+    
+    def get_index_stats(self) -> Dict[str, Dict[str, int]]:
+        """Size of every lookup index built so far"""
+        return {domain: index.get_stats() for domain, index in get_built_indexes().items()}
+    
+    def _list_monster_sources(self) -> List[str]:
+        return [os.path.join(self._get_monster_system_path(sys), "monsters.yaml")
+                for sys in self.list_monster_systems()]
+    
+    def _load_monster_source(self, file_path: str) -> List[Dict[str, Any]]:
+        system = os.path.basename(os.path.dirname(file_path))
+        monsters = self._load_yaml(file_path).get('monsters', []) or []
+        for monster in monsters:
+            if isinstance(monster, dict):
+                monster['system'] = system
+                # Parse the stat block strings once, at index time
+                normalize_monster(monster)
+        return monsters
+    
+    def _list_spell_sources(self) -> List[str]:
+        return [os.path.join(self._get_spell_system_path(sys), "spells.yaml")
+                for sys in self.list_spell_systems()]
+    
+    def _load_spell_source(self, file_path: str) -> List[Dict[str, Any]]:
+        system = os.path.basename(os.path.dirname(file_path))
+        spells = self._load_yaml(file_path).get('spells', []) or []
+        for spell in spells:
+            if isinstance(spell, dict):
+                spell['system'] = system
+        return spells
+    
+    def _list_item_sources(self) -> List[str]:
+        return [os.path.join(self._get_item_category_path(cat), item_file)
+                for cat in self.list_item_categories()
+                for item_file in self.list_items_in_category(cat)]
+    
+    def _load_item_source(self, file_path: str) -> List[Dict[str, Any]]:
+        item = self._load_yaml(file_path)
+        item['category'] = os.path.basename(os.path.dirname(file_path))
+        return [item]
+    
+    def _list_rule_sources(self) -> List[str]:
+        return [os.path.join(self._get_rule_system_path(sys), "rules.yaml")
+                for sys in self.list_rule_systems()]
+    
+    def _load_rule_source(self, file_path: str) -> List[Dict[str, Any]]:
+        system = os.path.basename(os.path.dirname(file_path))
+        rules = self._load_yaml(file_path).get('rules', []) or []
+        for rule in rules:
+            if isinstance(rule, dict):
+                rule['system'] = system
+        return rules
+    
     # Item Management
     def _get_item_category_path(self, category: str) -> str:
         """Get the path for an item category"""
@@ -53,6 +229,7 @@ class LookupDataAccess(BaseDataAccess):
         """Update the main data file for an item category"""
         category_file = os.path.join(self._get_item_category_path(category), f"{category}.yaml")
         self._save_yaml(category_file, data)
+        self._reindex_lookup_source("items", category_file)
         self.log_operation("update_item_category", f"Updated {category}")
         return data
     
@@ -69,6 +246,7 @@ class LookupDataAccess(BaseDataAccess):
             item_data,
             item_path
         )
+        self._reindex_lookup_source("items", item_path)
         
         self.log_operation("create_item", f"Created {category} item {item_name}")
         return item_data
@@ -82,37 +260,16 @@ class LookupDataAccess(BaseDataAccess):
         """Update a specific item"""
         item_path = os.path.join(self._get_item_category_path(category), item_filename)
         self._save_yaml(item_path, data)
+        self._reindex_lookup_source("items", item_path)
         self.log_operation("update_item", f"Updated {category} item {item_filename}")
         return data
     
     def delete_item(self, category: str, item_filename: str) -> bool:
         """Delete a specific item"""
         item_path = os.path.join(self._get_item_category_path(category), item_filename)
-        return self._delete_file(item_path)
-    
-    def search_items(self, query: str, category: Optional[str] = None, 
-                    system: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Search for items across categories"""
-        results = []
-        
-        categories = [category] if category else self.list_item_categories()
-        
-        for cat in categories:
-            items = self.list_items_in_category(cat)
-            for item_file in items:
-                item_data = self.get_item(cat, item_file)
-                
-                # Apply filters
-                if system and system.lower() not in item_data.get('system', '').lower():
-                    continue
-                
-                # Search in name and description
-                searchable_text = f"{item_data.get('name', '')} {item_data.get('description', '')}".lower()
-                if query.lower() in searchable_text:
-                    item_data['category'] = cat  # Add category info
-                    results.append(item_data)
-        
-        return results
+        deleted = self._delete_file(item_path)
+        self._reindex_lookup_source("items", item_path)
+        return deleted
     
     # Monster Management
     def _get_monster_system_path(self, system: str = "OSE:AF") -> str:
@@ -137,6 +294,7 @@ class LookupDataAccess(BaseDataAccess):
         """Update the main monster data for a system"""
         monster_file = os.path.join(self._get_monster_system_path(system), "monsters.yaml")
         self._save_yaml(monster_file, data)
+        self._reindex_lookup_source("monsters", monster_file)
         self.log_operation("update_monster_data", f"Updated {system} monsters")
         return data
     
@@ -174,30 +332,6 @@ class LookupDataAccess(BaseDataAccess):
         monster_path = os.path.join(self._get_monster_system_path(system), monster_filename)
         return self._delete_file(monster_path)
     
-    def search_monsters(self, query: str, system: Optional[str] = None, 
-                       environment: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Search for monsters"""
-        results = []
-        
-        systems = [system] if system else self.list_monster_systems()
-        
-        for sys in systems:
-            monsters = self.get_monster_data(sys)
-            monster_list = monsters.get('monsters', [])
-            
-            for monster in monster_list:
-                # Apply filters
-                if environment and environment.lower() not in monster.get('environment', '').lower():
-                    continue
-                
-                # Search in name and description
-                searchable_text = f"{monster.get('name', '')} {monster.get('description', '')}".lower()
-                if query.lower() in searchable_text:
-                    monster['system'] = sys  # Add system info
-                    results.append(monster)
-        
-        return results
-    
     # Spell Management
     def _get_spell_system_path(self, system: str = "OSE:AF") -> str:
         """Get the path for a spell system"""
@@ -221,6 +355,7 @@ class LookupDataAccess(BaseDataAccess):
         """Update the main spell data for a system"""
         spell_file = os.path.join(self._get_spell_system_path(system), "spells.yaml")
         self._save_yaml(spell_file, data)
+        self._reindex_lookup_source("spells", spell_file)
         self.log_operation("update_spell_data", f"Updated {system} spells")
         return data
     
@@ -258,32 +393,6 @@ class LookupDataAccess(BaseDataAccess):
         spell_path = os.path.join(self._get_spell_system_path(system), spell_filename)
         return self._delete_file(spell_path)
     
-    def search_spells(self, query: str, system: Optional[str] = None, 
-                     spell_class: Optional[str] = None, level: Optional[int] = None) -> List[Dict[str, Any]]:
-        """Search for spells"""
-        results = []
-        
-        systems = [system] if system else self.list_spell_systems()
-        
-        for sys in systems:
-            spells = self.get_spell_data(sys)
-            spell_list = spells.get('spells', [])
-            
-            for spell in spell_list:
-                # Apply filters
-                if spell_class and spell_class.lower() not in spell.get('class', '').lower():
-                    continue
-                if level is not None and spell.get('level') != level:
-                    continue
-                
-                # Search in name and description
-                searchable_text = f"{spell.get('name', '')} {spell.get('description', '')}".lower()
-                if query.lower() in searchable_text:
-                    spell['system'] = sys  # Add system info
-                    results.append(spell)
-        
-        return results
-    
     # Rule Management
     def _get_rule_system_path(self, system: str = "OSE:AF") -> str:
         """Get the path for a rule system"""
@@ -303,29 +412,6 @@ class LookupDataAccess(BaseDataAccess):
         """Update the main rule data for a system"""
         rule_file = os.path.join(self._get_rule_system_path(system), "rules.yaml")
         self._save_yaml(rule_file, data)
+        self._reindex_lookup_source("rules", rule_file)
         self.log_operation("update_rule_data", f"Updated {system} rules")
         return data
-    
-    def search_rules(self, query: str, system: Optional[str] = None, 
-                    tag: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Search for rules"""
-        results = []
-        
-        systems = [system] if system else self.list_rule_systems()
-        
-        for sys in systems:
-            rules = self.get_rule_data(sys)
-            rule_list = rules.get('rules', [])
-            
-            for rule in rule_list:
-                # Apply filters
-                if tag and tag.lower() not in [t.lower() for t in rule.get('tags', [])]:
-                    continue
-                
-                # Search in title and content
-                searchable_text = f"{rule.get('title', '')} {rule.get('content', '')}".lower()
-                if query.lower() in searchable_text:
-                    rule['system'] = sys  # Add system info
-                    results.append(rule)
-        
-        return results 
\ No newline at end of file
@@ -0,0 +1,693 @@
+"""
+Inverted index for lookup and table search
+
+LookupService used to load every record per request and run a pass per
+filter, lowercasing every field each time. A LookupIndex keeps, per domain:
+
+- the records and their pre-normalized "name \\x00 description" text
+- a term -> doc ids posting list over the tokenized text
+- facet -> value -> doc ids posting lists (tags, system, environment,
+  class, level, category, subcategory, and nested numeric fields such as
+  the parsed monster "stats.hd" for range filters)
+
+A query narrows candidates by intersecting posting lists, then confirms the
+original substring semantics on the few survivors, so results match the
+old list-comprehension filters exactly. Query tokens are matched against
+the vocabulary and facet needles against the distinct facet values, both of
+which are far smaller than the record set.
+
+Fuzzy lookups use a third posting list, trigram -> doc ids over the title
+field (the name), and rank candidates by trigram similarity so typos such
+as "gobiln" still find "Goblin".
+
+A BM25 collection over the same tokens (title tokens weighted up) ranks
+records for the cross-domain /search; rank() scores against corpus stats
+merged across domains so scores from different indexes are comparable.
+
+query() counts matches from doc ids and copies only the requested page,
+optionally projected onto a subset of fields. Its cursors name the last
+returned record, so paging stays stable while records change elsewhere.
+
+Records are indexed per source file (monsters.yaml / spells.yaml per system,
+one file per item). LookupDataAccess reindexes a source when its CRUD
+methods write it, and refresh() catches edits made outside the server by
+comparing file signatures.
+
+export_state() and load_state() let index_store persist a built index, so
+a restarted server only reindexes the sources that changed meanwhile.
+"""
+
+import os
+import copy
+import json
+import base64
+import pickle
+import random
+import time
+import heapq
+import hashlib
+import logging
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from ..utils.bm25 import BM25, CorpusStats
+from ..utils.text import normalize_text, tokenize, trigrams, make_snippet
+
+logger = logging.getLogger(__name__)
+
+Signature = Tuple[int, int]
+
+# Filter modes
+EXACT = "exact"
+CONTAINS = "contains"
+RANGE = "range"
+
+# Separates name from description so a query never matches across the two
+FIELD_SEPARATOR = "\x00"
+
+# Bump when the indexed structures change so persisted indexes are rebuilt
+INDEX_FORMAT_VERSION = 3
+
+# Each title token counts this many times in the BM25 term frequencies
+TITLE_WEIGHT = 3.0
+
+
+@dataclass
+class IndexedSource:
+    """Doc ids indexed from one source file and the signature they came from"""
+    signature: Optional[Signature]
+    doc_ids: List[int] = field(default_factory=list)
+
+
+@dataclass
+class IndexedDoc:
+    """One indexed record"""
+    record: Dict[str, Any]
+    text: str
+    title: str
+    trigrams: frozenset
+    source: str
+    position: int
+
+
+@dataclass
+class RankedHit:
+    """One BM25-ranked record with a snippet of its body"""
+    record: Dict[str, Any]
+    title: str
+    score: float
+    snippet: str
+
+
+@dataclass
+class LookupPage:
+    """One page of lookup results"""
+    items: List[Dict[str, Any]]
+    total: int
+    next_cursor: Optional[str] = None
+
+
+class LookupIndex:
+    """In-memory inverted index with facet posting lists for one lookup domain"""
+
+    def __init__(self, domain: str, facets: Iterable[str],
+                 list_sources: Callable[[], List[str]],
+                 load_source: Callable[[str], List[Dict[str, Any]]],
+                 text_fields: Tuple[str, str] = ("name", "description"),
+                 signature: Optional[Callable[[str], Optional[Signature]]] = None):
+        """
+        Args:
+            domain: Name used in logs and persistence ("monsters", "tables", ...)
+            facets: Record fields to build facet posting lists for
+            list_sources: Returns the source file paths in display order
+            load_source: Returns the records of one source file
+            text_fields: The title and body fields queries are matched against
+            signature: Returns a source's change signature; defaults to the
+                file's (st_mtime_ns, st_size)
+        """
+        self.domain = domain
+        self.facets = tuple(facets)
+        self.title_field, self.body_field = text_fields
+        self._list_sources = list_sources
+        self._load_source = load_source
+        if signature is not None:
+            self._signature = signature
+
+        self._lock = threading.RLock()
+        self._dirty = False
+        self._generation = 0
+        self._last_refresh: Optional[float] = None
+        self._next_id = 0
+        self._docs: Dict[int, IndexedDoc] = {}
+        self._sources: Dict[str, IndexedSource] = {}
+        self._source_rank: Dict[str, int] = {}
+        self._source_keys: Dict[str, str] = {}
+        self._terms: Dict[str, Set[int]] = {}
+        self._trigrams: Dict[str, Set[int]] = {}
+        self._facet_postings: Dict[str, Dict[Any, Set[int]]] = {name: {} for name in self.facets}
+        self._facet_normalized: Dict[str, Dict[Any, str]] = {name: {} for name in self.facets}
+        self._bm25 = BM25()
+
+    @staticmethod
+    def _signature(path: str) -> Optional[Signature]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    @staticmethod
+    def _record_value(record: Dict[str, Any], facet: str) -> Any:
+        """Value of a facet field; dotted facets such as "stats.hd" read nested dicts"""
+        value: Any = record
+        for key in facet.split("."):
+            if not isinstance(value, dict):
+                return None
+            value = value.get(key)
+        return value
+
+    @staticmethod
+    def _facet_values(value: Any) -> List[Any]:
+        """Hashable facet values of a record field; lists contribute each element"""
+        if value is None or value == "":
+            return []
+        values = value if isinstance(value, (list, tuple, set)) else [value]
+        return [v if isinstance(v, (str, int, float, bool)) else str(v) for v in values if v is not None]
+
+    # Index maintenance
+    def _add_doc(self, record: Dict[str, Any], source: str, position: int) -> int:
+        doc_id = self._next_id
+        self._next_id += 1
+        self._generation += 1
+        title = normalize_text(record.get(self.title_field, ''))
+        body = normalize_text(record.get(self.body_field, ''))
+        text = title + FIELD_SEPARATOR + body
+        doc = IndexedDoc(record=record, text=text, title=title, trigrams=frozenset(trigrams(title)),
+                         source=source, position=position)
+        self._docs[doc_id] = doc
+
+        for term in set(tokenize(text)):
+            self._terms.setdefault(term, set()).add(doc_id)
+        for gram in doc.trigrams:
+            self._trigrams.setdefault(gram, set()).add(doc_id)
+
+        title_terms, body_terms = tokenize(title), tokenize(body)
+        term_freqs: Counter = Counter(body_terms)
+        for term in title_terms:
+            term_freqs[term] += TITLE_WEIGHT
+        self._bm25.add(doc_id, term_freqs, len(title_terms) + len(body_terms))
+        for facet in self.facets:
+            for value in self._facet_values(self._record_value(record, facet)):
+                self._facet_postings[facet].setdefault(value, set()).add(doc_id)
+                if value not in self._facet_normalized[facet]:
+                    self._facet_normalized[facet][value] = normalize_text(value)
+        return doc_id
+
+    def _remove_doc(self, doc_id: int) -> None:
+        doc = self._docs.pop(doc_id, None)
+        if doc is None:
+            return
+        self._generation += 1
+        terms = set(tokenize(doc.text))
+        for term in terms:
+            postings = self._terms.get(term)
+            if postings is not None:
+                postings.discard(doc_id)
+                if not postings:
+                    del self._terms[term]
+        self._bm25.remove(doc_id, terms)
+        for gram in doc.trigrams:
+            postings = self._trigrams.get(gram)
+            if postings is not None:
+                postings.discard(doc_id)
+                if not postings:
+                    del self._trigrams[gram]
+        for facet in self.facets:
+            for value in self._facet_values(self._record_value(doc.record, facet)):
+                postings = self._facet_postings[facet].get(value)
+                if postings is not None:
+                    postings.discard(doc_id)
+                    if not postings:
+                        del self._facet_postings[facet][value]
+                        self._facet_normalized[facet].pop(value, None)
+
+    def reindex_source(self, path: str) -> int:
+        """Re-read one source file and replace its records in the index"""
+        with self._lock:
+            old = self._sources.pop(path, None)
+            if old is not None:
+                for doc_id in old.doc_ids:
+                    self._remove_doc(doc_id)
+
+            signature = self._signature(path)
+            if signature is None:
+                # Remember listed-but-missing sources so refresh() does not retry them
+                self._sources[path] = IndexedSource(signature=None)
+                self._dirty = True
+                return 0
+
+            try:
+                records = self._load_source(path)
+            except Exception as e:
+                logger.warning(f"Skipping {path} in {self.domain} index: {e}")
+                records = []
+
+            indexed = IndexedSource(signature=signature)
+            for position, record in enumerate(records):
+                if isinstance(record, dict):
+                    indexed.doc_ids.append(self._add_doc(record, path, position))
+            self._sources[path] = indexed
+            self._dirty = True
+            if path not in self._source_rank:
+                self._source_rank[path] = len(self._source_rank)
+            return len(indexed.doc_ids)
+
+    def refresh(self) -> Dict[str, int]:
+        """Reindex sources that were added, changed or removed since they were indexed"""
+        with self._lock:
+            sources = self._list_sources()
+            self._source_rank = {path: rank for rank, path in enumerate(sources)}
+
+            changed = 0
+            for path in sources:
+                indexed = self._sources.get(path)
+                if indexed is None or indexed.signature != self._signature(path):
+                    self.reindex_source(path)
+                    changed += 1
+
+            removed = [path for path in self._sources if path not in self._source_rank]
+            for path in removed:
+                for doc_id in self._sources.pop(path).doc_ids:
+                    self._remove_doc(doc_id)
+                self._dirty = True
+
+            if changed or removed:
+                logger.info(f"Reindexed {self.domain}: {changed} sources updated, {len(removed)} removed, "
+                            f"{len(self._docs)} records")
+            self._last_refresh = time.monotonic()
+            return {"updated": changed, "removed": len(removed), "records": len(self._docs)}
+
+    def refresh_if_due(self, interval: float) -> Optional[Dict[str, int]]:
+        """
+        refresh() unless the index was refreshed less than interval seconds ago
+
+        Writes made through the server reindex their sources directly, so
+        readers that tolerate a short delay for edits made outside the
+        server use this to avoid statting every source on every call.
+        Returns the refresh() result, or None when it was skipped.
+        """
+        with self._lock:
+            if self._last_refresh is not None and time.monotonic() - self._last_refresh < interval:
+                return None
+            return self.refresh()
+
+    # Queries
+    def _postings_containing(self, postings: Dict[Any, Set[int]], normalized: Dict[Any, str],
+                             needle: str) -> Set[int]:
+        """Union of the posting lists whose normalized key contains needle"""
+        result: Set[int] = set()
+        for value, key in normalized.items():
+            if needle in key:
+                result |= postings[value]
+        return result
+
+    @staticmethod
+    def _postings_in_range(postings: Dict[Any, Set[int]], bounds: Tuple[Any, Any]) -> Set[int]:
+        """Union of the posting lists whose numeric key lies within inclusive (low, high) bounds"""
+        low, high = bounds
+        result: Set[int] = set()
+        for value, doc_ids in postings.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            if (low is None or value >= low) and (high is None or value <= high):
+                result |= doc_ids
+        return result
+
+    def _query_candidates(self, query: str) -> Optional[Set[int]]:
+        """Docs that may contain query as a substring; None means every doc"""
+        candidates: Optional[Set[int]] = None
+        for token in set(tokenize(query)):
+            matching: Set[int] = set()
+            for term, postings in self._terms.items():
+                if token in term:
+                    matching |= postings
+            candidates = matching if candidates is None else candidates & matching
+            if not candidates:
+                return set()
+        return candidates
+
+    def _filter_candidates(self, candidates: Optional[Set[int]],
+                           filters: Optional[Dict[str, Tuple[str, Any]]]) -> Optional[Set[int]]:
+        """Intersect candidates with the posting lists selected by each filter"""
+        for facet, (mode, value) in (filters or {}).items():
+            if mode == EXACT:
+                matching = set(self._facet_postings[facet].get(value, ()))
+            elif mode == RANGE:
+                matching = self._postings_in_range(self._facet_postings[facet], value)
+            else:
+                matching = self._postings_containing(
+                    self._facet_postings[facet], self._facet_normalized[facet], normalize_text(value)
+                )
+            candidates = matching if candidates is None else candidates & matching
+            if not candidates:
+                return set()
+        return candidates
+
+    def _sort_key(self, doc: IndexedDoc) -> Tuple[int, int]:
+        """Display order: source listing order, then position within the source"""
+        return (self._source_rank.get(doc.source, len(self._source_rank)), doc.position)
+
+    def _matching_ids(self, query: str, filters: Optional[Dict[str, Tuple[str, Any]]]) -> List[int]:
+        """Ids of the docs containing query and matching every filter, in display order"""
+        needle = normalize_text(query)
+        candidates = self._query_candidates(query) if needle else None
+        candidates = self._filter_candidates(candidates, filters)
+
+        doc_ids = self._docs.keys() if candidates is None else candidates
+        if needle:
+            doc_ids = [doc_id for doc_id in doc_ids if needle in self._docs[doc_id].text]
+        return sorted(doc_ids, key=lambda doc_id: self._sort_key(self._docs[doc_id]))
+
+    def _fuzzy_ranked(self, query: str, filters: Optional[Dict[str, Tuple[str, Any]]],
+                      threshold: float, limit: int) -> List[Tuple[int, float]]:
+        """(doc id, score) pairs ranked by trigram similarity; see fuzzy_search"""
+        needle = normalize_text(query)
+        query_grams = trigrams(query)
+        if not needle or not query_grams:
+            return [(doc_id, 1.0) for doc_id in self._matching_ids(query, filters)[:limit]]
+
+        allowed = self._filter_candidates(None, filters)
+        if allowed is not None and not allowed:
+            return []
+
+        shared: Counter = Counter()
+        for gram in query_grams:
+            postings = self._trigrams.get(gram)
+            if postings:
+                shared.update(postings if allowed is None else postings & allowed)
+
+        substring_ids = self._query_candidates(query)
+        if allowed is not None and substring_ids is not None:
+            substring_ids &= allowed
+
+        scored = []
+        for doc_id in set(shared) | (substring_ids or set()):
+            doc = self._docs[doc_id]
+            if needle in doc.title:
+                score = 1.0
+            else:
+                common = shared.get(doc_id, 0)
+                union = len(query_grams) + len(doc.trigrams) - common
+                score = (common / union + common / len(query_grams)) / 2 if union else 0.0
+                if score < threshold and needle in doc.text:
+                    score = threshold
+            if score >= threshold:
+                scored.append((doc_id, score))
+
+        scored.sort(key=lambda pair: (-pair[1], self._sort_key(self._docs[pair[0]])))
+        return scored[:limit]
+
+    def _materialize(self, ranked: List[Tuple[int, Optional[float]]],
+                     fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Deep copies of the ranked docs, projected onto fields, with a score when ranked fuzzily"""
+        records = []
+        for doc_id, score in ranked:
+            record = self._docs[doc_id].record
+            if fields:
+                record = {name: record[name] for name in fields if name in record}
+            record = copy.deepcopy(record)
+            if score is not None:
+                record['score'] = round(score, 3)
+            records.append(record)
+        return records
+
+    def _source_key(self, source: str) -> str:
+        """Short opaque identifier of a source file for cursors"""
+        key = self._source_keys.get(source)
+        if key is None:
+            key = hashlib.sha1(source.encode('utf-8')).hexdigest()[:12]
+            self._source_keys[source] = key
+        return key
+
+    def _encode_cursor(self, doc_id: int, offset: int) -> str:
+        """Cursor naming the last doc of a page by source, position in the source and title, plus its offset"""
+        doc = self._docs[doc_id]
+        payload = json.dumps({"s": self._source_key(doc.source), "p": doc.position, "t": doc.title, "o": offset},
+                             separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+    def _cursor_start(self, ranked: List[Tuple[int, Optional[float]]], cursor: str) -> int:
+        """
+        Offset to resume from after the doc a cursor names
+
+        Resuming after the named doc keeps pages stable when records are added
+        or removed earlier in the results. The doc is matched on its position
+        in its source as well as its title, since one source can hold several
+        records with the same title; the stored offset is only used when that
+        doc itself has gone.
+        """
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+            source_key, position = payload["s"], int(payload["p"])
+            title, offset = str(payload["t"]), int(payload["o"])
+        except Exception:
+            raise ValueError(f"Invalid cursor: {cursor}")
+
+        for index, (doc_id, _) in enumerate(ranked):
+            doc = self._docs[doc_id]
+            if (doc.position == position and doc.title == title
+                    and self._source_key(doc.source) == source_key):
+                return index + 1
+        return max(0, min(offset, len(ranked)))
+
+    def query(self, query: str = "", filters: Optional[Dict[str, Tuple[str, Any]]] = None,
+              fuzzy: bool = False, threshold: float = 0.3, fuzzy_limit: int = 50,
+              cursor: Optional[str] = None, limit: Optional[int] = None,
+              fields: Optional[List[str]] = None, sample: int = 0) -> LookupPage:
+        """
+        Run a lookup and materialize only the records that are returned
+
+        The total comes from the matching doc ids, so a page of a large
+        result set copies only that page. sample picks that many random
+        matches instead of a page. Raises ValueError for a malformed cursor.
+        """
+        with self._lock:
+            if fuzzy:
+                ranked = self._fuzzy_ranked(query, filters, threshold, fuzzy_limit)
+            else:
+                ranked = [(doc_id, None) for doc_id in self._matching_ids(query, filters)]
+            total = len(ranked)
+
+            if sample > 0:
+                picked = random.sample(ranked, min(sample, total))
+                return LookupPage(items=self._materialize(picked, fields), total=total)
+
+            start = self._cursor_start(ranked, cursor) if cursor else 0
+            end = total if limit is None else min(total, start + limit)
+            next_cursor = None
+            if limit is not None and end < total:
+                next_cursor = self._encode_cursor(ranked[end - 1][0], end)
+            return LookupPage(items=self._materialize(ranked[start:end], fields), total=total,
+                              next_cursor=next_cursor)
+
+    def search(self, query: str = "", filters: Optional[Dict[str, Tuple[str, Any]]] = None) -> List[Dict[str, Any]]:
+        """
+        Return deep copies of the records matching query and every filter
+
+        query must appear as a substring of the title or the body.
+        filters maps a facet to (EXACT, value), (CONTAINS, needle) or
+        (RANGE, (low, high)); CONTAINS matches when any value of the field
+        contains the needle, RANGE when a numeric value lies within the
+        inclusive bounds (None leaves a side open).
+        """
+        return self.query(query, filters).items
+
+    def fuzzy_search(self, query: str, filters: Optional[Dict[str, Tuple[str, Any]]] = None,
+                     threshold: float = 0.3, limit: int = 50) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Return (record copy, score) pairs ranked by similarity to query
+
+        The score averages the trigram similarity of query and title with the
+        share of the query's trigrams found in the title, so a misspelt word
+        still matches a longer name. A title containing the query scores 1.0,
+        and a body containing it scores at least threshold, so fuzzy results
+        are a superset of search() results. Ties keep display order.
+        """
+        with self._lock:
+            ranked = self._fuzzy_ranked(query, filters, threshold, limit)
+            return [(copy.deepcopy(self._docs[doc_id].record), score) for doc_id, score in ranked]
+
+    def corpus_stats(self, terms: List[str]) -> CorpusStats:
+        """BM25 corpus stats of this index for the query terms; merge across indexes for rank()"""
+        with self._lock:
+            return self._bm25.corpus_stats(terms)
+
+    def rank(self, terms: List[str], filters: Optional[Dict[str, Tuple[str, Any]]] = None,
+             stats: Optional[CorpusStats] = None, limit: int = 10,
+             facets: Iterable[str] = ()) -> Tuple[List[RankedHit], int, Dict[str, Counter]]:
+        """
+        BM25-rank the records containing any of terms
+
+        Returns the top limit hits (ties in display order), the number of
+        matching records and, for each requested facet this index has, the
+        value counts over all matching records. stats defaults to this
+        index's own corpus stats.
+        """
+        with self._lock:
+            candidates = self._filter_candidates(None, filters) if filters else None
+            scores = self._bm25.score(terms, stats, candidates)
+            top = heapq.nsmallest(limit, scores,
+                                  key=lambda doc_id: (-scores[doc_id], self._sort_key(self._docs[doc_id])))
+            hits = [
+                RankedHit(
+                    record=copy.deepcopy(self._docs[doc_id].record),
+                    title=str(self._docs[doc_id].record.get(self.title_field, '')),
+                    score=scores[doc_id],
+                    snippet=make_snippet(self._docs[doc_id].record.get(self.body_field, ''), terms),
+                )
+                for doc_id in top
+            ]
+            counts = {}
+            for facet in facets:
+                if facet in self._facet_postings:
+                    counts[facet] = Counter(
+                        value for doc_id in scores
+                        for value in self._facet_values(self._record_value(self._docs[doc_id].record, facet))
+                    )
+            return hits, len(scores), counts
+
+    @property
+    def generation(self) -> int:
+        """Counter bumped whenever a record is added or removed; rebuild derived data when it moves"""
+        return self._generation
+
+    def records(self) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        The generation and every record in display order
+
+        The records are the indexed objects, not copies: callers building
+        derived structures (e.g. MonsterTable) must not modify them.
+        """
+        with self._lock:
+            doc_ids = sorted(self._docs, key=lambda doc_id: self._sort_key(self._docs[doc_id]))
+            return self._generation, [self._docs[doc_id].record for doc_id in doc_ids]
+
+    def source_records(self, path: str, fields: Optional[List[str]] = None) -> Optional[List[Dict[str, Any]]]:
+        """Copies of the records indexed from one source, projected onto fields; None if it is not indexed"""
+        with self._lock:
+            indexed = self._sources.get(path)
+            if indexed is None or indexed.signature is None:
+                return None
+            return self._materialize([(doc_id, None) for doc_id in indexed.doc_ids], fields)
+
+    def facet_counts(self, facet: str) -> Dict[Any, int]:
+        """Number of records per value of a facet"""
+        with self._lock:
+            return {value: len(postings) for value, postings in self._facet_postings[facet].items()}
+
+    # Persistence
+    @property
+    def dirty(self) -> bool:
+        """True when the index changed since it was last exported or loaded"""
+        return self._dirty
+
+    def layout(self) -> Dict[str, Any]:
+        """Settings a persisted index must have been built with to be reusable"""
+        return {
+            "format": INDEX_FORMAT_VERSION,
+            "domain": self.domain,
+            "facets": list(self.facets),
+            "text_fields": [self.title_field, self.body_field],
+        }
+
+    def manifest(self) -> Dict[str, Optional[Signature]]:
+        """Signature of every indexed source file"""
+        with self._lock:
+            return {path: indexed.signature for path, indexed in self._sources.items()}
+
+    def diff_sources(self, manifest: Dict[str, Any]) -> Dict[str, List[str]]:
+        """Compare a manifest of source signatures with the source files currently on disk"""
+        current = self._list_sources()
+        changed = [
+            path for path in current
+            if path in manifest and tuple(manifest[path] or ()) != (self._signature(path) or ())
+        ]
+        return {
+            "changed": sorted(changed),
+            "added": sorted(set(current) - set(manifest)),
+            "removed": sorted(set(manifest) - set(current)),
+        }
+
+    def export_state(self) -> Dict[str, Any]:
+        """
+        Serialize the indexed structures for persistence and clear the dirty flag
+
+        The structures are pickled while the lock is held, so a concurrent
+        reindex cannot change them mid-write. layout and manifest stay
+        readable without unpickling data.
+        """
+        with self._lock:
+            data = pickle.dumps({
+                "next_id": self._next_id,
+                "docs": self._docs,
+                "sources": self._sources,
+                "terms": self._terms,
+                "trigrams": self._trigrams,
+                "facet_postings": self._facet_postings,
+                "facet_normalized": self._facet_normalized,
+                "bm25": self._bm25,
+            }, protocol=pickle.HIGHEST_PROTOCOL)
+            self._dirty = False
+            return {"layout": self.layout(), "manifest": self.manifest(), "data": data}
+
+    def load_state(self, state: Dict[str, Any]) -> bool:
+        """Adopt an exported state; returns False if it was built with another layout"""
+        if state.get("layout") != self.layout():
+            return False
+        data = pickle.loads(state["data"])
+        with self._lock:
+            self._next_id = data["next_id"]
+            self._docs = data["docs"]
+            self._sources = data["sources"]
+            self._terms = data["terms"]
+            self._trigrams = data["trigrams"]
+            self._facet_postings = data["facet_postings"]
+            self._facet_normalized = data["facet_normalized"]
+            self._bm25 = data["bm25"]
+            self._source_rank = {path: rank for rank, path in enumerate(self._sources)}
+            self._generation += 1
+            self._dirty = False
+        return True
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"records": len(self._docs), "sources": len(self._sources),
+                    "terms": len(self._terms), "trigrams": len(self._trigrams)}
+
+
+_indexes: Dict[str, LookupIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_lookup_index(domain: str, factory: Callable[[], LookupIndex]) -> LookupIndex:
+    """Get the process-wide index for a domain, creating it with factory on first use"""
+    with _indexes_lock:
+        index = _indexes.get(domain)
+        if index is None:
+            index = factory()
+            _indexes[domain] = index
+        return index
+
+
+def get_built_index(domain: str) -> Optional[LookupIndex]:
+    """The process-wide index for a domain, or None if nothing has created it yet"""
+    return _indexes.get(domain)
+
+
+def get_built_indexes() -> Dict[str, LookupIndex]:
+    """Every process-wide index created so far, by domain"""
+    with _indexes_lock:
+        return dict(_indexes)
@@ -0,0 +1,152 @@
+"""
+Columnar monster table for encounter building
+
+Encounter building scores every monster against an XP budget, which is a
+poor fit for the lookup index's per-record dicts. MonsterTable copies the
+parsed stats of the monsters index into NumPy columns once:
+
+    xp, hd, hp, ac, morale      float64, NaN where the stat block lacks them
+    appearing_min/max           wandering number appearing bounds (1 / inf if unknown)
+    system                      int codes into system_values
+    tags, environment           bool membership matrices, one row per distinct value
+
+Filters become boolean masks and the budget fit is computed for every
+monster in a few array operations. The table is rebuilt only when the
+monsters index generation moves, i.e. after a monster source was
+reindexed.
+"""
+
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .lookup_index import LookupIndex
+from ..utils.text import normalize_text
+
+
+def _number(value: Any) -> float:
+    """Float of an int/float stat, or of the leading number in a string ("8 (10)"); NaN otherwise"""
+    if isinstance(value, bool) or value is None:
+        return np.nan
+    if isinstance(value, (int, float)):
+        return float(value)
+    head = str(value).strip().split(" ", 1)[0].strip("()")
+    try:
+        return float(head)
+    except ValueError:
+        return np.nan
+
+
+def _dice_bounds(dice: Optional[Dict[str, Any]]) -> Tuple[float, float]:
+    """Lowest and highest roll of a parse_dice dict; (1, inf) when unknown"""
+    if not dice:
+        return 1.0, np.inf
+    low = dice["count"] + dice["modifier"] if dice["sides"] else dice["modifier"]
+    high = dice["count"] * dice["sides"] + dice["modifier"] if dice["sides"] else dice["modifier"]
+    return float(max(low, 1)), float(max(high, 1))
+
+
+def _values(value: Any) -> List[str]:
+    if value is None or value == "":
+        return []
+    values = value if isinstance(value, (list, tuple, set)) else [value]
+    return [normalize_text(v) for v in values if v is not None]
+
+
+class MonsterTable:
+    """NumPy stat columns over every indexed monster, in display order"""
+
+    def __init__(self, monsters: Sequence[Dict[str, Any]], generation: int = 0):
+        self.generation = generation
+        self.records = list(monsters)
+        stats = [m.get("stats") or {} for m in self.records]
+
+        self.xp = np.array([_number(s.get("xp")) for s in stats], dtype=np.float64)
+        self.hd = np.array([_number(s.get("hd")) for s in stats], dtype=np.float64)
+        self.hp = np.array([_number(s.get("hp")) for s in stats], dtype=np.float64)
+        self.ac = np.array([_number(s.get("ac")) for s in stats], dtype=np.float64)
+        self.morale = np.array([_number(m.get("morale")) for m in self.records], dtype=np.float64)
+
+        bounds = [_dice_bounds((s.get("number_appearing") or {}).get("wandering")) for s in stats]
+        self.appearing_min = np.array([low for low, _ in bounds], dtype=np.float64)
+        self.appearing_max = np.array([high for _, high in bounds], dtype=np.float64)
+
+        systems = [normalize_text(m.get("system", "")) for m in self.records]
+        self.system_values = sorted(set(systems))
+        codes = {value: code for code, value in enumerate(self.system_values)}
+        self.system = np.array([codes[value] for value in systems], dtype=np.int32)
+
+        self.tag_values, self.tags = self._membership(m.get("tags") for m in self.records)
+        self.environment_values, self.environment = self._membership(m.get("environment") for m in self.records)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def _membership(self, fields: Iterable[Any]) -> Tuple[List[str], np.ndarray]:
+        """Distinct normalized values and a (values x monsters) bool matrix of who has each"""
+        per_monster = [_values(field) for field in fields]
+        vocab = sorted({value for values in per_monster for value in values})
+        rows = {value: row for row, value in enumerate(vocab)}
+        matrix = np.zeros((len(vocab), len(per_monster)), dtype=bool)
+        for column, values in enumerate(per_monster):
+            for value in values:
+                matrix[rows[value], column] = True
+        return vocab, matrix
+
+    def _contains(self, vocab: List[str], matrix: np.ndarray, needle: str) -> np.ndarray:
+        """Monsters with any value containing needle, matching the lookup CONTAINS filters"""
+        needle = normalize_text(needle)
+        rows = [row for row, value in enumerate(vocab) if needle in value]
+        if not rows:
+            return np.zeros(len(self), dtype=bool)
+        return matrix[rows].any(axis=0)
+
+    def mask(self, system: str = "", environment: str = "", tags: Iterable[str] = (),
+             min_hd: Optional[float] = None, max_hd: Optional[float] = None) -> np.ndarray:
+        """Boolean mask of the monsters matching every given filter"""
+        mask = np.ones(len(self), dtype=bool)
+        if system:
+            system = normalize_text(system)
+            mask &= self.system == (self.system_values.index(system) if system in self.system_values else -1)
+        if environment:
+            mask &= self._contains(self.environment_values, self.environment, environment)
+        for tag in tags:
+            mask &= self._contains(self.tag_values, self.tags, tag)
+        if min_hd is not None:
+            mask &= self.hd >= min_hd
+        if max_hd is not None:
+            mask &= self.hd <= max_hd
+        return mask
+
+    def fit_budget(self, budget: float, mask: np.ndarray,
+                   min_share: float = 0.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Largest group of each monster that fits the budget
+
+        Each group is as many of one monster as the budget allows, capped by
+        its wandering number appearing and at least its minimum. Returns the
+        indices of the monsters whose group is worth at least min_share of
+        the budget, with their group sizes and total XP.
+        """
+        with np.errstate(invalid="ignore", divide="ignore"):
+            size = np.minimum(np.floor(budget / self.xp), self.appearing_max)
+            valid = mask & (self.xp > 0) & (size >= self.appearing_min)
+            total = size * self.xp
+            valid &= total >= budget * min_share
+        indices = np.flatnonzero(valid)
+        return indices, size[indices].astype(np.int64), total[indices]
+
+
+_table: Optional[MonsterTable] = None
+_table_lock = threading.Lock()
+
+
+def get_monster_table(index: LookupIndex) -> MonsterTable:
+    """The process-wide MonsterTable, rebuilt when the monsters index has changed"""
+    global _table
+    with _table_lock:
+        if _table is None or _table.generation != index.generation:
+            generation, monsters = index.records()
+            _table = MonsterTable(monsters, generation)
+        return _table
@@ -0,0 +1,263 @@
+"""
+Embedding index over rule sections
+
+Semantic rule retrieval embeds every record of the "rule_sections" index
+(breadcrumbs and section text) and answers a question with the sections
+whose vectors have the highest cosine similarity to the question's. The
+vectors are one float32 NumPy matrix with L2-normalized rows, so a query is
+a single matrix-vector product.
+
+The matrix follows the section index rather than the vault: when the
+section index generation moves, only the sources whose signature changed
+are re-embedded. It is stored under config.database.index_path/embeddings
+as two files:
+- rule_sections.npy: the matrix
+- rule_sections.json: the store version, embedder name, the signature of
+  every embedded source and the (source, position, system) of every row
+
+Vectors from another embedder or store version are discarded on load.
+Build offline with `python -m server.manage embeddings build`. Requests
+never embed sections themselves: a search that finds the section index
+ahead of the matrix starts a background sync and skips the changed
+sources until it finishes.
+"""
+
+import os
+import json
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .lookup_index import LookupIndex
+from ..utils.embeddings import get_embedder
+from ..utils.paths import get_index_path, ensure_directory_exists
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_STORE_VERSION = 1
+EMBEDDING_DIRNAME = "embeddings"
+EMBEDDING_NAME = "rule_sections"
+
+SECTION_FIELDS = ["system", "breadcrumbs", "content"]
+
+# Sections embedded per call during a sync; the embedder is released between
+# batches so query embeddings are not held up for the whole sync
+EMBED_BATCH = 32
+
+
+def get_embedding_store_path() -> str:
+    """Get the directory embedding matrices are stored in"""
+    return os.path.join(get_index_path(), EMBEDDING_DIRNAME)
+
+
+def _section_text(record: Dict[str, Any]) -> str:
+    return " > ".join(record.get("breadcrumbs") or []) + "\n" + (record.get("content") or "")
+
+
+class RuleEmbeddingIndex:
+    """Cosine-similarity index over the rule section index, kept in step with its generation"""
+
+    def __init__(self, sections: LookupIndex, embedder):
+        self.sections = sections
+        self.embedder = embedder
+        self._lock = threading.RLock()
+        self._sync_lock = threading.Lock()
+        self._sync_thread: Optional[threading.Thread] = None
+        self._dirty = False
+        self._generation: Optional[int] = None
+        self._matrix = np.zeros((0, embedder.dim), dtype=np.float32)
+        self._rows: List[Tuple[str, int, str]] = []
+        self._systems = np.array([], dtype=str)
+        self._sources: Dict[str, Any] = {}
+
+    def sync(self) -> Dict[str, int]:
+        """Embed the sections of sources changed since the last sync and drop removed ones"""
+        with self._sync_lock:
+            generation = self.sections.generation
+            with self._lock:
+                if generation == self._generation:
+                    return {"embedded": 0, "removed": 0, "rows": len(self._rows)}
+                old_rows, old_sources = self._rows, self._sources
+
+            manifest = self._current_manifest()
+            stale = {path for path, signature in old_sources.items() if manifest.get(path) != signature}
+            keep = [row for row, (source, _, _) in enumerate(old_rows) if source not in stale]
+
+            rows = [old_rows[row] for row in keep]
+            texts: List[str] = []
+            sources = {path: old_sources[path] for path in old_sources if path not in stale}
+            for path, signature in manifest.items():
+                if path in sources:
+                    continue
+                records = self.sections.source_records(path, SECTION_FIELDS) or []
+                for position, record in enumerate(records):
+                    rows.append((path, position, record.get("system", "")))
+                    texts.append(_section_text(record))
+                sources[path] = signature
+
+            # Embedded in batches without holding _lock, so searches and query
+            # embeddings are served from the previous matrix in the meantime
+            batches = [self.embedder.embed(texts[start:start + EMBED_BATCH])
+                       for start in range(0, len(texts), EMBED_BATCH)]
+            added = np.vstack(batches) if batches else np.zeros((0, self.embedder.dim), dtype=np.float32)
+
+            with self._lock:
+                self._matrix = np.vstack([self._matrix[keep], added])
+                self._rows = rows
+                self._systems = np.array([system for _, _, system in rows], dtype=str)
+                self._sources = sources
+                self._generation = generation
+                if texts or stale:
+                    self._dirty = True
+            if texts or stale:
+                logger.info(f"Embedded {len(texts)} rule sections, {len(rows)} rows")
+            return {"embedded": len(texts), "removed": len(old_rows) - len(keep), "rows": len(rows)}
+
+    def sync_in_background(self) -> bool:
+        """Start a sync on a background thread unless the index is current or one is running; True if started"""
+        with self._lock:
+            if self.sections.generation == self._generation:
+                return False
+            if self._sync_thread is not None and self._sync_thread.is_alive():
+                return False
+            self._sync_thread = threading.Thread(target=self._background_sync, name="rule-embedding-sync",
+                                                 daemon=True)
+            self._sync_thread.start()
+            return True
+
+    def _background_sync(self) -> None:
+        try:
+            self.sync()
+        except Exception as e:
+            logger.warning(f"Failed to embed rule sections: {e}")
+
+    def _current_manifest(self) -> Dict[str, List[Any]]:
+        return {path: list(signature) for path, signature in self.sections.manifest().items()
+                if signature is not None}
+
+    def search(self, query: str, system: Optional[str] = None,
+               limit: int = 5) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        The limit sections most similar to query, best first
+
+        Returns (section record, cosine similarity) pairs; system narrows
+        the candidates to one rule system. Searches never embed sections:
+        when the section index has moved on, the changed sources are
+        re-embedded by sync_in_background() and skipped until then.
+        """
+        if not query.strip() or limit <= 0:
+            return []
+        self.sync_in_background()
+        vector = self.embedder.embed([query])[0]
+        with self._lock:
+            matrix, rows, systems = self._matrix, self._rows, self._systems
+            sources, current = self._sources, self._generation == self.sections.generation
+
+        candidates = systems == system if system else np.ones(len(rows), dtype=bool)
+        if not current:
+            manifest = self._current_manifest()
+            stale = {path for path, signature in sources.items() if manifest.get(path) != signature}
+            if stale:
+                candidates &= np.array([source not in stale for source, _, _ in rows], dtype=bool)
+        candidates = np.flatnonzero(candidates)
+        if not len(candidates):
+            return []
+        scores = matrix[candidates] @ vector
+        k = min(limit, len(candidates))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+
+        hits = []
+        records: Dict[str, List[Dict[str, Any]]] = {}
+        for index in top:
+            source, position, _ = rows[candidates[index]]
+            if source not in records:
+                records[source] = self.sections.source_records(source) or []
+            if position < len(records[source]):
+                hits.append((records[source][position], float(scores[index])))
+        return hits
+
+    # Persistence
+    @property
+    def dirty(self) -> bool:
+        """True when rows were embedded or dropped since the index was loaded or saved"""
+        return self._dirty
+
+    def save(self) -> str:
+        """Write the matrix and its manifest to the embedding store"""
+        store = get_embedding_store_path()
+        ensure_directory_exists(store)
+        with self._lock:
+            matrix_path = os.path.join(store, f"{EMBEDDING_NAME}.npy")
+            tmp_path = f"{matrix_path}.{os.getpid()}.tmp.npy"
+            np.save(tmp_path, self._matrix)
+            os.replace(tmp_path, matrix_path)
+
+            manifest_path = os.path.join(store, f"{EMBEDDING_NAME}.json")
+            tmp_path = f"{manifest_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    "version": EMBEDDING_STORE_VERSION,
+                    "embedder": self.embedder.name,
+                    "dim": self.embedder.dim,
+                    "sources": self._sources,
+                    "rows": self._rows,
+                }, f)
+            os.replace(tmp_path, manifest_path)
+            self._dirty = False
+        logger.info(f"Saved {len(self._rows)} rule section embeddings to {matrix_path}")
+        return matrix_path
+
+    def load(self) -> bool:
+        """Adopt the stored matrix; returns False if it is missing, unreadable or from another embedder"""
+        store = get_embedding_store_path()
+        try:
+            with open(os.path.join(store, f"{EMBEDDING_NAME}.json"), 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            matrix = np.load(os.path.join(store, f"{EMBEDDING_NAME}.npy"))
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable rule section embeddings: {e}")
+            return False
+
+        if (manifest.get("version") != EMBEDDING_STORE_VERSION or manifest.get("embedder") != self.embedder.name
+                or matrix.shape != (len(manifest["rows"]), self.embedder.dim)):
+            logger.info("Ignoring rule section embeddings built by another embedder or store version")
+            return False
+        with self._sync_lock, self._lock:
+            self._matrix = matrix.astype(np.float32, copy=False)
+            self._rows = [tuple(row) for row in manifest["rows"]]
+            self._systems = np.array([system for _, _, system in self._rows], dtype=str)
+            self._sources = manifest["sources"]
+            self._generation = None
+            self._dirty = False
+        return True
+
+
+_index: Optional[RuleEmbeddingIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_rule_embedding_index(sections: LookupIndex, model_path: Optional[str] = None) -> RuleEmbeddingIndex:
+    """The process-wide embedding index, loaded from the store on first use"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = RuleEmbeddingIndex(sections, get_embedder(model_path))
+            _index.load()
+        return _index
+
+
+def save_rule_embeddings() -> bool:
+    """Persist the embedding index if it changed since it was loaded or saved"""
+    if _index is None or not _index.dirty:
+        return False
+    try:
+        _index.save()
+        return True
+    except Exception as e:
+        logger.warning(f"Failed to persist rule section embeddings: {e}")
+        return False
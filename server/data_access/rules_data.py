@@ -5,27 +5,182 @@ This module provides data access operations for rules including:
 - Rule files stored as markdown
 - Rule system management
 - Rule searching and content extraction
+
+Rules are indexed twice: "rule_files" holds one record per markdown file and
+"rule_sections" one record per "## " section, with the heading path and the
+section's line range, so searches return the matching passage instead of
+the whole file. The rule_files records carry the extracted metadata, so
+rule metadata and summaries are served from the (persisted) index rather
+than re-reading every file. Sections are also embedded for semantic
+search (see rule_embeddings).
 """
 
 import os
 import re
+import json
 import logging
-from typing import Dict, List, Optional, Any
+import zipfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Any, Set, Tuple
 from pathlib import Path
 
 from .base_data import BaseDataAccess, DataAccessError, ValidationError
+from .lookup_index import LookupIndex, EXACT, get_lookup_index, get_built_index
+from .rule_embeddings import RuleEmbeddingIndex, get_rule_embedding_index
+from .vault_snapshot import get_snapshot_rule_metadata
+from ..utils.dir_cache import get_directory_cache
+from ..utils.text import make_snippet, tokenize
 from ..utils.paths import (
     get_rules_path,
 )
 
 logger = logging.getLogger(__name__)
 
+# extract_rule_metadata fields stored in each "rule_files" record
+RULE_METADATA_FIELDS = ('title', 'categories', 'sections', 'word_count')
+
+RULE_EXPORT_FORMATS = ('markdown', 'json', 'ndjson')
+
+# Rule files are copied into markdown exports in blocks of this many characters
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+
+def extract_rule_metadata(content: str, rule_name: str) -> Dict[str, Any]:
+    """Extract content-derived metadata (title, categories, section and word counts) from a rule file"""
+    # Extract title from first heading
+    title_match = re.search(r'^#\s+(.+)$', content, re.MULTILINE)
+    title = title_match.group(1) if title_match else rule_name.replace('.md', '')
+    
+    # Extract categories/tags from content
+    categories = []
+    if 'combat' in content.lower():
+        categories.append('combat')
+    if 'adventure' in content.lower():
+        categories.append('adventure')
+    if 'character' in content.lower():
+        categories.append('character')
+    if 'movement' in content.lower():
+        categories.append('movement')
+    
+    # Count sections (## headings)
+    sections = len(re.findall(r'^##\s+', content, re.MULTILINE))
+    
+    # Estimate word count
+    word_count = len(content.split())
+    
+    return {
+        'title': title,
+        'categories': categories,
+        'sections': sections,
+        'word_count': word_count,
+    }
+
+
+def split_rule_sections(content: str, preamble_title: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Split a rule file into its "## " sections
+
+    Each section has its title, its stripped content and the 1-based
+    line_start/line_end it spans, heading line included. Text before the
+    first "## " heading is dropped unless preamble_title is given, in which
+    case it becomes a section of that title (without the "# " title line)
+    if it has any.
+    """
+    sections = []
+    preamble = {'title': preamble_title, 'line_start': 1, 'lines': []}
+    current = preamble
+    lines = content.split('\n')
+    
+    def close(section: Dict[str, Any], end: int) -> None:
+        text = '\n'.join(section['lines']).strip()
+        if section is preamble and (preamble_title is None or not text):
+            return
+        sections.append({'title': section['title'], 'content': text,
+                         'line_start': section['line_start'], 'line_end': max(section['line_start'], end)})
+    
+    for number, line in enumerate(lines, 1):
+        if line.startswith('## '):
+            close(current, number - 1)
+            current = {'title': line[3:].strip(), 'line_start': number, 'lines': []}
+        elif not (current is preamble and line.startswith('# ')):
+            current['lines'].append(line)
+    close(current, len(lines))
+    return sections
+
+
 class RuleDataAccess(BaseDataAccess):
     """Data access class for rule-related operations"""
     
     def get_domain_name(self) -> str:
         return "Rules"
     
+    # Rule File Index
+    def get_index(self) -> LookupIndex:
+        """Get the process-wide index of rule markdown files ("rule_files")"""
+        return get_lookup_index("rule_files", lambda: LookupIndex(
+            "rule_files", ("system", "categories"), self._list_rule_file_sources, self._load_rule_file_source,
+            text_fields=("title", "content")
+        ))
+    
+    def get_section_index(self) -> LookupIndex:
+        """Get the process-wide index of rule sections ("rule_sections")"""
+        return get_lookup_index("rule_sections", lambda: LookupIndex(
+            "rule_sections", ("system", "filename", "categories"),
+            self._list_rule_file_sources, self._load_rule_section_source,
+            text_fields=("title", "content")
+        ))
+    
+    def _reindex_rule_file(self, file_path: str) -> None:
+        """Reindex a rule file after a write, in whichever rule indexes have been built"""
+        self._reindex_rule_files([file_path])
+    
+    def _reindex_rule_files(self, file_paths: List[str]) -> None:
+        """Reindex written rule files in one pass over whichever rule indexes have been built"""
+        for domain in ("rule_files", "rule_sections"):
+            index = get_built_index(domain)
+            if index is not None:
+                for file_path in file_paths:
+                    index.reindex_source(file_path)
+    
+    def _list_rule_file_sources(self) -> List[str]:
+        return [os.path.join(self._get_rule_system_path(sys), rule_file)
+                for sys in self.list_rule_systems()
+                for rule_file in self.list_rules(sys)]
+    
+    def _load_rule_file_source(self, file_path: str) -> List[Dict[str, Any]]:
+        rule_name = os.path.basename(file_path)
+        content = self._load_markdown(file_path).get('content', '')
+        metadata = extract_rule_metadata(content, rule_name)
+        return [{
+            **metadata,
+            'name': rule_name,
+            'filename': rule_name,
+            'system': os.path.basename(os.path.dirname(file_path)),
+            'content': content,
+        }]
+    
+    def _load_rule_section_source(self, file_path: str) -> List[Dict[str, Any]]:
+        rule_name = os.path.basename(file_path)
+        system = os.path.basename(os.path.dirname(file_path))
+        content = self._load_markdown(file_path).get('content', '')
+        metadata = extract_rule_metadata(content, rule_name)
+        sections = split_rule_sections(content, preamble_title=metadata['title'])
+        # Text above the first "## " heading is indexed under the file title alone
+        has_preamble = bool(sections) and sections[0]['line_start'] == 1 and not content.startswith('## ')
+        records = []
+        for position, section in enumerate(sections):
+            breadcrumbs = [metadata['title']] if position == 0 and has_preamble else [metadata['title'], section['title']]
+            records.append({
+                **section,
+                'breadcrumbs': breadcrumbs,
+                'name': rule_name,
+                'filename': rule_name,
+                'system': system,
+                'categories': metadata['categories'],
+            })
+        return records
+    
     # Rule System Management
     def _get_rule_system_path(self, system: str = "OSE:AF") -> str:
         """Get the path for a rule system"""
@@ -68,101 +223,113 @@ class RuleDataAccess(BaseDataAccess):
     def delete_rule(self, system: str, rule_name: str) -> bool:
         """Delete a specific rule file"""
         rule_path = os.path.join(self._get_rule_system_path(system), rule_name)
-        return self._delete_file(rule_path)
+        deleted = self._delete_file(rule_path)
+        self._reindex_rule_file(rule_path)
+        return deleted
     
     def search_rules(self, query: str, system: Optional[str] = None, 
-                    category: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Search for rules across systems"""
-        results = []
-        
-        systems = [system] if system else self.list_rule_systems()
-        
-        for sys in systems:
-            rules = self.list_rules(sys)
-            for rule_file in rules:
-                rule_data = self.get_rule(sys, rule_file)
-                
-                # Apply category filter (if we can extract it from content)
-                if category and category.lower() not in rule_data.get('content', '').lower():
-                    continue
-                
-                # Search in content
-                if query.lower() in rule_data.get('content', '').lower():
-                    rule_data['system'] = sys  # Add system info
-                    rule_data['filename'] = rule_file  # Add filename info
-                    results.append(rule_data)
-        
-        return results
+                    category: Optional[str] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Search rule sections across systems, best BM25 match first
+        
+        Returns the matching "## " sections rather than whole files: each has
+        system, filename, title, breadcrumbs, line_start/line_end, content,
+        score and a snippet. category keeps the sections of rule files whose
+        text contains it, case-insensitively, as it did for whole files.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+        filters = {}
+        if system:
+            filters['system'] = (EXACT, system)
+        
+        index = self.get_section_index()
+        index.refresh_if_due(self.config.search_refresh_interval)
+        everything = index.get_stats()['records']
+        if not category:
+            hits, _, _ = index.rank(terms, filters, limit=everything if limit is None else limit)
+        else:
+            files = self._files_containing(category)
+            hits, _, _ = index.rank(terms, filters, limit=everything)
+            hits = [hit for hit in hits if (hit.record['system'], hit.record['filename']) in files][:limit]
+        return [{
+            'system': hit.record['system'],
+            'filename': hit.record['filename'],
+            'title': hit.record['title'],
+            'breadcrumbs': hit.record['breadcrumbs'],
+            'line_start': hit.record['line_start'],
+            'line_end': hit.record['line_end'],
+            'content': hit.record['content'],
+            'score': round(hit.score, 3),
+            'snippet': hit.snippet,
+        } for hit in hits]
+    
+    def _files_containing(self, text: str) -> Set[Tuple[str, str]]:
+        """(system, filename) of every rule file whose content contains text, ignoring case"""
+        needle = text.lower()
+        _, records = self._get_current_index().records()
+        return {(record['system'], record['filename']) for record in records
+                if needle in (record.get('content') or '').lower()}
+    
+    def get_embedding_index(self) -> RuleEmbeddingIndex:
+        """Get the process-wide embedding index over rule sections"""
+        return get_rule_embedding_index(self.get_section_index(), self.config.rule_embedding_model or None)
+    
+    def semantic_search_rules(self, query: str, system: Optional[str] = None,
+                              limit: int = 5) -> List[Dict[str, Any]]:
+        """
+        Rule sections closest in meaning to query, most similar first
+        
+        Sections are ranked by the cosine similarity of their embedding to
+        the query's, so they need not share its words. Each has the same
+        fields as a search_rules result; score is the similarity.
+        """
+        self.get_section_index().refresh_if_due(self.config.search_refresh_interval)
+        hits = self.get_embedding_index().search(query, system=system, limit=limit)
+        return [{
+            'system': record['system'],
+            'filename': record['filename'],
+            'title': record['title'],
+            'breadcrumbs': record['breadcrumbs'],
+            'line_start': record['line_start'],
+            'line_end': record['line_end'],
+            'content': record['content'],
+            'score': round(score, 3),
+            'snippet': make_snippet(record['content'], tokenize(query)),
+        } for record, score in hits]
+    
+    def _get_current_index(self) -> LookupIndex:
+        """The rule file index, checked for outside edits at most once per search_refresh_interval"""
+        index = self.get_index()
+        index.refresh_if_due(self.config.search_refresh_interval)
+        return index
     
     def get_rule_metadata(self, system: str, rule_name: str) -> Dict[str, Any]:
         """Extract metadata from a rule file"""
-        rule_data = self.get_rule(system, rule_name)
-        content = rule_data.get('content', '')
-        
-        # Extract title from first heading
-        title_match = re.search(r'^#\s+(.+)$', content, re.MULTILINE)
-        title = title_match.group(1) if title_match else rule_name.replace('.md', '')
-        
-        # Extract categories/tags from content
-        categories = []
-        if 'combat' in content.lower():
-            categories.append('combat')
-        if 'adventure' in content.lower():
-            categories.append('adventure')
-        if 'character' in content.lower():
-            categories.append('character')
-        if 'movement' in content.lower():
-            categories.append('movement')
-        
-        # Count sections (## headings)
-        sections = len(re.findall(r'^##\s+', content, re.MULTILINE))
+        rule_path = os.path.join(self._get_rule_system_path(system), rule_name)
         
-        # Estimate word count
-        word_count = len(content.split())
+        # Served from the rule file index, which re-extracts it only when the file changes
+        records = self._get_current_index().source_records(rule_path, list(RULE_METADATA_FIELDS))
+        if records:
+            metadata = records[0]
+        else:
+            metadata = get_snapshot_rule_metadata(rule_path)
+        if metadata is None:
+            rule_data = self.get_rule(system, rule_name)
+            metadata = extract_rule_metadata(rule_data.get('content', ''), rule_name)
         
         return {
             'system': system,
             'name': rule_name,
-            'title': title,
-            'categories': categories,
-            'sections': sections,
-            'word_count': word_count,
+            **metadata,
             'filename': rule_name
         }
     
     def get_rule_sections(self, system: str, rule_name: str) -> List[Dict[str, Any]]:
-        """Extract sections from a rule file"""
+        """Extract the "## " sections of a rule file with their line ranges"""
         rule_data = self.get_rule(system, rule_name)
-        content = rule_data.get('content', '')
-        
-        sections = []
-        lines = content.split('\n')
-        current_section = None
-        current_content = []
-        
-        for line in lines:
-            if line.startswith('## '):
-                # Save previous section
-                if current_section:
-                    sections.append({
-                        'title': current_section,
-                        'content': '\n'.join(current_content).strip()
-                    })
-                
-                # Start new section
-                current_section = line[3:].strip()
-                current_content = []
-            elif current_section:
-                current_content.append(line)
-        
-        # Add final section
-        if current_section:
-            sections.append({
-                'title': current_section,
-                'content': '\n'.join(current_content).strip()
-            })
-        
-        return sections
+        return split_rule_sections(rule_data.get('content', ''))
     
     def search_rule_content(self, query: str, system: str, rule_name: str) -> List[Dict[str, Any]]:
         """Search within a specific rule file"""
@@ -212,18 +379,14 @@ class RuleDataAccess(BaseDataAccess):
             logger.info(f"Saved markdown to {file_path}")
         except Exception as e:
             raise DataAccessError(f"Failed to save markdown file {file_path}: {e}")
+        finally:
+            get_directory_cache().invalidate(os.path.dirname(os.path.abspath(file_path)))
+            self._reindex_rule_file(file_path)
     
     def _list_files(self, directory: str, pattern: str = "*.yaml") -> List[str]:
         """List files in a directory with custom pattern"""
-        if not os.path.exists(directory):
-            return []
-        
         try:
-            files = []
-            for file in os.listdir(directory):
-                if file.endswith(pattern[1:]) and not file.startswith('_'):
-                    files.append(file)
-            return sorted(files)
+            return get_directory_cache().list_files(directory, pattern[1:])
         except Exception as e:
             raise DataAccessError(f"Failed to list files in {directory}: {e}")
     
@@ -257,6 +420,11 @@ class RuleDataAccess(BaseDataAccess):
         try:
             import shutil
             shutil.rmtree(system_path)
+            get_directory_cache().invalidate_tree(system_path)
+            for domain in ("rule_files", "rule_sections"):
+                index = get_built_index(domain)
+                if index is not None:
+                    index.refresh()
             return True
         except Exception as e:
             raise DataAccessError(f"Failed to delete rule system {system_name}: {e}")
@@ -275,52 +443,190 @@ class RuleDataAccess(BaseDataAccess):
         return self.search_rules("character", system)
     
     def get_rule_summary(self, system: str = "OSE:AF") -> Dict[str, Any]:
-        """Get a summary of all rules in a system"""
-        rules = self.list_rules(system)
+        """Get a summary of all rules in a system, from the rule file index"""
+        fields = ['system', 'name', *RULE_METADATA_FIELDS, 'filename']
+        rules = self._get_current_index().query("", {'system': (EXACT, system)}, fields=fields).items
         
-        summary = {
+        return {
             'system': system,
             'total_rules': len(rules),
-            'rules': []
+            'rules': rules
         }
-        
-        for rule_file in rules:
-            metadata = self.get_rule_metadata(system, rule_file)
-            summary['rules'].append(metadata)
-        
-        return summary
     
     def export_rule_system(self, system: str, format: str = "markdown") -> str:
         """Export all rules in a system"""
-        rules = self.list_rules(system)
-        
-        if format.lower() == "markdown":
-            content = f"# {system} Rules\n\n"
-            for rule_file in rules:
-                rule_data = self.get_rule(system, rule_file)
-                content += f"## {rule_file}\n\n"
-                content += rule_data.get('content', '') + "\n\n"
-            return content
-        else:
+        return ''.join(self.iter_rule_system_export(system, format))
+    
+    def iter_rule_system_export(self, system: str, format: str = "markdown") -> Iterator[str]:
+        """
+        Export all rules in a system as a stream of text chunks
+        
+        markdown concatenates the files under "## <filename>" headings, json
+        is one {"system", "rules": [...]} document and ndjson one rule object
+        per line. Files are read one at a time (markdown in EXPORT_CHUNK_SIZE
+        blocks), so memory does not grow with the size of the system. Raises
+        DataAccessError for an unsupported format before anything is read.
+        """
+        format = format.lower()
+        if format not in RULE_EXPORT_FORMATS:
             raise DataAccessError(f"Unsupported export format: {format}")
+        if format == "markdown":
+            return self._iter_markdown_export(system)
+        return self._iter_json_export(system, ndjson=format == "ndjson")
+    
+    def _iter_markdown_export(self, system: str) -> Iterator[str]:
+        yield f"# {system} Rules\n\n"
+        for rule_file in self.list_rules(system):
+            yield f"## {rule_file}\n\n"
+            rule_path = os.path.join(self._get_rule_system_path(system), rule_file)
+            try:
+                with open(rule_path, 'r', encoding='utf-8') as f:
+                    while True:
+                        chunk = f.read(EXPORT_CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        yield chunk
+            except FileNotFoundError:
+                pass
+            yield "\n\n"
+    
+    def _iter_json_export(self, system: str, ndjson: bool) -> Iterator[str]:
+        if not ndjson:
+            yield f'{{"system": {json.dumps(system)}, "rules": ['
+        for position, rule_file in enumerate(self.list_rules(system)):
+            rule = {**self.get_rule_metadata(system, rule_file),
+                    'content': self.get_rule(system, rule_file).get('content', '')}
+            if ndjson:
+                yield json.dumps(rule) + "\n"
+            else:
+                yield (", " if position else "") + json.dumps(rule)
+        if not ndjson:
+            yield "]}"
     
     def import_rule_system(self, system: str, rules_data: Dict[str, str], 
                           overwrite: bool = False) -> Dict[str, Any]:
         """Import rules into a system"""
-        # Create system if it doesn't exist
-        if not os.path.exists(self._get_rule_system_path(system)):
+        return self._import_rule_documents(system, rules_data.items(), overwrite)
+    
+    def import_rule_archive(self, system: str, source: str, overwrite: bool = False) -> Dict[str, Any]:
+        """Import every .md file of a zip archive or directory tree into a system"""
+        return self._import_rule_documents(system, self._read_rule_archive(source), overwrite)
+    
+    def _read_rule_archive(self, source: str) -> List[Tuple[str, str]]:
+        """(filename, content) of the markdown files in a zip archive or directory tree"""
+        documents: Dict[str, str] = {}
+        
+        def add(name: str, data: bytes) -> None:
+            filename = os.path.basename(name)
+            if filename in documents:
+                raise DataAccessError(f"Duplicate rule file '{filename}' in {source}")
+            try:
+                documents[filename] = data.decode('utf-8')
+            except UnicodeDecodeError as e:
+                raise DataAccessError(f"Rule file {name} in {source} is not UTF-8: {e}")
+        
+        def wanted(name: str) -> bool:
+            filename = os.path.basename(name)
+            return filename.lower().endswith('.md') and not filename.startswith(('.', '_'))
+        
+        if os.path.isdir(source):
+            for dirpath, _, filenames in os.walk(source):
+                for filename in sorted(filenames):
+                    if wanted(filename):
+                        with open(os.path.join(dirpath, filename), 'rb') as f:
+                            add(filename, f.read())
+        elif zipfile.is_zipfile(source):
+            with zipfile.ZipFile(source) as archive:
+                for member in archive.infolist():
+                    if not member.is_dir() and wanted(member.filename) and '__MACOSX/' not in member.filename:
+                        add(member.filename, archive.read(member))
+        else:
+            raise DataAccessError(f"Rule import source {source} is not a directory or zip archive")
+        return list(documents.items())
+    
+    def _import_rule_documents(self, system: str, documents: Iterable[Tuple[str, str]],
+                               overwrite: bool) -> Dict[str, Any]:
+        """
+        Write many rule files at once
+        
+        The system's file list is read once and diffed against the incoming
+        documents: new files are written, existing ones are skipped unless
+        overwrite is set, and overwritten files whose content is unchanged are
+        left alone. Two documents mapping to one filename fail the import
+        before anything is written. Writes run on rule_import_workers threads, and the
+        directory cache and rule indexes are updated once at the end.
+        """
+        system_path = self._get_rule_system_path(system)
+        if not os.path.exists(system_path):
             self.create_rule_system(system)
         
-        imported_rules = []
-        for rule_name, content in rules_data.items():
-            if not overwrite and rule_name in self.list_rules(system):
-                continue
-            
-            self.create_rule(system, rule_name, content)
-            imported_rules.append(rule_name)
+        existing = set(self.list_rules(system))
+        targets: Dict[str, str] = {}
+        names: Dict[str, str] = {}
+        skipped = []
+        for name, content in documents:
+            stem = name[:-3] if name.lower().endswith('.md') else name
+            filename = self._safe_filename(stem) + '.md'
+            if filename in names:
+                raise DataAccessError(f"Rules '{names[filename]}' and '{name}' both map to rule file '{filename}'")
+            names[filename] = name
+            if filename in existing and not overwrite:
+                skipped.append(filename)
+            else:
+                targets[filename] = content
+        
+        def write(item: Tuple[str, str]) -> bool:
+            filename, content = item
+            rule_path = os.path.join(system_path, filename)
+            if filename in existing and self._markdown_matches(rule_path, content):
+                return False
+            self._write_markdown(rule_path, content)
+            return True
         
+        try:
+            with ThreadPoolExecutor(max_workers=self.config.rule_import_workers) as pool:
+                written = list(pool.map(write, targets.items()))
+        finally:
+            get_directory_cache().invalidate(os.path.abspath(system_path))
+        
+        added = [name for name, wrote in zip(targets, written) if wrote and name not in existing]
+        updated = [name for name, wrote in zip(targets, written) if wrote and name in existing]
+        unchanged = [name for name, wrote in zip(targets, written) if not wrote]
+        self._reindex_rule_files([os.path.join(system_path, name) for name in added + updated])
+        
+        self.log_operation("import_rule_system", f"Imported {len(added)} new and {len(updated)} updated "
+                                                 f"rules into {system}")
         return {
             'system': system,
-            'imported_rules': imported_rules,
-            'total_imported': len(imported_rules)
-        } 
\ No newline at end of file
+            'imported_rules': added + updated,
+            'total_imported': len(added) + len(updated),
+            'added': added,
+            'updated': updated,
+            'unchanged': unchanged,
+            'skipped': skipped,
+        }
+    
+    @staticmethod
+    def _markdown_matches(file_path: str, content: str) -> bool:
+        """True if a file already holds content, checking the size before reading it"""
+        data = content.encode('utf-8')
+        try:
+            if os.path.getsize(file_path) != len(data):
+                return False
+            with open(file_path, 'rb') as f:
+                return f.read() == data
+        except OSError:
+            return False
+    
+    @staticmethod
+    def _write_markdown(file_path: str, content: str) -> None:
+        """Write a markdown file atomically, without cache or index updates"""
+        tmp_path = f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(content)
+            os.replace(tmp_path, file_path)
+        except Exception as e:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise DataAccessError(f"Failed to save markdown file {file_path}: {e}")
@@ -0,0 +1,144 @@
+"""
+Search DataAccess class for Oracle Forge
+
+Cross-domain ranked search over every persisted index: monsters, spells,
+items, rules, rule markdown files and their sections, oracle tables,
+generators and world entities. Each domain keeps its own LookupIndex, maintained incrementally by
+the write paths of its data access class; this module ranks them as one
+BM25 corpus:
+
+- the query's corpus stats (document count, length, term document
+  frequencies) are merged across the searched domains, so a term's IDF is
+  the same in every domain and scores are comparable
+- each domain returns its own top hits and match count; hits are multiplied
+  by the domain boost and merged into one ranking
+- facet counts are summed over every matching record
+
+Indexes are checked for files changed outside the server at most once per
+search_refresh_interval, so a query only walks the postings of its terms and
+its cost does not grow with the number of vault files.
+"""
+
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .base_data import BaseDataAccess, DataAccessError
+from .index_store import INDEX_DOMAINS, LOOKUP_DOMAINS, get_index
+from .lookup_cache import get_lookup_cache
+from .lookup_index import LookupIndex, RankedHit, EXACT, CONTAINS
+from ..utils.bm25 import CorpusStats
+from ..utils.text import tokenize
+
+SEARCH_DOMAINS = INDEX_DOMAINS
+
+# Rule sections cover the same text as rule_files at a finer grain, so whole
+# files are only searched when asked for
+DEFAULT_SEARCH_DOMAINS = tuple(domain for domain in SEARCH_DOMAINS if domain != "rule_files")
+
+# Record fields copied into a hit so clients can fetch the full document
+SEARCH_REF_FIELDS = ("name", "system", "category", "subcategory", "type", "filename",
+                     "adventure", "entity_type", "breadcrumbs", "line_start", "line_end")
+
+
+class SearchDataAccess(BaseDataAccess):
+    """Data access class for cross-domain ranked search"""
+
+    def get_domain_name(self) -> str:
+        return "Search"
+
+    def _get_search_index(self, domain: str) -> LookupIndex:
+        """Get a domain's index, checking it for outside changes at most once per refresh interval"""
+        index = get_index(domain)
+        refreshed = index.refresh_if_due(self.config.search_refresh_interval)
+        if refreshed and domain in LOOKUP_DOMAINS and (refreshed["updated"] or refreshed["removed"]):
+            # Keep /lookup from serving results cached before the change
+            get_lookup_cache().clear()
+        return index
+
+    @staticmethod
+    def _domain_filters(index: LookupIndex,
+                        filters: Dict[str, Any]) -> Optional[Dict[str, Tuple[str, Any]]]:
+        """Index filters for a domain, or None if the domain lacks a filtered facet"""
+        domain_filters = {}
+        for facet, value in filters.items():
+            if facet not in index.facets:
+                return None
+            domain_filters[facet] = (CONTAINS, value) if isinstance(value, str) else (EXACT, value)
+        return domain_filters
+
+    def search(self, query: str, domains: Optional[Iterable[str]] = None,
+               filters: Optional[Dict[str, Any]] = None, boosts: Optional[Dict[str, float]] = None,
+               limit: int = 10, offset: int = 0,
+               facets: Iterable[str] = ()) -> Dict[str, Any]:
+        """
+        BM25-rank records across domains
+
+        Args:
+            query: Free text; records containing any of its terms match
+            domains: Domains to search (default: DEFAULT_SEARCH_DOMAINS)
+            filters: facet -> value; strings match as case-insensitive
+                substrings, other values exactly. Domains without the facet
+                are skipped.
+            boosts: domain -> score multiplier, over the configured defaults
+            limit, offset: Page of the merged ranking to return
+            facets: Facets to count values of over all matching records
+
+        Returns:
+            Dict with hits (domain, title, score, snippet, ref), total, and
+            facets: per-domain match counts plus the requested facet counts
+        """
+        domains = list(domains or DEFAULT_SEARCH_DOMAINS)
+        unknown = [domain for domain in domains if domain not in SEARCH_DOMAINS]
+        if unknown:
+            raise DataAccessError(f"Unknown search domain: {', '.join(unknown)}")
+        facets = list(facets)
+        boosts = {**(self.config.search_domain_boosts or {}), **(boosts or {})}
+
+        facet_counts: Dict[str, Counter] = {"domain": Counter()}
+        facet_counts.update((facet, Counter()) for facet in facets)
+        terms = tokenize(query)
+        if not terms:
+            return {"hits": [], "total": 0, "facets": self._facet_result(facet_counts)}
+
+        indexes = {domain: self._get_search_index(domain) for domain in domains}
+        stats = CorpusStats()
+        for index in indexes.values():
+            stats = stats.merge(index.corpus_stats(terms))
+
+        ranked: List[Tuple[float, int, str, RankedHit]] = []
+        total = 0
+        for order, (domain, index) in enumerate(indexes.items()):
+            boost = boosts.get(domain, 1.0)
+            domain_filters = self._domain_filters(index, filters or {})
+            if domain_filters is None or boost <= 0:
+                continue
+            hits, matched, counts = index.rank(terms, domain_filters, stats, offset + limit, facets)
+            total += matched
+            if matched:
+                facet_counts["domain"][domain] += matched
+            for facet, values in counts.items():
+                facet_counts[facet].update(values)
+            ranked.extend((hit.score * boost, order, domain, hit) for hit in hits)
+
+        ranked.sort(key=lambda entry: (-entry[0], entry[1]))
+        return {
+            "hits": [self._hit_result(domain, hit, score) for score, _, domain, hit in ranked[offset:offset + limit]],
+            "total": total,
+            "facets": self._facet_result(facet_counts),
+        }
+
+    @staticmethod
+    def _hit_result(domain: str, hit: RankedHit, score: float) -> Dict[str, Any]:
+        return {
+            "domain": domain,
+            "title": hit.title,
+            "score": round(score, 3),
+            "snippet": hit.snippet,
+            "ref": {name: hit.record[name] for name in SEARCH_REF_FIELDS if name in hit.record},
+        }
+
+    @staticmethod
+    def _facet_result(facet_counts: Dict[str, Counter]) -> Dict[str, Dict[str, int]]:
+        """Facet counts with string keys, most common first"""
+        return {facet: {str(value): count for value, count in counts.most_common()}
+                for facet, counts in facet_counts.items()}
@@ -0,0 +1,238 @@
+"""
+Append-only session log journal for Oracle Forge
+
+Appending to the session log used to rewrite the whole active_session.yaml,
+so every entry cost O(session length). Entries are now appended as JSON
+lines to active_session.journal.jsonl next to it, and periodically
+compacted back into the YAML document.
+
+Each journal line carries a sequence number. Compaction records the last
+folded-in sequence in the session document (JOURNAL_SEQ_FIELD) before the
+journal is truncated, so a crash between the two steps never duplicates
+entries: readers skip lines at or below the recorded sequence. Truncation
+leaves a checkpoint line behind so numbering keeps increasing across
+restarts.
+
+Writes are flushed to the OS on every append and fsync'd in batches, every
+session_journal_fsync_every entries or session_journal_fsync_interval
+seconds, whichever comes first.
+
+Another worker process may append to or truncate the same journal (under the
+adventure's write lock); appends notice the file changed under them and
+rescan the sequence numbers before writing. Truncation replaces the file
+rather than emptying it in place, and each process keeps the journal open so
+its inode cannot be reused: a truncation always changes the inode, even when
+the refilled file happens to match the size this process last saw.
+"""
+
+import os
+import json
+import time
+import atexit
+import logging
+import threading
+from typing import Dict, List, Optional, Any, Tuple
+
+from ..config import get_config
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_FILENAME = "active_session.journal.jsonl"
+JOURNAL_SEQ_FIELD = "log_journal_seq"
+
+
+class SessionJournal:
+    """Append-only JSONL journal of session log entries for one adventure"""
+
+    def __init__(self, adventure_path: str):
+        config = get_config()
+        self.path = os.path.join(adventure_path, JOURNAL_FILENAME)
+        self.fsync_every = config.session_journal_fsync_every
+        self.fsync_interval = config.session_journal_fsync_interval
+        self._lock = threading.RLock()
+        self._file = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._last_seq, self._checkpoint_seq = self._scan_sequences()
+        self._identity = self._open_existing()
+
+    def _file_identity(self) -> Optional[Tuple[int, int]]:
+        """(inode, size) of the file currently at the journal path"""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_size)
+
+    def _handle_identity(self) -> Optional[Tuple[int, int]]:
+        """(inode, size) of the journal file this process holds open"""
+        if self._file is None:
+            return None
+        st = os.fstat(self._file.fileno())
+        return (st.st_ino, st.st_size)
+
+    def _open_existing(self) -> Optional[Tuple[int, int]]:
+        """
+        Open the journal file for appending if it exists and return its identity
+
+        Holding it open keeps its inode from being reused by a later truncation.
+        """
+        if self._file is None and os.path.exists(self.path):
+            self._file = open(self.path, 'a', encoding='utf-8')
+        return self._handle_identity()
+
+    def _refresh_if_changed(self) -> None:
+        """Rescan sequence numbers if another process wrote to the journal"""
+        if self._file_identity() != self._identity:
+            self.close()
+            self._last_seq, self._checkpoint_seq = self._scan_sequences()
+            self._identity = self._open_existing()
+
+    def _scan_sequences(self) -> Tuple[int, int]:
+        """Find the latest sequence number and the latest checkpoint in the journal"""
+        last_seq = checkpoint_seq = 0
+        for seq, entry in self._read_records():
+            last_seq = seq
+            if entry is None:
+                checkpoint_seq = seq
+        return last_seq, checkpoint_seq
+
+    def _read_records(self) -> List[Tuple[int, Optional[Dict[str, Any]]]]:
+        """Read (seq, entry) records; checkpoints have no entry and torn lines are skipped"""
+        if not os.path.exists(self.path):
+            return []
+
+        records = []
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                    records.append((int(record["seq"]), record.get("entry")))
+                except (ValueError, KeyError, TypeError):
+                    logger.warning(f"Skipping unreadable line {line_number} in {self.path}")
+        return records
+
+    @property
+    def last_seq(self) -> int:
+        """Sequence number of the most recent entry"""
+        with self._lock:
+            self._refresh_if_changed()
+            return self._last_seq
+
+    @property
+    def pending(self) -> int:
+        """Number of entries appended since the last truncation"""
+        with self._lock:
+            self._refresh_if_changed()
+            return self._last_seq - self._checkpoint_seq
+
+    def append(self, entry: Dict[str, Any]) -> int:
+        """Append an entry and return its sequence number"""
+        with self._lock:
+            self._refresh_if_changed()
+            seq = self._last_seq + 1
+            self._write_line({"seq": seq, "entry": entry})
+            self._last_seq = seq
+            self._identity = self._handle_identity()
+            self._unsynced += 1
+
+            if (self._unsynced >= self.fsync_every or
+                    time.monotonic() - self._last_sync >= self.fsync_interval):
+                self.sync()
+            return seq
+
+    def _write_line(self, record: Dict[str, Any]) -> None:
+        """Write one JSON line and flush it to the OS"""
+        if self._file is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._file = open(self.path, 'a', encoding='utf-8')
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def sync(self) -> None:
+        """fsync pending appends to disk"""
+        with self._lock:
+            if self._file is not None and self._unsynced:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+            self._unsynced = 0
+            self._last_sync = time.monotonic()
+
+    def entries_after(self, seq: int) -> List[Dict[str, Any]]:
+        """Return journal entries with a sequence number above seq"""
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+            return [entry for record_seq, entry in self._read_records()
+                    if record_seq > seq and entry is not None]
+
+    def merge_into(self, session_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Return the session document with uncompacted journal entries appended to its log"""
+        floor_seq = session_data.get(JOURNAL_SEQ_FIELD, 0) or 0
+        pending = self.entries_after(floor_seq)
+        if pending:
+            session_data["log"] = list(session_data.get("log") or []) + pending
+        return session_data
+
+    def truncate(self) -> None:
+        """Drop every journal entry; call only after they are durable elsewhere"""
+        with self._lock:
+            self._refresh_if_changed()
+            self.close()
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(json.dumps({"seq": self._last_seq, "checkpoint": True}) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            # A new file, so other processes see a new inode rather than a size that may match
+            os.replace(tmp_path, self.path)
+            self._checkpoint_seq = self._last_seq
+            self._identity = self._open_existing()
+
+    def close(self) -> None:
+        """Sync and close the journal file handle"""
+        with self._lock:
+            if self._file is not None:
+                self.sync()
+                self._file.close()
+                self._file = None
+
+
+_journals: Dict[str, SessionJournal] = {}
+_journals_lock = threading.Lock()
+
+
+def get_session_journal(adventure_path: str) -> SessionJournal:
+    """Get the process-wide journal for an adventure directory"""
+    key = os.path.abspath(adventure_path)
+    with _journals_lock:
+        journal = _journals.get(key)
+        if journal is None:
+            journal = SessionJournal(key)
+            _journals[key] = journal
+        return journal
+
+
+def close_session_journal(adventure_path: str) -> None:
+    """Close and forget the journal for an adventure directory"""
+    key = os.path.abspath(adventure_path)
+    with _journals_lock:
+        journal = _journals.pop(key, None)
+    if journal is not None:
+        journal.close()
+
+
+@atexit.register
+def _close_all_journals() -> None:
+    """Flush every open journal on interpreter shutdown"""
+    with _journals_lock:
+        journals = list(_journals.values())
+    for journal in journals:
+        try:
+            journal.close()
+        except Exception as e:
+            logger.error(f"Failed to close session journal {journal.path}: {e}")
@@ -8,14 +8,20 @@ This module provides data access operations for tables including:
 """
 
 import os
-from typing import Dict, List, Optional, Any
+import json
+from typing import Dict, Iterator, List, Optional, Any
 from pathlib import Path
 
 from .base_data import BaseDataAccess, DataAccessError, ValidationError
+from .lookup_index import LookupIndex, CONTAINS, EXACT, get_lookup_index, get_built_index
+from scripts.utils import yaml_codec
+from scripts.utils.table_compiler import compile_table
 from ..utils.paths import (
     get_tables_path,
 )
 
+TABLE_EXPORT_FORMATS = ("yaml", "json", "ndjson", "markdown")
+
 
 class TableDataAccess(BaseDataAccess):
     """Data access class for table-related operations"""
@@ -23,6 +29,46 @@ class TableDataAccess(BaseDataAccess):
     def get_domain_name(self) -> str:
         return "Tables"
     
+    # Table Indexes
+    def get_index(self, domain: str) -> LookupIndex:
+        """Get the process-wide index for oracle tables ("tables") or generators ("generators")"""
+        if domain == "tables":
+            return get_lookup_index(domain, lambda: LookupIndex(
+                domain, ("category",), self._list_oracle_sources, self._load_oracle_source
+            ))
+        if domain == "generators":
+            return get_lookup_index(domain, lambda: LookupIndex(
+                domain, ("type",), self._list_generator_sources, self._load_generator_source
+            ))
+        raise DataAccessError(f"Unknown table index: {domain}")
+    
+    def _reindex_table_source(self, domain: str, file_path: str) -> None:
+        """Reindex a table file after a write, if its index has been built"""
+        index = get_built_index(domain)
+        if index is not None:
+            index.reindex_source(file_path)
+    
+    def _list_oracle_sources(self) -> List[str]:
+        return [os.path.join(self._get_oracle_path(), table_file) for table_file in self.list_oracle_tables()]
+    
+    def _load_oracle_source(self, file_path: str) -> List[Dict[str, Any]]:
+        table_data = self.get_oracle_table(os.path.basename(file_path))
+        table_data['filename'] = os.path.basename(file_path)
+        return [table_data]
+    
+    def _list_generator_sources(self) -> List[str]:
+        return [os.path.join(self._get_generator_path(gen_type), gen_file)
+                for gen_type in self.list_generator_types()
+                for gen_file in self.list_generators(gen_type)]
+    
+    def _load_generator_source(self, file_path: str) -> List[Dict[str, Any]]:
+        gen_data = self._load_yaml(file_path)
+        if not isinstance(gen_data, dict):
+            return []
+        gen_data['type'] = os.path.basename(os.path.dirname(file_path))
+        gen_data['filename'] = os.path.basename(file_path)
+        return [gen_data]
+    
     # Oracle Table Management
     def _get_oracle_path(self) -> str:
         """Get the path for oracle tables"""
@@ -49,6 +95,7 @@ class TableDataAccess(BaseDataAccess):
         """Update a specific oracle table"""
         table_path = os.path.join(self._get_oracle_path(), table_name)
         self._save_yaml(table_path, data)
+        self._reindex_table_source("tables", table_path)
         self.log_operation("update_oracle_table", f"Updated {table_name}")
         return data
     
@@ -64,6 +111,7 @@ class TableDataAccess(BaseDataAccess):
             table_data,
             table_path
         )
+        self._reindex_table_source("tables", table_path)
         
         self.log_operation("create_oracle_table", f"Created oracle table {table_name}")
         return table_data
@@ -71,27 +119,16 @@ class TableDataAccess(BaseDataAccess):
     def delete_oracle_table(self, table_name: str) -> bool:
         """Delete a specific oracle table"""
         table_path = os.path.join(self._get_oracle_path(), table_name)
-        return self._delete_file(table_path)
+        deleted = self._delete_file(table_path)
+        self._reindex_table_source("tables", table_path)
+        return deleted
     
     def search_oracle_tables(self, query: str, category: Optional[str] = None) -> List[Dict[str, Any]]:
         """Search for oracle tables"""
-        results = []
-        tables = self.list_oracle_tables()
-        
-        for table_file in tables:
-            table_data = self.get_oracle_table(table_file)
-            
-            # Apply category filter
-            if category and category.lower() not in table_data.get('category', '').lower():
-                continue
-            
-            # Search in name, description, and content
-            searchable_text = f"{table_data.get('name', '')} {table_data.get('description', '')}".lower()
-            if query.lower() in searchable_text:
-                table_data['filename'] = table_file  # Add filename info
-                results.append(table_data)
-        
-        return results
+        index = self.get_index("tables")
+        index.refresh_if_due(self.config.search_refresh_interval)
+        filters = {"category": (CONTAINS, category)} if category else None
+        return index.search(query, filters)
     
     def roll_oracle_table(self, table_name: str, roll: Optional[int] = None) -> Dict[str, Any]:
         """Roll on an oracle table and return the result"""
@@ -105,48 +142,43 @@ class TableDataAccess(BaseDataAccess):
         if not entries:
             raise DataAccessError(f"Oracle table '{table_name}' has no entries")
         
-        # Generate random roll if not provided
+        # Resolve through the compiled table: one slot per roll, 'roll' and 'range' entries alike.
+        # Keyed by file: get_oracle_table() returns a fresh copy on every call
+        compiled = compile_table(entries, table_data.get('dice'), table_name,
+                                 source=os.path.join(self._get_oracle_path(), table_name))
         if roll is None:
-            import random
-            # Determine roll range from entries
-            min_roll = 1
-            max_roll = len(entries)
-            roll = random.randint(min_roll, max_roll)
+            # The table's dice, or uniformly over the rolls its entries cover
+            roll, entry = compiled.roll()
+        else:
+            entry = compiled.resolve(roll)
         
-        # Find the entry for this roll
-        for entry in entries:
-            # Handle both old 'roll' format and new 'range' format
-            if 'roll' in entry and entry.get('roll') == roll:
-                return {
-                    'table': table_name,
-                    'roll': roll,
-                    'result': entry.get('result', ''),
-                    'description': entry.get('description', ''),
-                    'table_data': table_data
-                }
-            elif 'range' in entry:
-                # Handle range format [min, max] or single number
-                range_val = entry['range']
-                if isinstance(range_val, list) and len(range_val) == 2:
-                    min_range, max_range = range_val
-                    if min_range <= roll <= max_range:
-                        return {
-                            'table': table_name,
-                            'roll': roll,
-                            'result': entry.get('result', ''),
-                            'description': entry.get('description', ''),
-                            'table_data': table_data
-                        }
-                elif isinstance(range_val, int) and range_val == roll:
-                    return {
-                        'table': table_name,
-                        'roll': roll,
-                        'result': entry.get('result', ''),
-                        'description': entry.get('description', ''),
-                        'table_data': table_data
-                    }
+        if entry is None:
+            raise DataAccessError(f"No entry found for roll {roll} in table '{table_name}'")
+        return {
+            'table': table_name,
+            'roll': roll,
+            'result': entry.get('result', ''),
+            'description': entry.get('description', ''),
+            'table_data': table_data
+        }
+    
+    def roll_on_table(self, table: Dict[str, Any], source: Optional[str] = None) -> Dict[str, Any]:
+        """Roll a generator table's dice (default d6) on its compiled entries
         
-        raise DataAccessError(f"No entry found for roll {roll} in table '{table_name}'")
+        source is the file the table was loaded from, so its compilation is reused until the file changes
+        """
+        entries = table.get('entries') or []
+        if not entries:
+            raise DataAccessError(f"Table '{table.get('id', '')}' has no entries")
+        
+        roll, entry = compile_table(entries, table.get('dice', 'd6'), str(table.get('id', '')), source=source).roll()
+        if entry is None:
+            raise DataAccessError(f"No entry found for roll {roll} in table '{table.get('id', '')}'")
+        return {
+            'roll': roll,
+            'result': entry.get('result', ''),
+            'description': entry.get('description', ''),
+        }
     
     # Generator Table Management
     def _get_generator_path(self, generator_type: str) -> str:
@@ -167,15 +199,19 @@ class TableDataAccess(BaseDataAccess):
         generator_path = self._get_generator_path(generator_type)
         return self._list_files(generator_path)
     
+    def get_generator_file(self, generator_type: str, generator_name: str) -> str:
+        """Get the file path of a specific generator"""
+        return os.path.join(self._get_generator_path(generator_type), generator_name)
+    
     def get_generator(self, generator_type: str, generator_name: str) -> Dict[str, Any]:
         """Get a specific generator"""
-        generator_path = os.path.join(self._get_generator_path(generator_type), generator_name)
-        return self._load_yaml(generator_path)
+        return self._load_yaml(self.get_generator_file(generator_type, generator_name))
     
     def update_generator(self, generator_type: str, generator_name: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Update a specific generator"""
         generator_path = os.path.join(self._get_generator_path(generator_type), generator_name)
         self._save_yaml(generator_path, data)
+        self._reindex_table_source("generators", generator_path)
         self.log_operation("update_generator", f"Updated {generator_type} generator {generator_name}")
         return data
     
@@ -192,6 +228,7 @@ class TableDataAccess(BaseDataAccess):
             generator_data,
             generator_path
         )
+        self._reindex_table_source("generators", generator_path)
         
         self.log_operation("create_generator", f"Created {generator_type} generator {generator_name}")
         return generator_data
@@ -199,27 +236,16 @@ class TableDataAccess(BaseDataAccess):
     def delete_generator(self, generator_type: str, generator_name: str) -> bool:
         """Delete a specific generator"""
         generator_path = os.path.join(self._get_generator_path(generator_type), generator_name)
-        return self._delete_file(generator_path)
+        deleted = self._delete_file(generator_path)
+        self._reindex_table_source("generators", generator_path)
+        return deleted
     
     def search_generators(self, query: str, generator_type: Optional[str] = None) -> List[Dict[str, Any]]:
         """Search for generators"""
-        results = []
-        
-        generator_types = [generator_type] if generator_type else self.list_generator_types()
-        
-        for gen_type in generator_types:
-            generators = self.list_generators(gen_type)
-            for gen_file in generators:
-                gen_data = self.get_generator(gen_type, gen_file)
-                
-                # Search in name and description
-                searchable_text = f"{gen_data.get('name', '')} {gen_data.get('description', '')}".lower()
-                if query.lower() in searchable_text:
-                    gen_data['type'] = gen_type  # Add type info
-                    gen_data['filename'] = gen_file  # Add filename info
-                    results.append(gen_data)
-        
-        return results
+        index = self.get_index("generators")
+        index.refresh_if_due(self.config.search_refresh_interval)
+        filters = {"type": (EXACT, generator_type)} if generator_type else None
+        return index.search(query, filters)
     
     def execute_generator(self, generator_type: str, generator_name: str, 
                          parameters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
@@ -289,33 +315,83 @@ class TableDataAccess(BaseDataAccess):
         
         entries = table_data.get('entries', [])
         
-        # Calculate statistics
+        # Calculate statistics; compiling finds rolls no entry or several entries cover
         total_entries = len(entries)
         roll_range = None
+        gaps, overlaps = [], []
         if entries:
-            rolls = [entry.get('roll', 0) for entry in entries]
-            roll_range = (min(rolls), max(rolls))
+            compiled = compile_table(entries, table_data.get('dice'), table_name,
+                                     source=os.path.join(self._get_oracle_path(), table_name))
+            roll_range = (compiled.min_roll, compiled.max_roll)
+            gaps = [list(gap) for gap in compiled.gaps]
+            overlaps = [{'rolls': [start, end], 'entries': [kept + 1, shadowed + 1]}
+                        for start, end, kept, shadowed in compiled.overlaps]
         
         return {
             'table_name': table_name,
             'total_entries': total_entries,
             'roll_range': roll_range,
+            'gaps': gaps,
+            'overlaps': overlaps,
             'categories': table_data.get('categories', []),
             'tags': table_data.get('tags', [])
         }
     
     def export_table(self, table_name: str, format: str = "yaml") -> str:
         """Export a table in the specified format"""
-        table_data = self.get_oracle_table(table_name)
+        return "".join(self.iter_table_export(table_name, format))
+    
+    def iter_table_export(self, table_name: str, format: str = "yaml") -> Iterator[str]:
+        """
+        Export a table as a stream of text chunks, one per entry
         
-        if format.lower() == "yaml":
-            import yaml
-            return yaml.dump(table_data, default_flow_style=False, indent=2)
-        elif format.lower() == "json":
-            import json
-            return json.dumps(table_data, indent=2)
-        else:
+        yaml and json emit the whole table (entries last), ndjson one entry
+        object per line and markdown a roll/result/description table. The
+        table is loaded (and checked) before the first chunk; entries are
+        serialized one at a time instead of building the output in memory.
+        """
+        format = format.lower()
+        if format not in TABLE_EXPORT_FORMATS:
             raise DataAccessError(f"Unsupported export format: {format}")
+        table_data = self.get_oracle_table(table_name)
+        header = {key: value for key, value in table_data.items() if key != 'entries'}
+        entries = table_data.get('entries') or []
+        return getattr(self, f"_iter_{format}_table")(table_name, header, entries)
+    
+    def _iter_yaml_table(self, table_name: str, header: Dict[str, Any],
+                         entries: List[Any]) -> Iterator[str]:
+        if header:
+            yield yaml_codec.dump(header, default_flow_style=False, indent=2)
+        yield "entries:\n" if entries else "entries: []\n"
+        for entry in entries:
+            yield yaml_codec.dump([entry], default_flow_style=False, indent=2)
+    
+    def _iter_json_table(self, table_name: str, header: Dict[str, Any],
+                         entries: List[Any]) -> Iterator[str]:
+        yield json.dumps(header)[:-1] + (", " if header else "") + '"entries": ['
+        for position, entry in enumerate(entries):
+            yield (", " if position else "") + json.dumps(entry)
+        yield "]}"
+    
+    def _iter_ndjson_table(self, table_name: str, header: Dict[str, Any],
+                           entries: List[Any]) -> Iterator[str]:
+        for entry in entries:
+            yield json.dumps(entry) + "\n"
+    
+    def _iter_markdown_table(self, table_name: str, header: Dict[str, Any],
+                             entries: List[Any]) -> Iterator[str]:
+        yield f"# {header.get('name', table_name)}\n\n"
+        if header.get('description'):
+            yield f"{header['description']}\n\n"
+        yield "| Roll | Result | Description |\n| --- | --- | --- |\n"
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+            roll = entry.get('range', entry.get('roll', ''))
+            if isinstance(roll, list) and len(roll) == 2:
+                roll = f"{roll[0]}-{roll[1]}" if roll[0] != roll[1] else roll[0]
+            cells = [roll, entry.get('result', ''), entry.get('description', '')]
+            yield "| " + " | ".join(str(cell).replace("|", "\\|").replace("\n", " ") for cell in cells) + " |\n"
     
     def import_table(self, table_name: str, table_data: Dict[str, Any], 
                     overwrite: bool = False) -> Dict[str, Any]:
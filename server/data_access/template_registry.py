@@ -0,0 +1,163 @@
+"""
+Template registry for Oracle Forge
+
+Every create path used to re-read its template from vault_templates, and
+_create_from_template read the same template twice (merge, then validation).
+The registry loads every vault_templates/**.yaml file once at startup and
+hands out deep copies, so callers may mutate the defaults they receive.
+
+Templates are hot reloaded: each lookup checks the file's (st_mtime_ns,
+st_size) signature and re-parses an edited template, and refresh() picks up
+templates that were added or removed since the last scan. Templates are
+parsed through the YAML cache, so a warmed vault snapshot makes the startup
+load free.
+"""
+
+import os
+import copy
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from scripts.utils import yaml_codec
+
+from .yaml_cache import get_yaml_cache
+from ..utils.paths import get_vault_templates_path
+
+logger = logging.getLogger(__name__)
+
+Signature = Tuple[int, int]
+
+
+@dataclass
+class TemplateEntry:
+    """A parsed template and the file signature it was parsed from"""
+    path: str
+    signature: Signature
+    data: Dict[str, Any]
+
+
+class TemplateRegistry:
+    """Thread-safe, hot-reloading registry of parsed vault templates"""
+
+    def __init__(self, root: str):
+        # Resolved so lookups can be checked for containment with realpath
+        self.root = os.path.realpath(root)
+        self._entries: Dict[str, TemplateEntry] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _signature(path: str) -> Signature:
+        st = os.stat(path)
+        return (st.st_mtime_ns, st.st_size)
+
+    def _key(self, path: str) -> str:
+        """Template name relative to the vault_templates root, with forward slashes"""
+        return os.path.relpath(path, self.root).replace(os.sep, '/')
+
+    def _resolve(self, template_name: str) -> Optional[str]:
+        """
+        Real path of a template name, or None if it is not a .yaml file inside the root
+
+        Names come from URLs, so "../" segments, absolute paths and symlinks
+        leading out of vault_templates are rejected.
+        """
+        key = template_name.replace(os.sep, '/')
+        if not key.endswith('.yaml'):
+            return None
+        path = os.path.realpath(os.path.join(self.root, *key.split('/')))
+        if os.path.commonpath([self.root, path]) != self.root or path == self.root:
+            return None
+        return path
+
+    def _parse(self, path: str) -> TemplateEntry:
+        signature = self._signature(path)
+        # Goes through the YAML cache so a warmed vault snapshot is reused
+        data = get_yaml_cache().get(path, yaml_codec.load_file) or {}
+        return TemplateEntry(path=path, signature=signature, data=data)
+
+    def refresh(self) -> Dict[str, int]:
+        """Rescan the template tree, loading new or changed templates and dropping removed ones"""
+        found = {}
+        for dirpath, _, filenames in os.walk(self.root):
+            for fname in sorted(filenames):
+                if fname.endswith('.yaml'):
+                    path = os.path.join(dirpath, fname)
+                    found[self._key(path)] = path
+
+        loaded = failed = 0
+        with self._lock:
+            current = dict(self._entries)
+        entries = {}
+        for key, path in found.items():
+            entry = current.get(key)
+            try:
+                if entry is None or entry.signature != self._signature(path):
+                    entry = self._parse(path)
+                    loaded += 1
+            except Exception as e:
+                logger.warning(f"Skipping template {path}: {e}")
+                failed += 1
+                continue
+            entries[key] = entry
+
+        with self._lock:
+            removed = len(set(self._entries) - set(entries))
+            self._entries = entries
+
+        logger.info(f"Template registry: {len(entries)} templates, {loaded} loaded, {removed} removed")
+        return {"templates": len(entries), "loaded": loaded, "removed": removed, "failed": failed}
+
+    def get(self, template_name: str) -> Optional[Dict[str, Any]]:
+        """Return a deep copy of a template's defaults, or None if there is no such template"""
+        path = self._resolve(template_name)
+        if path is None:
+            return None
+        key = self._key(path)
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+        try:
+            signature = self._signature(path)
+        except FileNotFoundError:
+            if entry is not None:
+                with self._lock:
+                    self._entries.pop(key, None)
+            return None
+
+        if entry is None or entry.signature != signature:
+            entry = self._parse(path)
+            with self._lock:
+                self._entries[key] = entry
+        return copy.deepcopy(entry.data)
+
+    def list_templates(self) -> List[Dict[str, Any]]:
+        """Describe every template: name, category and top-level fields"""
+        with self._lock:
+            entries = sorted(self._entries.items())
+        return [
+            {
+                "name": key,
+                "category": key.rsplit('/', 1)[0] if '/' in key else "",
+                "fields": list(entry.data.keys()) if isinstance(entry.data, dict) else [],
+            }
+            for key, entry in entries
+        ]
+
+
+_template_registry: Optional[TemplateRegistry] = None
+_template_registry_lock = threading.Lock()
+
+
+def get_template_registry() -> TemplateRegistry:
+    """Get the process-wide template registry, loading every template on first use"""
+    global _template_registry
+    if _template_registry is None:
+        with _template_registry_lock:
+            if _template_registry is None:
+                registry = TemplateRegistry(get_vault_templates_path())
+                registry.refresh()
+                _template_registry = registry
+    return _template_registry
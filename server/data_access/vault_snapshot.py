@@ -0,0 +1,259 @@
+"""
+Compiled vault snapshot for Oracle Forge
+
+This module compiles the read-mostly parts of the vault (tables, lookup data,
+vault templates and rule metadata) into a single pickle under
+config.database.index_path. The snapshot carries a manifest of source
+mtimes, sizes and SHA-256 hashes so recompiling only re-parses files that
+actually changed. At boot the server loads the snapshot and seeds the parsed
+YAML cache with every entry whose source file is still unchanged, instead of
+walking and parsing the tree.
+
+Adventures are deliberately excluded: they are per-campaign state that
+changes during play.
+
+Compile with `python -m server.manage snapshot`.
+"""
+
+import os
+import pickle
+import hashlib
+import logging
+import threading
+from typing import Dict, List, Optional, Any, Tuple
+
+from scripts.utils import yaml_codec
+
+from .yaml_cache import get_yaml_cache
+from ..utils.paths import (
+    get_index_path,
+    get_tables_path,
+    get_lookup_path,
+    get_rules_path,
+    get_vault_templates_path,
+    ensure_directory_exists,
+)
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_FILENAME = "vault_snapshot.pickle"
+
+# Snapshot sections and the file extension each one compiles
+SNAPSHOT_SOURCES = {
+    "tables": ".yaml",
+    "lookup": ".yaml",
+    "templates": ".yaml",
+    "rules": ".md",
+}
+
+
+def get_snapshot_path() -> str:
+    """Get the path of the compiled vault snapshot"""
+    return os.path.join(get_index_path(), SNAPSHOT_FILENAME)
+
+
+def _source_roots() -> Dict[str, str]:
+    """Map each snapshot section to its vault directory"""
+    return {
+        "tables": get_tables_path(),
+        "lookup": get_lookup_path(),
+        "templates": get_vault_templates_path(),
+        "rules": get_rules_path(),
+    }
+
+
+def _walk_sources() -> List[Tuple[str, str]]:
+    """Return (section, absolute path) for every file the snapshot covers"""
+    sources = []
+    for section, root in _source_roots().items():
+        extension = SNAPSHOT_SOURCES[section]
+        for dirpath, _, filenames in os.walk(root):
+            for fname in sorted(filenames):
+                if fname.endswith(extension) and not fname.startswith('_'):
+                    sources.append((section, os.path.join(dirpath, fname)))
+    return sources
+
+
+def _hash_file(path: str) -> str:
+    """Return the SHA-256 hex digest of a file"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _parse_source(section: str, path: str) -> Any:
+    """Parse one source file into the form stored in the snapshot"""
+    if section == "rules":
+        from .rules_data import extract_rule_metadata
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        return extract_rule_metadata(content, os.path.basename(path))
+    return yaml_codec.load_file(path)
+
+
+def compile_snapshot(previous: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Compile the vault into a snapshot, reusing unchanged entries from previous
+
+    A file is reused without hashing when its mtime and size match the
+    manifest, and reused without parsing when only its mtime changed but the
+    content hash is identical.
+    """
+    old_manifest = previous.get("manifest", {}) if previous else {}
+    old_entries = previous.get("entries", {}) if previous else {}
+
+    manifest: Dict[str, Dict[str, Any]] = {}
+    entries: Dict[str, Any] = {}
+    stats = {"parsed": 0, "reused": 0, "rehashed": 0, "failed": 0, "removed": 0}
+
+    for section, path in _walk_sources():
+        st = os.stat(path)
+        old = old_manifest.get(path)
+
+        if old and old["mtime_ns"] == st.st_mtime_ns and old["size"] == st.st_size and path in old_entries:
+            manifest[path] = old
+            entries[path] = old_entries[path]
+            stats["reused"] += 1
+            continue
+
+        sha256 = _hash_file(path)
+        record = {"section": section, "mtime_ns": st.st_mtime_ns, "size": st.st_size, "sha256": sha256}
+
+        if old and old["sha256"] == sha256 and path in old_entries:
+            manifest[path] = record
+            entries[path] = old_entries[path]
+            stats["rehashed"] += 1
+            continue
+
+        try:
+            entries[path] = _parse_source(section, path)
+        except Exception as e:
+            logger.warning(f"Skipping {path} in vault snapshot: {e}")
+            stats["failed"] += 1
+            continue
+        manifest[path] = record
+        stats["parsed"] += 1
+
+    stats["removed"] = len(set(old_manifest) - set(manifest))
+
+    return {
+        "version": SNAPSHOT_VERSION,
+        "roots": _source_roots(),
+        "manifest": manifest,
+        "entries": entries,
+        "stats": stats,
+    }
+
+
+def save_snapshot(snapshot: Dict[str, Any], path: Optional[str] = None) -> str:
+    """Atomically write a snapshot to disk"""
+    path = path or get_snapshot_path()
+    ensure_directory_exists(os.path.dirname(path))
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+    logger.info(f"Saved vault snapshot with {len(snapshot['manifest'])} files to {path}")
+    return path
+
+
+def load_snapshot(path: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Load a snapshot from disk; returns None if it is missing, unreadable or outdated"""
+    path = path or get_snapshot_path()
+    if not os.path.isfile(path):
+        return None
+
+    try:
+        with open(path, 'rb') as f:
+            snapshot = pickle.load(f)
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable vault snapshot {path}: {e}")
+        return None
+
+    if snapshot.get("version") != SNAPSHOT_VERSION or snapshot.get("roots") != _source_roots():
+        logger.info(f"Ignoring vault snapshot {path}: built for a different version or vault layout")
+        return None
+    return snapshot
+
+
+def find_stale_entries(snapshot: Dict[str, Any]) -> Dict[str, List[str]]:
+    """Compare a snapshot's manifest with the files currently on disk"""
+    current = {path for _, path in _walk_sources()}
+    changed = []
+    for path, record in snapshot["manifest"].items():
+        if path not in current:
+            continue
+        st = os.stat(path)
+        if record["mtime_ns"] != st.st_mtime_ns or record["size"] != st.st_size:
+            changed.append(path)
+
+    return {
+        "changed": sorted(changed),
+        "added": sorted(current - set(snapshot["manifest"])),
+        "removed": sorted(set(snapshot["manifest"]) - current),
+    }
+
+
+# Snapshot loaded at boot
+_loaded_snapshot: Optional[Dict[str, Any]] = None
+_snapshot_lock = threading.Lock()
+
+
+def warm_from_snapshot(path: Optional[str] = None) -> Dict[str, int]:
+    """
+    Load the snapshot and seed the parsed YAML cache from it
+
+    Only entries whose source file still has the recorded mtime and size are
+    used, so a stale snapshot never serves outdated data; changed files are
+    simply parsed on first read as before.
+    """
+    global _loaded_snapshot
+    snapshot = load_snapshot(path)
+    if snapshot is None:
+        return {"loaded": 0, "stale": 0}
+
+    cache = get_yaml_cache()
+    loaded = stale = 0
+    for file_path, record in snapshot["manifest"].items():
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            stale += 1
+            continue
+        signature = (st.st_mtime_ns, st.st_size)
+        if signature != (record["mtime_ns"], record["size"]):
+            stale += 1
+            continue
+        if record["section"] != "rules":
+            cache.put(file_path, signature, snapshot["entries"][file_path])
+        loaded += 1
+
+    with _snapshot_lock:
+        _loaded_snapshot = snapshot
+
+    logger.info(f"Warmed caches from vault snapshot: {loaded} files loaded, {stale} stale")
+    return {"loaded": loaded, "stale": stale}
+
+
+def get_snapshot_rule_metadata(rule_path: str) -> Optional[Dict[str, Any]]:
+    """Return compiled metadata for a rule file if the snapshot is still current for it"""
+    snapshot = _loaded_snapshot
+    if snapshot is None:
+        return None
+
+    path = os.path.abspath(rule_path)
+    record = snapshot["manifest"].get(path)
+    if record is None or record["section"] != "rules":
+        return None
+
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    if (st.st_mtime_ns, st.st_size) != (record["mtime_ns"], record["size"]):
+        return None
+    return dict(snapshot["entries"][path])
+
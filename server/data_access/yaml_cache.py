@@ -0,0 +1,140 @@
+"""
+Parsed YAML cache for Oracle Forge
+
+This module provides a process-wide cache of parsed YAML documents used by
+BaseDataAccess._load_yaml. Entries are keyed by absolute path and validated
+against the file's (st_mtime_ns, st_size) signature on every read, so files
+edited outside the data access layer go stale on their own. The cache is
+bounded by an LRU byte budget measured in source file bytes.
+"""
+
+import os
+import copy
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from ..config import get_config
+
+logger = logging.getLogger(__name__)
+
+Signature = Tuple[int, int]
+
+
+@dataclass
+class CacheEntry:
+    """A parsed document and the file signature it was parsed from"""
+    signature: Signature
+    size: int
+    data: Any
+
+
+@dataclass
+class CacheStats:
+    """Counters used to size the cache budget"""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    entries: int = 0
+    current_bytes: int = 0
+    max_bytes: int = 0
+
+
+class YAMLCache:
+    """Thread-safe LRU cache of parsed YAML files with a byte budget"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._current_bytes = 0
+        self._lock = threading.Lock()
+        self._stats = CacheStats(max_bytes=max_bytes)
+
+    @staticmethod
+    def _signature(path: str) -> Signature:
+        """Return the (st_mtime_ns, st_size) signature of a file"""
+        st = os.stat(path)
+        return (st.st_mtime_ns, st.st_size)
+
+    def get(self, file_path: str, loader: Callable[[str], Any]) -> Any:
+        """
+        Return the parsed contents of a file, parsing it with loader on a miss
+
+        Callers receive a deep copy so they can mutate the result freely.
+        """
+        path = os.path.abspath(file_path)
+        signature = self._signature(path)
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry.signature == signature:
+                self._entries.move_to_end(path)
+                self._stats.hits += 1
+                return copy.deepcopy(entry.data)
+            self._stats.misses += 1
+
+        data = loader(path)
+        self.put(path, signature, data)
+        return copy.deepcopy(data)
+
+    def put(self, file_path: str, signature: Signature, data: Any) -> None:
+        """Store a parsed document under its file signature"""
+        path = os.path.abspath(file_path)
+        size = signature[1]
+        if self.max_bytes <= 0 or size > self.max_bytes:
+            return
+
+        with self._lock:
+            self._discard(path)
+            self._entries[path] = CacheEntry(signature=signature, size=size, data=data)
+            self._current_bytes += size
+            while self._current_bytes > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._current_bytes -= evicted.size
+                self._stats.evictions += 1
+
+    def invalidate(self, file_path: str) -> None:
+        """Drop the cached entry for a file, if any"""
+        path = os.path.abspath(file_path)
+        with self._lock:
+            if self._discard(path):
+                self._stats.invalidations += 1
+
+    def clear(self) -> None:
+        """Drop every cached entry"""
+        with self._lock:
+            self._entries.clear()
+            self._current_bytes = 0
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return a snapshot of the cache counters"""
+        with self._lock:
+            self._stats.entries = len(self._entries)
+            self._stats.current_bytes = self._current_bytes
+            return asdict(self._stats)
+
+    def _discard(self, path: str) -> bool:
+        """Remove an entry without locking; returns True if one was removed"""
+        entry = self._entries.pop(path, None)
+        if entry is None:
+            return False
+        self._current_bytes -= entry.size
+        return True
+
+
+_yaml_cache: Optional[YAMLCache] = None
+_yaml_cache_lock = threading.Lock()
+
+
+def get_yaml_cache() -> YAMLCache:
+    """Get the process-wide parsed YAML cache"""
+    global _yaml_cache
+    if _yaml_cache is None:
+        with _yaml_cache_lock:
+            if _yaml_cache is None:
+                _yaml_cache = YAMLCache(get_config().yaml_cache_max_bytes)
+                logger.info(f"YAML cache enabled with {_yaml_cache.max_bytes} byte budget")
+    return _yaml_cache
@@ -0,0 +1,197 @@
+"""
+Offline maintenance commands for Oracle Forge
+
+Run from the project root, e.g.:
+    python -m server.manage snapshot            # incremental vault compile
+    python -m server.manage snapshot --full     # re-parse every file
+    python -m server.manage snapshot --verify   # report stale entries
+    python -m server.manage adventure-db import --all   # YAML layout -> adventure.db
+    python -m server.manage adventure-db export my_campaign   # adventure.db -> YAML layout
+    python -m server.manage index build         # incremental rebuild of the search indexes
+    python -m server.manage index build --full monsters   # rebuild one index from scratch
+    python -m server.manage index verify        # report sources changed since the last build
+    python -m server.manage rules import OSE rules.zip   # bulk import markdown from a zip or directory
+    python -m server.manage embeddings build    # embed rule sections changed since the last build
+"""
+
+import sys
+import argparse
+import logging
+
+from .data_access.vault_snapshot import (
+    compile_snapshot,
+    save_snapshot,
+    load_snapshot,
+    find_stale_entries,
+    get_snapshot_path,
+)
+from .data_access.index_store import (
+    INDEX_DOMAINS,
+    build_indexes,
+    verify_indexes,
+    get_index_store_path,
+    load_persisted_indexes,
+    save_dirty_indexes,
+)
+from .data_access.rules_data import RuleDataAccess
+from .data_access.rule_embeddings import get_embedding_store_path
+from .data_access.adventure_sqlite import SQLiteAdventureDataAccess
+from .data_access.base_data import DataAccessError
+
+logger = logging.getLogger(__name__)
+
+
+def cmd_snapshot(args: argparse.Namespace) -> int:
+    """Compile or verify the vault snapshot"""
+    existing = None if args.full else load_snapshot()
+
+    if args.verify:
+        if existing is None:
+            print(f"No usable snapshot at {get_snapshot_path()}")
+            return 1
+        report = find_stale_entries(existing)
+        for kind, paths in report.items():
+            for path in paths:
+                print(f"{kind:>8}  {path}")
+        stale_total = sum(len(paths) for paths in report.values())
+        print(f"{len(existing['manifest'])} files in snapshot, {stale_total} stale")
+        return 1 if stale_total else 0
+
+    compiled = compile_snapshot(existing)
+    saved_path = save_snapshot(compiled)
+    stats = compiled["stats"]
+    print(f"Compiled {len(compiled['manifest'])} files to {saved_path}: "
+          f"{stats['parsed']} parsed, {stats['reused']} reused, {stats['rehashed']} rehashed, "
+          f"{stats['removed']} removed, {stats['failed']} failed")
+    return 0
+
+
+def cmd_adventure_db(args: argparse.Namespace) -> int:
+    """Convert adventures between the YAML layout and SQLite storage"""
+    data_access = SQLiteAdventureDataAccess()
+    if args.all:
+        names = [adventure["name"] for adventure in data_access.list_adventures()]
+    else:
+        names = args.adventures
+    if not names:
+        print("No adventures given; pass names or --all")
+        return 1
+
+    failed = 0
+    for name in names:
+        try:
+            if args.direction == "import":
+                count = data_access.import_from_yaml(name)
+            else:
+                count = data_access.export_to_yaml(name)
+            print(f"{args.direction}ed {count} documents for {name}")
+        except DataAccessError as e:
+            print(f"Failed to {args.direction} {name}: {e}")
+            failed += 1
+    return 1 if failed else 0
+
+
+def cmd_index(args: argparse.Namespace) -> int:
+    """Rebuild or verify the persisted search indexes"""
+    domains = args.domains or None
+    unknown = [domain for domain in args.domains if domain not in INDEX_DOMAINS]
+    if unknown:
+        print(f"Unknown index: {', '.join(unknown)} (choose from {', '.join(INDEX_DOMAINS)})")
+        return 1
+
+    if args.action == "verify":
+        report = verify_indexes(domains)
+        stale_total = 0
+        for domain, result in report.items():
+            if "error" in result:
+                print(f"{domain:>13}  {result['error']}")
+                stale_total += 1
+                continue
+            for kind, paths in result.items():
+                for path in paths:
+                    print(f"{domain:>13}  {kind:>8}  {path}")
+            stale_total += sum(len(paths) for paths in result.values())
+        print(f"{len(report)} indexes in {get_index_store_path()}, {stale_total} stale")
+        return 1 if stale_total else 0
+
+    for domain, stats in build_indexes(domains, full=args.full).items():
+        print(f"{domain:>13}  {stats['records']} records, {stats['updated']} sources updated, "
+              f"{stats['removed']} removed")
+    print(f"Saved indexes to {get_index_store_path()}")
+    return 0
+
+
+def cmd_rules(args: argparse.Namespace) -> int:
+    """Bulk import rule markdown into a rule system"""
+    # Update the persisted rule indexes with just the written files
+    load_persisted_indexes(("rule_files", "rule_sections"))
+    try:
+        result = RuleDataAccess().import_rule_archive(args.system, args.source, overwrite=args.overwrite)
+    except DataAccessError as e:
+        print(f"Failed to import {args.source}: {e}")
+        return 1
+    save_dirty_indexes()
+    print(f"Imported into {args.system}: {len(result['added'])} added, {len(result['updated'])} updated, "
+          f"{len(result['unchanged'])} unchanged, {len(result['skipped'])} skipped (existing)")
+    return 0
+
+
+def cmd_embeddings(args: argparse.Namespace) -> int:
+    """Bring the rule section embeddings up to date and save them"""
+    load_persisted_indexes(("rule_sections",))
+    rules = RuleDataAccess()
+    sections = rules.get_section_index()
+    sections.refresh()
+    embeddings = rules.get_embedding_index()
+    stats = embeddings.sync()
+    embeddings.save()
+    save_dirty_indexes()
+    print(f"{stats['rows']} rule sections embedded with {embeddings.embedder.name}: "
+          f"{stats['embedded']} embedded, {stats['removed']} removed")
+    print(f"Saved embeddings to {get_embedding_store_path()}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Oracle Forge maintenance commands")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    snapshot = subparsers.add_parser("snapshot", help="Compile the vault into a snapshot for fast cold start")
+    snapshot.add_argument("--full", action="store_true", help="Ignore the existing snapshot and re-parse every file")
+    snapshot.add_argument("--verify", action="store_true", help="Report stale entries without writing")
+    snapshot.set_defaults(func=cmd_snapshot)
+
+    adventure_db = subparsers.add_parser("adventure-db", help="Convert adventures between YAML files and SQLite")
+    adventure_db.add_argument("direction", choices=["import", "export"],
+                              help="import YAML files into adventure.db, or export adventure.db to YAML files")
+    adventure_db.add_argument("adventures", nargs="*", help="Adventure names")
+    adventure_db.add_argument("--all", action="store_true", help="Convert every adventure")
+    adventure_db.set_defaults(func=cmd_adventure_db)
+
+    index = subparsers.add_parser("index", help="Rebuild or verify the persisted search indexes")
+    index.add_argument("action", choices=["build", "verify"],
+                       help="build brings the indexes up to date and saves them; verify reports stale sources")
+    index.add_argument("domains", nargs="*", metavar="domain",
+                       help=f"Indexes to process (default: all of {', '.join(INDEX_DOMAINS)})")
+    index.add_argument("--full", action="store_true", help="Ignore the persisted index and re-read every source")
+    index.set_defaults(func=cmd_index)
+
+    rules = subparsers.add_parser("rules", help="Bulk import rule markdown files")
+    rules.add_argument("action", choices=["import"], help="import every .md file of a zip archive or directory")
+    rules.add_argument("system", help="Rule system to import into (created if missing)")
+    rules.add_argument("source", help="Zip archive or directory of markdown files")
+    rules.add_argument("--overwrite", action="store_true",
+                       help="Replace existing rule files whose content differs")
+    rules.set_defaults(func=cmd_rules)
+
+    embeddings = subparsers.add_parser("embeddings", help="Build the rule section embeddings for semantic lookup")
+    embeddings.add_argument("action", choices=["build"],
+                            help="build embeds sections changed since the last build and saves the matrix")
+    embeddings.set_defaults(func=cmd_embeddings)
+
+    return parser
+
+
+if __name__ == "__main__":
+    parsed_args = build_parser().parse_args()
+    sys.exit(parsed_args.func(parsed_args))
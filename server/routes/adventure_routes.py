@@ -218,6 +218,15 @@ def list_entities(adv, entity_type):
     result = adventure_service.list_world_entities(adv, entity_type)
     return handle_service_response(result, "entities")
 
+@adventure.route("/adventures/<adv>/world/<entity_type>", methods=["POST"])
+@validate_field("entity_type", allowed_values=ENTITY_TYPES, allow_none=False)
+@validate_json_body(required_fields=["entities"])
+def bulk_create_or_update_entities(adv, entity_type):
+    """Create or update many entities at once"""
+    data = g.request_data
+    result = adventure_service.bulk_create_or_update_world_entities(adv, entity_type, data["entities"])
+    return handle_service_response(result)
+
 @adventure.route("/adventures/<adv>/world/<entity_type>/<entity_name>", methods=["GET"])
 @validate_field("entity_type", allowed_values=ENTITY_TYPES, allow_none=False)
 def get_entity(adv, entity_type, entity_name):
@@ -0,0 +1,36 @@
+"""
+Export routes for Oracle Forge
+
+This module provides streaming export endpoints for rule systems and
+oracle tables. Successful exports are sent as file downloads in chunks
+rather than wrapped in the JSON envelope.
+"""
+
+from flask import Blueprint, request
+import logging
+from ..services.export_service import ExportService
+from ..utils.responses import APIResponse, handle_service_response
+
+export = Blueprint("export", __name__)
+export_service = ExportService()
+logger = logging.getLogger(__name__)
+
+
+def _stream_response(result):
+    if not result.get("success"):
+        return handle_service_response(result)
+    return APIResponse.stream(result["stream"], result["mimetype"], result["filename"])
+
+
+@export.route("/export/rules/<system>", methods=["GET"])
+def export_rule_system(system):
+    """Stream a rule system as markdown, JSON or NDJSON"""
+    result = export_service.export_rule_system(system, request.args.get("format", "markdown"))
+    return _stream_response(result)
+
+
+@export.route("/export/tables/<table_name>", methods=["GET"])
+def export_table(table_name):
+    """Stream an oracle table as YAML, JSON, NDJSON or markdown"""
+    result = export_service.export_table(table_name, request.args.get("format", "yaml"))
+    return _stream_response(result)
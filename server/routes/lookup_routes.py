@@ -4,6 +4,7 @@ import logging
 from ..services.lookup_service import LookupService
 from ..utils.responses import APIResponse, handle_service_response
 from ..utils.validation import validate_json_body, validate_field, validate_enum_field
+from ..utils.route_utils import get_cursor_pagination_params
 
 lookup = Blueprint('lookup', __name__)
 lookup_service = LookupService()
@@ -13,6 +14,10 @@ logger = logging.getLogger(__name__)
 @validate_json_body(required_fields=["query"])
 @validate_field("random", field_type=int, min_value=0, max_value=50, allow_none=True)
 @validate_field("narrate", field_type=bool, allow_none=True)
+@validate_field("fuzzy", field_type=bool, allow_none=True)
+@validate_field("limit", field_type=int, min_value=1, max_value=100, allow_none=True)
+@validate_field("min_hd", field_type=int, min_value=0, allow_none=True)
+@validate_field("max_hd", field_type=int, min_value=0, allow_none=True)
 def lookup_monster():
     """Lookup monsters endpoint"""
     data = g.request_data
@@ -25,6 +30,7 @@ def lookup_monster():
     theme = data.get("theme", "").strip()
     context = data.get("context", "").strip()
     narrate = data.get("narrate", False)
+    fuzzy = data.get("fuzzy", False)
     # Call service
     result = lookup_service.lookup_monsters(
         query=query,
@@ -34,7 +40,11 @@ def lookup_monster():
         random_count=random_count,
         narrate=narrate,
         context=context,
-        theme=theme
+        theme=theme,
+        fuzzy=fuzzy,
+        min_hd=data.get("min_hd"),
+        max_hd=data.get("max_hd"),
+        **get_cursor_pagination_params(data)
     )
     return handle_service_response(result)
 
@@ -62,10 +72,37 @@ def lookup_random_monster():
     )
     return handle_service_response(result)
 
+@lookup.route("/lookup/encounter", methods=["POST"])
+@validate_json_body(required_fields=["party_level", "party_size"])
+@validate_field("party_level", field_type=int, min_value=1, max_value=36)
+@validate_field("party_size", field_type=int, min_value=1, max_value=20)
+@validate_field("xp_budget", field_type=int, min_value=1, allow_none=True)
+@validate_field("count", field_type=int, min_value=1, max_value=20, allow_none=True)
+@validate_field("tags", field_type=list, allow_none=True)
+@validate_field("min_hd", field_type=int, min_value=0, allow_none=True)
+@validate_field("max_hd", field_type=int, min_value=0, allow_none=True)
+def lookup_encounter():
+    """Build candidate encounter groups for a party endpoint"""
+    data = g.request_data
+    result = lookup_service.build_encounters(
+        party_level=data["party_level"],
+        party_size=data["party_size"],
+        xp_budget=data.get("xp_budget"),
+        count=data.get("count") or 3,
+        system=data.get("system", "").strip(),
+        environment=data.get("environment", "").strip(),
+        tags=[str(tag).strip() for tag in data.get("tags") or [] if str(tag).strip()],
+        min_hd=data.get("min_hd"),
+        max_hd=data.get("max_hd"),
+    )
+    return handle_service_response(result)
+
 @lookup.route("/lookup/item", methods=["POST"])
 @validate_json_body(required_fields=["query"])
 @validate_field("random", field_type=int, min_value=0, max_value=50, allow_none=True)
 @validate_field("narrate", field_type=bool, allow_none=True)
+@validate_field("fuzzy", field_type=bool, allow_none=True)
+@validate_field("limit", field_type=int, min_value=1, max_value=100, allow_none=True)
 def lookup_item():
     """Lookup items endpoint"""
     data = g.request_data
@@ -81,6 +118,7 @@ def lookup_item():
     theme = data.get("theme", "").strip()
     context = data.get("context", "").strip()
     narrate = data.get("narrate", False)
+    fuzzy = data.get("fuzzy", False)
     # Call service
     result = lookup_service.lookup_items(
         query=query,
@@ -93,7 +131,9 @@ def lookup_item():
         context=context,
         environment=environment,
         quality=quality,
-        theme=theme
+        theme=theme,
+        fuzzy=fuzzy,
+        **get_cursor_pagination_params(data)
     )
     return handle_service_response(result)
 
@@ -129,6 +169,8 @@ def lookup_random_item():
 @validate_json_body(required_fields=["query"])
 @validate_field("random", field_type=int, min_value=0, max_value=50, allow_none=True)
 @validate_field("narrate", field_type=bool, allow_none=True)
+@validate_field("fuzzy", field_type=bool, allow_none=True)
+@validate_field("limit", field_type=int, min_value=1, max_value=100, allow_none=True)
 def lookup_spell():
     """Lookup spells endpoint"""
     data = g.request_data
@@ -138,6 +180,7 @@ def lookup_spell():
     random_count = data.get("random", 0)
     context = data.get("context", "").strip()
     narrate = data.get("narrate", False)
+    fuzzy = data.get("fuzzy", False)
     # Call service
     result = lookup_service.lookup_spells(
         query=query,
@@ -145,7 +188,9 @@ def lookup_spell():
         tag=tag,
         random_count=random_count,
         narrate=narrate,
-        context=context
+        context=context,
+        fuzzy=fuzzy,
+        **get_cursor_pagination_params(data)
     )
     return handle_service_response(result)
 
@@ -171,14 +216,26 @@ def lookup_random_spell():
 
 @lookup.route("/lookup/rule", methods=["POST"])
 @validate_json_body(required_fields=["query"])
+@validate_field("fuzzy", field_type=bool, allow_none=True)
+@validate_field("limit", field_type=int, min_value=1, max_value=100, allow_none=True)
+@validate_field("mode", field_type=str, allowed_values=["text", "semantic"], allow_none=True)
 def lookup_rule():
     """Lookup rules endpoint"""
     data = g.request_data
     query = data.get("query", "").strip()
     system = data.get("system", "").strip()
     tag = data.get("tag", "").strip()
+    fuzzy = data.get("fuzzy", False)
+    semantic = data.get("mode") == "semantic"
     # Call service
-    result = lookup_service.lookup_rules(query=query, system=system, tag=tag)
+    result = lookup_service.lookup_rules(
+        query=query,
+        system=system,
+        tag=tag,
+        fuzzy=fuzzy,
+        semantic=semantic,
+        **get_cursor_pagination_params(data)
+    )
     return handle_service_response(result)
 
 @lookup.route("/lookup/categories", methods=["GET"])
@@ -71,13 +71,13 @@ def oracle_scene_flavor():
     return handle_service_response(result, "narration")
 
 @oracle.route("/oracle/meaning", methods=["POST"])
-@validate_json_body(required_fields=["question", "table"])
+@validate_json_body(required_fields=["question"])
 def oracle_meaning():
-    """Oracle Meaning query endpoint"""
+    """Oracle Meaning query endpoint; without a table, rolls on actions.yaml"""
     data = g.request_data
     
     question = data.get("question", "").strip()
-    table = data.get("table", "").strip()
+    table = (data.get("table") or "").strip()
     
     # Call service
     result = oracle_service.meaning_query(question=question, table=table)
@@ -0,0 +1,40 @@
+"""
+Search routes for Oracle Forge
+
+This module provides the vault-wide search endpoint, ranking monsters,
+spells, items, rules, oracle tables, generators and world entities together.
+"""
+
+from flask import Blueprint, g
+import logging
+from ..services.search_service import SearchService
+from ..utils.responses import handle_service_response
+from ..utils.validation import validate_json_body, validate_field
+
+search = Blueprint("search", __name__)
+search_service = SearchService()
+logger = logging.getLogger(__name__)
+
+
+@search.route("/search", methods=["POST"])
+@validate_json_body(required_fields=["query"])
+@validate_field("query", field_type=str, min_length=1, max_length=500)
+@validate_field("domains", field_type=list, allow_none=True)
+@validate_field("filters", field_type=dict, allow_none=True)
+@validate_field("boosts", field_type=dict, allow_none=True)
+@validate_field("facets", field_type=list, allow_none=True)
+@validate_field("limit", field_type=int, min_value=1, max_value=100, allow_none=True)
+@validate_field("offset", field_type=int, min_value=0, max_value=1000, allow_none=True)
+def search_vault():
+    """Ranked search across every vault domain"""
+    data = g.request_data
+    result = search_service.search(
+        query=data["query"].strip(),
+        domains=data.get("domains"),
+        filters=data.get("filters"),
+        boosts=data.get("boosts"),
+        limit=data.get("limit") or 10,
+        offset=data.get("offset") or 0,
+        facets=data.get("facets"),
+    )
+    return handle_service_response(result)
@@ -0,0 +1,38 @@
+"""
+Template routes for Oracle Forge
+
+This module provides API endpoints for vault templates:
+- Listing available templates
+- Fetching template defaults
+- Hot reloading templates after edits
+"""
+
+from flask import Blueprint, request
+import logging
+from ..services.template_service import TemplateService
+from ..utils.responses import handle_service_response
+
+templates = Blueprint("templates", __name__)
+template_service = TemplateService()
+logger = logging.getLogger(__name__)
+
+
+@templates.route("/templates", methods=["GET"])
+def list_templates():
+    """List available templates, optionally filtered by ?category=adventures/world"""
+    result = template_service.list_templates(request.args.get("category"))
+    return handle_service_response(result, "templates")
+
+
+@templates.route("/templates/reload", methods=["POST"])
+def reload_templates():
+    """Reload templates that changed on disk"""
+    result = template_service.reload_templates()
+    return handle_service_response(result)
+
+
+@templates.route("/templates/<path:template_name>", methods=["GET"])
+def get_template(template_name):
+    """Get the defaults of a template, e.g. /templates/adventures/world/npcs/npc_template.yaml"""
+    result = template_service.get_template(template_name)
+    return handle_service_response(result)
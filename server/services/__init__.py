@@ -6,15 +6,21 @@ operations between the API routes and the data access layer.
 """
 
 from .adventure_service import AdventureService
+from .export_service import ExportService
 from .generator_service import GeneratorService
 from .lookup_service import LookupService
 from .oracle_service import OracleService
+from .search_service import SearchService
 from .session_service import SessionService
+from .template_service import TemplateService
 
 __all__ = [
     'AdventureService',
+    'ExportService',
     'GeneratorService',
     'LookupService', 
     'OracleService',
+    'SearchService',
     'SessionService',
+    'TemplateService',
 ] 
\ No newline at end of file
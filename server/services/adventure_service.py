@@ -13,9 +13,10 @@ import logging
 from typing import Dict, List, Optional, Any
 from pathlib import Path
 
-from ..data_access.adventure_data import AdventureDataAccess, DataAccessError
+from ..data_access.adventure_data import DataAccessError
+from ..data_access.adventure_sqlite import create_adventure_data_access
 from ..config import get_config
-from ..utils.paths import get_adventure_path
+from ..utils.paths import get_adventure_path, safe_filename
 
 logger = logging.getLogger(__name__)
 
@@ -24,7 +25,7 @@ class AdventureService:
     """Service class for adventure-related business logic"""
     
     def __init__(self):
-        self.data_access = AdventureDataAccess()
+        self.data_access = create_adventure_data_access()
         self.config = get_config()
         self.active_adventure_path = os.path.join("server", "state", "active_adventure.txt")
     
@@ -292,30 +293,74 @@ class AdventureService:
             # Generate the expected filename for this entity
             safe_filename = self.data_access._safe_filename(entity_name) + '.yaml'
             
-            # Check if entity exists by trying to get it
-            existing_entity = self.data_access.get_world_entity(adventure_name, entity_type, safe_filename)
+            # Hold the lock so the existence check and the write are atomic
+            with self.data_access.lock_adventure(adventure_name):
+                # Check if entity exists by trying to get it
+                existing_entity = self.data_access.get_world_entity(adventure_name, entity_type, safe_filename)
             
-            # If we get here and the entity has a name, it exists
-            if existing_entity and existing_entity.get('name'):
-                # Entity exists, update it
-                updated_entity = self.data_access.update_world_entity(adventure_name, entity_type, safe_filename, entity_data)
-                logger.info(f"Updated {entity_type} {entity_name} for {adventure_name}")
-                return {
-                    "success": True,
-                    "entity": updated_entity,
-                    "message": f"{entity_type.title()} '{entity_name}' updated successfully"
-                }
-            else:
-                # Entity doesn't exist, create it
-                created_entity = self.data_access.create_world_entity(adventure_name, entity_type, entity_data)
-                logger.info(f"Created {entity_type} {entity_name} for {adventure_name}")
+                # If we get here and the entity has a name, it exists
+                if existing_entity and existing_entity.get('name'):
+                    # Entity exists, update it
+                    updated_entity = self.data_access.update_world_entity(adventure_name, entity_type, safe_filename, entity_data)
+                    logger.info(f"Updated {entity_type} {entity_name} for {adventure_name}")
+                    return {
+                        "success": True,
+                        "entity": updated_entity,
+                        "message": f"{entity_type.title()} '{entity_name}' updated successfully"
+                    }
+                else:
+                    # Entity doesn't exist, create it
+                    created_entity = self.data_access.create_world_entity(adventure_name, entity_type, entity_data)
+                    logger.info(f"Created {entity_type} {entity_name} for {adventure_name}")
+                    return {
+                        "success": True,
+                        "entity": created_entity,
+                        "message": f"{entity_type.title()} '{entity_name}' created successfully"
+                    }
+        except DataAccessError as e:
+            logger.error(f"Failed to create/update {entity_type} {entity_name} for {adventure_name}: {e}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    def bulk_create_or_update_world_entities(self, adventure_name: str, entity_type: str,
+                                             entities: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Create or update many world entities in one pass"""
+        try:
+            if not isinstance(entities, list) or not entities:
                 return {
-                    "success": True,
-                    "entity": created_entity,
-                    "message": f"{entity_type.title()} '{entity_name}' created successfully"
+                    "success": False,
+                    "error": "entities must be a non-empty list"
                 }
+            # Entities are stored by filename, so names sharing one would overwrite each other
+            filenames = {}
+            for index, entity_data in enumerate(entities):
+                if not isinstance(entity_data, dict) or not entity_data.get("name"):
+                    return {
+                        "success": False,
+                        "error": f"Entity at index {index} must be an object with a name"
+                    }
+                filename = safe_filename(str(entity_data["name"]))
+                if filename in filenames:
+                    return {
+                        "success": False,
+                        "error": f"Entities at index {filenames[filename]} and {index} have the same name "
+                                 f"'{entity_data['name']}'"
+                    }
+                filenames[filename] = index
+            
+            result = self.data_access.bulk_upsert_world_entities(adventure_name, entity_type, entities)
+            logger.info(f"Bulk saved {len(entities)} {entity_type} for {adventure_name}")
+            return {
+                "success": True,
+                "created": result["created"],
+                "updated": result["updated"],
+                "count": len(result["created"]) + len(result["updated"]),
+                "message": f"{len(result['created'])} created, {len(result['updated'])} updated"
+            }
         except DataAccessError as e:
-            logger.error(f"Failed to create/update {entity_type} {entity_name} for {adventure_name}: {e}")
+            logger.error(f"Failed to bulk save {entity_type} for {adventure_name}: {e}")
             return {
                 "success": False,
                 "error": str(e)
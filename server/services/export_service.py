@@ -0,0 +1,78 @@
+"""
+Export Service for Oracle Forge
+
+This module provides business logic for streaming exports:
+- Rule systems as markdown, JSON or NDJSON
+- Oracle tables as YAML, JSON, NDJSON or markdown
+
+Exports are returned as chunk generators for a streaming response, so the
+server never holds a whole export in memory. Unknown systems, tables and
+formats are reported as errors before streaming starts.
+"""
+
+import os
+import logging
+from typing import Dict, Any
+
+from ..data_access.rules_data import RuleDataAccess, RULE_EXPORT_FORMATS
+from ..data_access.tables_data import TableDataAccess, TABLE_EXPORT_FORMATS
+from ..data_access.base_data import DataAccessError
+
+logger = logging.getLogger(__name__)
+
+EXPORT_MIMETYPES = {
+    "markdown": ("text/markdown", "md"),
+    "json": ("application/json", "json"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "yaml": ("application/x-yaml", "yaml"),
+}
+
+
+class ExportService:
+    """Service class for streaming exports"""
+    
+    def __init__(self):
+        self.rule_data_access = RuleDataAccess()
+        self.table_data_access = TableDataAccess()
+    
+    @staticmethod
+    def _stream_result(chunks, name: str, format: str) -> Dict[str, Any]:
+        mimetype, extension = EXPORT_MIMETYPES[format]
+        return {
+            "success": True,
+            "stream": chunks,
+            "mimetype": mimetype,
+            "filename": f"{name}.{extension}",
+        }
+    
+    def export_rule_system(self, system: str, format: str = "markdown") -> Dict[str, Any]:
+        """Stream every rule file of a system"""
+        format = format.lower()
+        if format not in RULE_EXPORT_FORMATS:
+            return {"success": False,
+                    "error": f"Unsupported export format: {format} (choose from {', '.join(RULE_EXPORT_FORMATS)})"}
+        if system not in self.rule_data_access.list_rule_systems():
+            return {"success": False, "error": f"Rule system '{system}' not found"}
+        
+        try:
+            chunks = self.rule_data_access.iter_rule_system_export(system, format)
+        except DataAccessError as e:
+            logger.error(f"Failed to export rule system {system}: {e}")
+            return {"success": False, "error": str(e)}
+        return self._stream_result(chunks, system, format)
+    
+    def export_table(self, table_name: str, format: str = "yaml") -> Dict[str, Any]:
+        """Stream an oracle table"""
+        format = format.lower()
+        if format not in TABLE_EXPORT_FORMATS:
+            return {"success": False,
+                    "error": f"Unsupported export format: {format} (choose from {', '.join(TABLE_EXPORT_FORMATS)})"}
+        if table_name not in self.table_data_access.list_oracle_tables():
+            return {"success": False, "error": f"Oracle table '{table_name}' not found"}
+        
+        try:
+            chunks = self.table_data_access.iter_table_export(table_name, format)
+        except DataAccessError as e:
+            logger.error(f"Failed to export table {table_name}: {e}")
+            return {"success": False, "error": str(e)}
+        return self._stream_result(chunks, os.path.splitext(table_name)[0], format)
@@ -162,7 +162,8 @@ class GeneratorService:
                 }
             
             # Execute the table roll
-            result = self.table_data_access.roll_on_table(target_table)
+            result = self.table_data_access.roll_on_table(
+                target_table, source=self.table_data_access.get_generator_file(generator_type, generator_name))
             
             return {
                 "success": True,
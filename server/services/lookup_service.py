@@ -6,12 +6,17 @@ This service contains business logic for lookup operations including:
 - Filtering and searching logic
 - Narration generation
 - Random selection
+- Semantic retrieval of rule sections
 """
 
 import logging
 from typing import Dict, List, Optional, Any
 
+import numpy as np
+
 from ..data_access.lookup_data import LookupDataAccess, DataAccessError
+from ..data_access.lookup_index import EXACT, CONTAINS, RANGE, LookupPage
+from ..data_access.rules_data import RuleDataAccess
 from scripts.llm.flavoring import narrate_items, narrate_monsters, narrate_spells, rewrite_narration
 
 logger = logging.getLogger(__name__)
@@ -22,62 +27,56 @@ class LookupService:
     
     def __init__(self):
         self.data_access = LookupDataAccess()
+        self.rule_data_access = RuleDataAccess()
+    
+    def _query(self, domain: str, query: str, filters: Dict[str, Any], fuzzy: bool,
+               random_count: int, cursor: str, limit: Optional[int],
+               fields: Optional[List[str]]) -> LookupPage:
+        """Substring or trigram-ranked lookup returning one page, or random_count random matches"""
+        return self.data_access.query_index(
+            domain, query, filters,
+            fuzzy=bool(fuzzy and query),
+            cursor=cursor or None,
+            limit=limit,
+            fields=fields,
+            sample=random_count,
+        )
+    
+    @staticmethod
+    def _page_result(page: LookupPage, limit: Optional[int], **extra: Any) -> Dict[str, Any]:
+        """Build a lookup result; pagination details are only included when a limit was given"""
+        result = {
+            "success": True,
+            "items": page.items,
+            "count": len(page.items),
+            "total": page.total,
+        }
+        result.update(extra)
+        if limit is not None:
+            result["pagination"] = {"limit": limit, "next_cursor": page.next_cursor}
+        return result
     
     # Monster Lookup
     def lookup_monsters(self, query: str = "", system: str = "", tag: str = "", 
                        environment: str = "", random_count: int = 0, 
-                       narrate: bool = False, context: str = "", theme: str = "") -> Dict[str, Any]:
+                       narrate: bool = False, context: str = "", theme: str = "",
+                       fuzzy: bool = False, cursor: str = "", limit: Optional[int] = None,
+                       fields: Optional[List[str]] = None, min_hd: Optional[float] = None,
+                       max_hd: Optional[float] = None) -> Dict[str, Any]:
         """Lookup monsters with filtering and optional narration"""
         try:
-            # Get all monsters
-            systems = [system] if system else self.data_access.list_monster_systems()
-            all_monsters = []
-            
-            for sys in systems:
-                try:
-                    monster_data = self.data_access.get_monster_data(sys)
-                    monsters = monster_data.get('monsters', [])
-                    for monster in monsters:
-                        monster['system'] = sys
-                        all_monsters.append(monster)
-                except DataAccessError:
-                    continue
-            
-            # Apply filters
-            filtered_monsters = all_monsters
-            
-            if query:
-                filtered_monsters = [
-                    m for m in filtered_monsters
-                    if query.lower() in m.get('name', '').lower() or 
-                       query.lower() in m.get('description', '').lower()
-                ]
-            
+            # Narrow candidates through the lookup index's posting lists
+            filters = {}
             if system:
-                filtered_monsters = [
-                    m for m in filtered_monsters
-                    if system.lower() in m.get('system', '').lower()
-                ]
-            
+                filters['system'] = (EXACT, system)
             if tag:
-                filtered_monsters = [
-                    m for m in filtered_monsters
-                    if any(tag.lower() in t.lower() for t in m.get('tags', []))
-                ]
-            
+                filters['tags'] = (CONTAINS, tag)
             if environment:
-                filtered_monsters = [
-                    m for m in filtered_monsters
-                    if environment.lower() in m.get('environment', '').lower()
-                ]
-            
-            # Apply random selection
-            if random_count > 0:
-                import random
-                filtered_monsters = random.sample(
-                    filtered_monsters, 
-                    min(random_count, len(filtered_monsters))
-                )
+                filters['environment'] = (CONTAINS, environment)
+            if min_hd is not None or max_hd is not None:
+                filters['stats.hd'] = (RANGE, (min_hd, max_hd))
+            page = self._query("monsters", query, filters, fuzzy, random_count, cursor, limit, fields)
+            filtered_monsters = page.items
             
             # Generate narration if requested
             narration = None
@@ -87,83 +86,96 @@ class LookupService:
                 except Exception as e:
                     logger.warning(f"Failed to generate monster narration: {e}")
             
+            return self._page_result(page, limit, narration=narration)
+            
+        except Exception as e:
+            logger.error(f"Failed to lookup monsters: {e}")
+            return {
+                "success": False,
+                "error": str(e),
+                "items": [],
+                "count": 0
+            }
+    
+    # Encounter Building
+    def build_encounters(self, party_level: int, party_size: int, xp_budget: Optional[float] = None,
+                         count: int = 3, system: str = "", environment: str = "",
+                         tags: Optional[List[str]] = None, min_hd: Optional[float] = None,
+                         max_hd: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Propose count monster groups worth about xp_budget
+
+        The budget defaults to encounter_xp_per_level XP per character level
+        in the party. Every filtered monster's best-fitting group is computed
+        at once on the MonsterTable columns; groups are then drawn without
+        replacement, weighted by how much of the budget they use.
+        """
+        try:
+            config = self.data_access.config
+            budget = float(xp_budget) if xp_budget else config.encounter_xp_per_level * party_level * party_size
+            table = self.data_access.get_monster_table()
+            mask = table.mask(system=system, environment=environment, tags=tags or (),
+                              min_hd=min_hd, max_hd=max_hd)
+            indices, sizes, totals = table.fit_budget(budget, mask, config.encounter_min_budget_share)
+
+            encounters = []
+            if len(indices):
+                weights = totals / totals.sum()
+                picks = np.random.default_rng().choice(len(indices), size=min(count, len(indices)),
+                                                       replace=False, p=weights)
+                for pick in picks:
+                    i = indices[pick]
+                    monster = table.records[i]
+                    encounters.append({
+                        "name": monster.get("name"),
+                        "system": monster.get("system"),
+                        "count": int(sizes[pick]),
+                        "xp_each": int(table.xp[i]),
+                        "xp_total": int(totals[pick]),
+                        "budget_share": round(float(totals[pick]) / budget, 2),
+                        "hit_dice": monster.get("hit_dice"),
+                        "armor_class": monster.get("armor_class"),
+                        "morale": monster.get("morale"),
+                        "number_appearing": monster.get("number_appearing"),
+                    })
+
             return {
                 "success": True,
-                "items": filtered_monsters,
-                "count": len(filtered_monsters),
-                "narration": narration
+                "xp_budget": budget,
+                "encounters": encounters,
+                "count": len(encounters),
+                "candidates": len(indices),
             }
             
         except Exception as e:
-            logger.error(f"Failed to lookup monsters: {e}")
+            logger.error(f"Failed to build encounters: {e}")
             return {
                 "success": False,
                 "error": str(e),
-                "items": [],
+                "encounters": [],
                 "count": 0
             }
     
     # Spell Lookup
     def lookup_spells(self, query: str = "", system: str = "", spell_class: str = "", 
                      level: Optional[int] = None, tag: str = "", random_count: int = 0,
-                     narrate: bool = False, context: str = "", theme: str = "") -> Dict[str, Any]:
+                     narrate: bool = False, context: str = "", theme: str = "",
+                     fuzzy: bool = False, cursor: str = "", limit: Optional[int] = None,
+                     fields: Optional[List[str]] = None) -> Dict[str, Any]:
         """Lookup spells with filtering and optional narration"""
         try:
-            # Get all spells
-            systems = [system] if system else self.data_access.list_spell_systems()
-            all_spells = []
-            
-            for sys in systems:
-                try:
-                    spell_data = self.data_access.get_spell_data(sys)
-                    spells = spell_data.get('spells', [])
-                    for spell in spells:
-                        spell['system'] = sys
-                        all_spells.append(spell)
-                except DataAccessError:
-                    continue
-            
-            # Apply filters
-            filtered_spells = all_spells
-            
-            if query:
-                filtered_spells = [
-                    s for s in filtered_spells
-                    if query.lower() in s.get('name', '').lower() or 
-                       query.lower() in s.get('description', '').lower()
-                ]
-            
+            # Narrow candidates through the lookup index's posting lists
+            filters = {}
             if system:
-                filtered_spells = [
-                    s for s in filtered_spells
-                    if system.lower() in s.get('system', '').lower()
-                ]
-            
+                filters['system'] = (EXACT, system)
             if spell_class:
-                filtered_spells = [
-                    s for s in filtered_spells
-                    if spell_class.lower() in s.get('class', '').lower()
-                ]
-            
+                filters['class'] = (CONTAINS, spell_class)
             if level is not None:
-                filtered_spells = [
-                    s for s in filtered_spells
-                    if s.get('level') == level
-                ]
-            
+                filters['level'] = (EXACT, level)
             if tag:
-                filtered_spells = [
-                    s for s in filtered_spells
-                    if any(tag.lower() in t.lower() for t in s.get('tags', []))
-                ]
-            
-            # Apply random selection
-            if random_count > 0:
-                import random
-                filtered_spells = random.sample(
-                    filtered_spells, 
-                    min(random_count, len(filtered_spells))
-                )
+                filters['tags'] = (CONTAINS, tag)
+            page = self._query("spells", query, filters, fuzzy, random_count, cursor, limit, fields)
+            filtered_spells = page.items
             
             # Generate narration if requested
             narration = None
@@ -173,12 +185,7 @@ class LookupService:
                 except Exception as e:
                     logger.warning(f"Failed to generate spell narration: {e}")
             
-            return {
-                "success": True,
-                "items": filtered_spells,
-                "count": len(filtered_spells),
-                "narration": narration
-            }
+            return self._page_result(page, limit, narration=narration)
             
         except Exception as e:
             logger.error(f"Failed to lookup spells: {e}")
@@ -193,64 +200,23 @@ class LookupService:
     def lookup_items(self, query: str = "", system: str = "", category: str = "", 
                     subcategory: str = "", tag: str = "", random_count: int = 0,
                     narrate: bool = False, context: str = "", environment: str = "", 
-                    quality: str = "", theme: str = "") -> Dict[str, Any]:
+                    quality: str = "", theme: str = "", fuzzy: bool = False,
+                    cursor: str = "", limit: Optional[int] = None,
+                    fields: Optional[List[str]] = None) -> Dict[str, Any]:
         """Lookup items with filtering and optional narration"""
         try:
-            # Get all items
-            categories = [category] if category else self.data_access.list_item_categories()
-            all_items = []
-            
-            for cat in categories:
-                try:
-                    items = self.data_access.list_items_in_category(cat)
-                    for item_file in items:
-                        item_data = self.data_access.get_item(cat, item_file)
-                        item_data['category'] = cat
-                        all_items.append(item_data)
-                except DataAccessError:
-                    continue
-            
-            # Apply filters
-            filtered_items = all_items
-            
-            if query:
-                filtered_items = [
-                    i for i in filtered_items
-                    if query.lower() in i.get('name', '').lower() or 
-                       query.lower() in i.get('description', '').lower()
-                ]
-            
-            if system:
-                filtered_items = [
-                    i for i in filtered_items
-                    if system.lower() in i.get('system', '').lower()
-                ]
-            
+            # Narrow candidates through the lookup index's posting lists
+            filters = {}
             if category:
-                filtered_items = [
-                    i for i in filtered_items
-                    if category.lower() in i.get('category', '').lower()
-                ]
-            
+                filters['category'] = (EXACT, category)
+            if system:
+                filters['system'] = (CONTAINS, system)
             if subcategory:
-                filtered_items = [
-                    i for i in filtered_items
-                    if subcategory.lower() in i.get('subcategory', '').lower()
-                ]
-            
+                filters['subcategory'] = (CONTAINS, subcategory)
             if tag:
-                filtered_items = [
-                    i for i in filtered_items
-                    if any(tag.lower() in t.lower() for t in i.get('tags', []))
-                ]
-            
-            # Apply random selection
-            if random_count > 0:
-                import random
-                filtered_items = random.sample(
-                    filtered_items, 
-                    min(random_count, len(filtered_items))
-                )
+                filters['tags'] = (CONTAINS, tag)
+            page = self._query("items", query, filters, fuzzy, random_count, cursor, limit, fields)
+            filtered_items = page.items
             
             # Generate narration if requested
             narration = None
@@ -260,12 +226,7 @@ class LookupService:
                 except Exception as e:
                     logger.warning(f"Failed to generate item narration: {e}")
             
-            return {
-                "success": True,
-                "items": filtered_items,
-                "count": len(filtered_items),
-                "narration": narration
-            }
+            return self._page_result(page, limit, narration=narration)
             
         except Exception as e:
             logger.error(f"Failed to lookup items: {e}")
@@ -277,50 +238,37 @@ class LookupService:
             }
     
     # Rule Lookup
-    def lookup_rules(self, query: str = "", system: str = "", tag: str = "") -> Dict[str, Any]:
-        """Lookup rules with filtering"""
+    def lookup_rules(self, query: str = "", system: str = "", tag: str = "",
+                     fuzzy: bool = False, cursor: str = "", limit: Optional[int] = None,
+                     fields: Optional[List[str]] = None, semantic: bool = False) -> Dict[str, Any]:
+        """
+        Lookup rules with filtering
+
+        With semantic set, returns the limit (default 5) rule markdown
+        sections closest in meaning to the query instead of matching the
+        rule lookup entries; only system narrows them.
+        """
         try:
-            # Get all rules
-            systems = [system] if system else self.data_access.list_rule_systems()
-            all_rules = []
-            
-            for sys in systems:
-                try:
-                    rule_data = self.data_access.get_rule_data(sys)
-                    rules = rule_data.get('rules', [])
-                    for rule in rules:
-                        rule['system'] = sys
-                        all_rules.append(rule)
-                except DataAccessError:
-                    continue
-            
-            # Apply filters
-            filtered_rules = all_rules
-            
-            if query:
-                filtered_rules = [
-                    r for r in filtered_rules
-                    if query.lower() in r.get('title', '').lower() or 
-                       query.lower() in r.get('content', '').lower()
-                ]
+            if semantic:
+                sections = self.rule_data_access.semantic_search_rules(query, system=system or None,
+                                                                       limit=limit or 5)
+                return {
+                    "success": True,
+                    "mode": "semantic",
+                    "items": sections,
+                    "count": len(sections),
+                    "total": len(sections),
+                }
             
+            # Narrow candidates through the lookup index's posting lists
+            filters = {}
             if system:
-                filtered_rules = [
-                    r for r in filtered_rules
-                    if system.lower() in r.get('system', '').lower()
-                ]
-            
+                filters['system'] = (EXACT, system)
             if tag:
-                filtered_rules = [
-                    r for r in filtered_rules
-                    if any(tag.lower() in t.lower() for t in r.get('tags', []))
-                ]
+                filters['tags'] = (CONTAINS, tag)
+            page = self._query("rules", query, filters, fuzzy, 0, cursor, limit, fields)
             
-            return {
-                "success": True,
-                "items": filtered_rules,
-                "count": len(filtered_rules)
-            }
+            return self._page_result(page, limit)
             
         except Exception as e:
             logger.error(f"Failed to lookup rules: {e}")
@@ -127,7 +127,7 @@ class OracleService:
     def meaning_query(self, question: str, table: str) -> Dict[str, Any]:
         """Handle a meaning oracle query"""
         try:
-            result = handle_meaning(question=question, table=table)
+            result = handle_meaning(question=question, table=table or None)
             
             logger.info(f"Meaning oracle query: '{question}' using table '{table}' -> {result.get('result', 'unknown')}")
             return {
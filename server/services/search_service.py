@@ -0,0 +1,56 @@
+"""
+Search Service for Oracle Forge
+
+This module provides business logic for vault-wide search:
+- Validating search domains, filters and boosts
+- Ranking records across every domain with BM25
+"""
+
+import logging
+from typing import Dict, List, Optional, Any
+
+from ..data_access.search_data import SearchDataAccess, SEARCH_DOMAINS, DataAccessError
+
+logger = logging.getLogger(__name__)
+
+
+class SearchService:
+    """Service class for cross-domain search"""
+    
+    def __init__(self):
+        self.data_access = SearchDataAccess()
+    
+    def search(self, query: str, domains: Optional[List[str]] = None,
+               filters: Optional[Dict[str, Any]] = None, boosts: Optional[Dict[str, float]] = None,
+               limit: int = 10, offset: int = 0, facets: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Rank monsters, spells, items, rules, tables, generators and world entities against a query"""
+        unknown = [domain for domain in list(domains or []) + list(boosts or {}) if domain not in SEARCH_DOMAINS]
+        if unknown:
+            return {
+                "success": False,
+                "error": f"Unknown search domain: {', '.join(unknown)} (choose from {', '.join(SEARCH_DOMAINS)})"
+            }
+        for domain, boost in (boosts or {}).items():
+            if isinstance(boost, bool) or not isinstance(boost, (int, float)) or boost < 0:
+                return {"success": False, "error": f"Boost for '{domain}' must be a non-negative number"}
+        for facet, value in (filters or {}).items():
+            if not isinstance(value, (str, int, float, bool)):
+                return {"success": False, "error": f"Filter '{facet}' must be a string, number or boolean"}
+        if any(not isinstance(facet, str) for facet in facets or ()):
+            return {"success": False, "error": "Facets must be a list of facet names"}
+        
+        try:
+            result = self.data_access.search(query, domains, filters, boosts, limit, offset, facets or ())
+        except DataAccessError as e:
+            logger.error(f"Failed to search: {e}")
+            return {"success": False, "error": str(e)}
+        
+        return {
+            "success": True,
+            "query": query,
+            "hits": result["hits"],
+            "count": len(result["hits"]),
+            "total": result["total"],
+            "facets": result["facets"],
+            "pagination": {"limit": limit, "offset": offset},
+        }
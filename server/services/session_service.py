@@ -11,10 +11,11 @@ This service contains business logic for session management including:
 import os
 import logging
 import re
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 
-from ..data_access.adventure_data import AdventureDataAccess, DataAccessError
+from ..data_access.adventure_data import DataAccessError
+from ..data_access.adventure_sqlite import create_adventure_data_access
 from scripts.llm.flavoring import summarize_session_log_llm
 
 logger = logging.getLogger(__name__)
@@ -24,7 +25,7 @@ class SessionService:
     """Service class for session-related business logic"""
     
     def __init__(self):
-        self.data_access = AdventureDataAccess()
+        self.data_access = create_adventure_data_access()
         self.active_adventure_path = os.path.join("server", "state", "active_adventure.txt")
     
     # Active Adventure Management
@@ -314,14 +315,8 @@ class SessionService:
                 "content": entry["content"]
             }
             
-            # Get current session and append entry
-            active_session = self.data_access.get_active_session(adventure_name)
-            log = active_session.get("log", [])
-            log.append(log_entry)
-            active_session["log"] = log
-            
-            # Update the session
-            updated_session = self.data_access.update_active_session(adventure_name, active_session)
+            # Journal the entry instead of rewriting the whole session file
+            self.data_access.append_session_log(adventure_name, log_entry)
             
             logger.info(f"Appended log entry to session for adventure '{adventure_name}'")
             return {
@@ -371,63 +366,34 @@ class SessionService:
                     "error": "No active adventure"
                 }
             
-            # Get current session log
-            active_session = self.data_access.get_active_session(adventure_name)
-            log = active_session.get("log", [])
-            
+            # Summarize without holding the adventure lock, since an LLM call would stall
+            # every log append and read, then re-read the log under the lock to archive it
+            log = self.data_access.get_active_session(adventure_name).get("log", [])
             if not log:
                 return {
                     "success": False,
                     "error": "No session log to summarize"
                 }
+            summary = self._summarize_log(log)
             
-            # Generate summary using LLM
-            try:
-                summary = summarize_session_log_llm(log)
-            except Exception as e:
-                logger.warning(f"Failed to generate LLM summary, using fallback: {e}")
-                summary = self._generate_fallback_summary(log)
-            
-            # Update session with summary and end timestamp
-            active_session["summary"] = summary
-            active_session["end_time"] = datetime.now().isoformat()
-            active_session["status"] = "ended"
-            
-            # Archive the finished session to sessions/session_XX.yaml
-            from server.utils.paths import get_adventure_path
-            import shutil
-            sessions_dir = os.path.join(get_adventure_path(adventure_name), "sessions")
-            os.makedirs(sessions_dir, exist_ok=True)
-            # Find next session number
-            existing = [f for f in os.listdir(sessions_dir) if f.startswith("session_") and f.endswith(".yaml")]
-            numbers = [int(f.split("_")[1].split(".")[0]) for f in existing if f.split("_")[1].split(".")[0].isdigit()]
-            next_num = max(numbers) + 1 if numbers else 1
-            session_id = f"session_{next_num:02d}"
-            session_filename = f"{session_id}.yaml"
-            session_path = os.path.join(sessions_dir, session_filename)
-            # Save the finished session
-            import yaml
-            with open(session_path, "w") as f:
-                yaml.safe_dump(active_session, f, sort_keys=False, allow_unicode=True)
-            
-            # Create new active_session.yaml from template
-            from server.utils.paths import get_vault_template_path, get_adventure_file_path
-            template_path = get_vault_template_path("adventures/active_session.yaml")
-            with open(template_path, "r") as f:
-                template_data = yaml.safe_load(f)
-            template_data["adventure"] = adventure_name
-            template_data["session_id"] = f"session_{next_num+1:02d}"
-            template_data["log"] = []
-            # Optionally reset metadata
-            if "metadata" in template_data:
-                template_data["metadata"]["start_time"] = datetime.now().isoformat()
-                template_data["metadata"]["duration"] = ""
-                template_data["metadata"]["scene_count"] = 0
-                template_data["metadata"]["oracle_questions"] = 0
-            # Save new active_session.yaml
-            active_session_path = get_adventure_file_path(adventure_name, "active_session.yaml")
-            with open(active_session_path, "w") as f:
-                yaml.safe_dump(template_data, f, sort_keys=False, allow_unicode=True)
+            with self.data_access.lock_adventure(adventure_name):
+                # Fold any journaled entries into the session file, then get the full log
+                self.data_access.compact_session_journal(adventure_name)
+                active_session = self.data_access.get_active_session(adventure_name)
+                current_log = active_session.get("log", [])
+                
+                if current_log[:len(log)] != log:
+                    return {
+                        "success": False,
+                        "error": "Session was ended by another request while it was being summarized"
+                    }
+                if len(current_log) > len(log):
+                    # Entries logged while summarizing are archived with the session
+                    logger.info(f"Archiving {len(current_log) - len(log)} log entries added "
+                                f"while summarizing the session of '{adventure_name}'")
+                
+                session_id, session_filename = self._archive_active_session(
+                    adventure_name, active_session, summary)
             
             logger.info(f"Ended session for adventure '{adventure_name}', archived as {session_filename}")
             return {
@@ -444,6 +410,28 @@ class SessionService:
                 "error": str(e)
             }
     
+    def _archive_active_session(self, adventure_name: str, active_session: Dict[str, Any],
+                                summary: str) -> Tuple[str, str]:
+        """Save the active session as the next session_XX.yaml and start a new one; caller holds the lock"""
+        # Update session with summary and end timestamp
+        active_session["summary"] = summary
+        active_session["end_time"] = datetime.now().isoformat()
+        active_session["status"] = "ended"
+        
+        # Archive the finished session to sessions/session_XX.yaml
+        existing = [f for f in self.data_access.list_sessions(adventure_name) if f.startswith("session_")]
+        numbers = [int(f.split("_")[1].split(".")[0]) for f in existing if f.split("_")[1].split(".")[0].isdigit()]
+        next_num = max(numbers) + 1 if numbers else 1
+        session_id = f"session_{next_num:02d}"
+        session_filename = f"{session_id}.yaml"
+        # Save the finished session
+        self.data_access.save_session(adventure_name, session_filename, active_session)
+        
+        # Start a new active session from the template
+        new_session = self.data_access.new_active_session_from_template(adventure_name, f"session_{next_num+1:02d}")
+        self.data_access.update_active_session(adventure_name, new_session)
+        return session_id, session_filename
+    
     def get_session_summary(self, session_id: Optional[str] = None) -> Dict[str, Any]:
         """Get a summary of the session"""
         try:
@@ -473,11 +461,7 @@ class SessionService:
             
             if not summary and log:
                 # Generate summary if not exists
-                try:
-                    summary = summarize_session_log_llm(log)
-                except Exception as e:
-                    logger.warning(f"Failed to generate LLM summary, using fallback: {e}")
-                    summary = self._generate_fallback_summary(log)
+                summary = self._summarize_log(log)
             
             return {
                 "success": True,
@@ -493,6 +477,14 @@ class SessionService:
             }
     
     # Utility methods
+    def _summarize_log(self, log: List[Dict[str, Any]]) -> str:
+        """Summarize a session log with the LLM, or the fallback summary if that fails"""
+        try:
+            return summarize_session_log_llm(log)
+        except Exception as e:
+            logger.warning(f"Failed to generate LLM summary, using fallback: {e}")
+            return self._generate_fallback_summary(log)
+    
     def _generate_fallback_summary(self, log: List[Dict[str, Any]]) -> str:
         """Generate a simple fallback summary when LLM is not available"""
         if not log:
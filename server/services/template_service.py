@@ -0,0 +1,70 @@
+"""
+Template Service for Oracle Forge
+
+This module provides business logic for browsing vault templates:
+- Listing the available templates for the UI
+- Serving template defaults
+- Reloading templates after they were edited on disk
+"""
+
+import logging
+from typing import Dict, Optional, Any
+
+from ..data_access.template_registry import get_template_registry
+
+logger = logging.getLogger(__name__)
+
+
+class TemplateService:
+    """Service class for vault template operations"""
+    
+    @property
+    def registry(self):
+        # Resolved lazily so app startup can warm the vault snapshot first
+        return get_template_registry()
+    
+    def list_templates(self, category: Optional[str] = None) -> Dict[str, Any]:
+        """List available templates, optionally limited to a category prefix"""
+        templates = self.registry.list_templates()
+        if category:
+            prefix = category.strip('/')
+            templates = [
+                t for t in templates
+                if t["category"] == prefix or t["category"].startswith(prefix + '/')
+            ]
+        return {
+            "success": True,
+            "templates": templates,
+            "count": len(templates)
+        }
+    
+    def get_template(self, template_name: str) -> Dict[str, Any]:
+        """Get the defaults of a single template"""
+        try:
+            template = self.registry.get(template_name)
+        except Exception as e:
+            logger.error(f"Failed to load template {template_name}: {e}")
+            return {
+                "success": False,
+                "error": f"Failed to load template {template_name}: {e}"
+            }
+        
+        if template is None:
+            return {
+                "success": False,
+                "error": f"Template not found: {template_name}"
+            }
+        return {
+            "success": True,
+            "name": template_name,
+            "template": template
+        }
+    
+    def reload_templates(self) -> Dict[str, Any]:
+        """Rescan vault_templates for added, changed and removed templates"""
+        stats = self.registry.refresh()
+        logger.info(f"Reloaded templates: {stats}")
+        return {
+            "success": True,
+            **stats
+        }
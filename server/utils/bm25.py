@@ -0,0 +1,127 @@
+"""
+BM25 ranking for Oracle Forge
+
+BM25 keeps term -> {doc id: term frequency} postings and document lengths,
+updated incrementally as documents are added and removed, and scores
+documents against a list of query terms:
+
+    score(d) = sum over terms t of
+        idf(t) * tf(t, d) * (k1 + 1) / (tf(t, d) + k1 * (1 - b + b * |d| / avgdl))
+
+Scoring only walks the postings of the query terms, so query cost depends
+on how many documents contain those terms, not on the size of the corpus.
+
+Several BM25 instances can be ranked as one corpus: merge their
+corpus_stats() for the query terms and pass the result to score(), so a
+term's IDF and the average document length are computed over every
+instance (e.g. one per search domain).
+"""
+
+import math
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Mapping, Optional, Set
+
+# Standard Okapi BM25 parameters
+DEFAULT_K1 = 1.2
+DEFAULT_B = 0.75
+
+
+@dataclass
+class CorpusStats:
+    """Document count, total length and per-term document frequencies of a corpus"""
+    doc_count: int = 0
+    total_length: int = 0
+    doc_freqs: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def avg_length(self) -> float:
+        return self.total_length / self.doc_count if self.doc_count else 0.0
+
+    def merge(self, other: "CorpusStats") -> "CorpusStats":
+        """Combined stats of two corpora"""
+        doc_freqs = Counter(self.doc_freqs)
+        doc_freqs.update(other.doc_freqs)
+        return CorpusStats(self.doc_count + other.doc_count,
+                           self.total_length + other.total_length, dict(doc_freqs))
+
+    def idf(self, term: str) -> float:
+        """Okapi IDF, floored at a small positive value so very common terms still count"""
+        df = self.doc_freqs.get(term, 0)
+        return max(math.log(1 + (self.doc_count - df + 0.5) / (df + 0.5)), 1e-6)
+
+
+class BM25:
+    """Incrementally maintained BM25 postings for one document collection"""
+
+    def __init__(self, k1: float = DEFAULT_K1, b: float = DEFAULT_B):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[int, float]] = {}
+        self._lengths: Dict[int, float] = {}
+        self._total_length = 0.0
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def add(self, doc_id: int, term_freqs: Mapping[str, float], length: Optional[float] = None) -> None:
+        """
+        Index a document's term frequencies
+
+        length defaults to the sum of the frequencies; pass it explicitly when
+        some fields are weighted (a title counted twice should not make the
+        document look twice as long).
+        """
+        if doc_id in self._lengths:
+            self.remove(doc_id)
+        for term, freq in term_freqs.items():
+            if freq > 0:
+                self._postings.setdefault(term, {})[doc_id] = freq
+        length = sum(term_freqs.values()) if length is None else length
+        self._lengths[doc_id] = length
+        self._total_length += length
+
+    def remove(self, doc_id: int, terms: Optional[Iterable[str]] = None) -> None:
+        """Drop a document; pass its terms to avoid scanning the whole vocabulary"""
+        length = self._lengths.pop(doc_id, None)
+        if length is None:
+            return
+        self._total_length -= length
+        for term in (list(self._postings) if terms is None else terms):
+            postings = self._postings.get(term)
+            if postings is not None and postings.pop(doc_id, None) is not None and not postings:
+                del self._postings[term]
+
+    def doc_freq(self, term: str) -> int:
+        postings = self._postings.get(term)
+        return len(postings) if postings else 0
+
+    def corpus_stats(self, terms: Iterable[str]) -> CorpusStats:
+        """Stats of this collection for the given query terms"""
+        return CorpusStats(len(self._lengths), int(self._total_length),
+                           {term: self.doc_freq(term) for term in set(terms)})
+
+    def score(self, terms: List[str], stats: Optional[CorpusStats] = None,
+              candidates: Optional[Set[int]] = None) -> Dict[int, float]:
+        """
+        BM25 score of every document containing at least one query term
+
+        Args:
+            terms: Query terms; a repeated term counts once per occurrence
+            stats: Corpus stats to score against (defaults to this collection's)
+            candidates: Only score these doc ids (e.g. the result of facet filters)
+        """
+        stats = stats or self.corpus_stats(terms)
+        avg_length = stats.avg_length or 1.0
+        scores: Dict[int, float] = {}
+        for term, query_freq in Counter(terms).items():
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            weight = stats.idf(term) * query_freq
+            for doc_id, freq in postings.items():
+                if candidates is not None and doc_id not in candidates:
+                    continue
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[doc_id] / avg_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + weight * freq * (self.k1 + 1) / (freq + norm)
+        return scores
@@ -0,0 +1,129 @@
+"""
+Directory listing cache for Oracle Forge
+
+Listing helpers used to call os.listdir plus os.path.isdir per entry on every
+request (get_active_adventure alone lists every adventure each time). This
+module scans a directory once with os.scandir, which returns the entry type
+with the listing, and keeps the result until the directory's st_mtime_ns
+changes. Writes that go through the data access layer also invalidate the
+affected directory explicitly, so same-tick changes are never missed.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Tuple
+
+MAX_CACHED_DIRECTORIES = 4096
+
+
+@dataclass(frozen=True)
+class DirEntryInfo:
+    """The parts of an os.DirEntry the listing helpers need"""
+    name: str
+    is_dir: bool
+    is_file: bool
+
+
+@dataclass
+class DirectoryCacheStats:
+    """Counters for the directory listing cache"""
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+    entries: int = 0
+
+
+class DirectoryListingCache:
+    """Thread-safe LRU cache of directory listings validated by directory mtime"""
+
+    def __init__(self, max_entries: int = MAX_CACHED_DIRECTORIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[int, Tuple[DirEntryInfo, ...]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = DirectoryCacheStats()
+
+    def scan(self, directory: str) -> Tuple[DirEntryInfo, ...]:
+        """Return the entries of a directory, or () if it does not exist"""
+        path = os.path.abspath(directory)
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except (FileNotFoundError, NotADirectoryError):
+            self.invalidate(path)
+            return ()
+
+        with self._lock:
+            cached = self._entries.get(path)
+            if cached is not None and cached[0] == mtime_ns:
+                self._entries.move_to_end(path)
+                self._stats.hits += 1
+                return cached[1]
+            self._stats.misses += 1
+
+        with os.scandir(path) as it:
+            entries = tuple(
+                DirEntryInfo(entry.name, entry.is_dir(), entry.is_file())
+                for entry in it
+            )
+
+        with self._lock:
+            self._entries[path] = (mtime_ns, entries)
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entries
+
+    def list_files(self, directory: str, suffix: str) -> List[str]:
+        """Sorted names of non-underscore files in a directory ending with suffix"""
+        return sorted(
+            entry.name for entry in self.scan(directory)
+            if entry.is_file and entry.name.endswith(suffix) and not entry.name.startswith('_')
+        )
+
+    def list_directories(self, directory: str) -> List[str]:
+        """Names of the subdirectories of a directory, in scan order"""
+        return [entry.name for entry in self.scan(directory) if entry.is_dir]
+
+    def invalidate(self, directory: str) -> None:
+        """Drop the cached listing for a directory"""
+        path = os.path.abspath(directory)
+        with self._lock:
+            if self._entries.pop(path, None) is not None:
+                self._stats.invalidations += 1
+
+    def invalidate_tree(self, directory: str) -> None:
+        """Drop the listings of a directory, everything below it, and its parent"""
+        path = os.path.abspath(directory)
+        prefix = path + os.sep
+        with self._lock:
+            stale = [key for key in self._entries if key == path or key.startswith(prefix)]
+            for key in stale:
+                del self._entries[key]
+            self._stats.invalidations += len(stale)
+        self.invalidate(os.path.dirname(path))
+
+    def clear(self) -> None:
+        """Drop every cached listing"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return a snapshot of the cache counters"""
+        with self._lock:
+            self._stats.entries = len(self._entries)
+            return asdict(self._stats)
+
+
+_directory_cache: Optional[DirectoryListingCache] = None
+_directory_cache_lock = threading.Lock()
+
+
+def get_directory_cache() -> DirectoryListingCache:
+    """Get the process-wide directory listing cache"""
+    global _directory_cache
+    if _directory_cache is None:
+        with _directory_cache_lock:
+            if _directory_cache is None:
+                _directory_cache = DirectoryListingCache()
+    return _directory_cache
@@ -0,0 +1,139 @@
+"""
+Text embedders for semantic retrieval in Oracle Forge
+
+An embedder turns texts into L2-normalized float32 rows, so the cosine
+similarity of two texts is the dot product of their rows. Two are provided:
+
+- LlamaEmbedder runs a local GGUF model through llama_cpp in embedding
+  mode, on CPU. It matches texts that share meaning but not words.
+- HashingEmbedder needs only NumPy. It hashes content words and their
+  padded character trigrams into a fixed number of buckets, so it matches
+  inflections and compounds ("recover" / "recovery", "spellcasting" /
+  "casting") but not synonyms.
+
+get_embedder() picks the llama embedder when a model is configured and
+llama_cpp can load it, and falls back to hashing, with a warning, otherwise. Each
+embedder has a name; vectors stored by one embedder are never compared with
+another's.
+"""
+
+import os
+import zlib
+import logging
+import threading
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from .text import tokenize, trigrams
+
+logger = logging.getLogger(__name__)
+
+HASHING_DIM = 512
+
+# Longest text passed to the llama embedder, in characters; rule sections
+# are cut here to stay inside the model's context
+LLAMA_MAX_CHARS = 4000
+LLAMA_CONTEXT = 2048
+
+# Words too common in rule text to say anything about a section
+STOPWORDS = frozenset("""
+a an and are as at be by can do does for from has have how if in into is it its
+may must no not of on or so that the their them then there they this to was
+were what when where which who will with you your
+""".split())
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32)
+
+
+class HashingEmbedder:
+    """Feature-hashed bag of words and character trigrams with sublinear term frequency"""
+
+    def __init__(self, dim: int = HASHING_DIM):
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+        self._buckets: Dict[str, int] = {}
+
+    def _bucket(self, feature: str) -> int:
+        """Signed bucket of a feature; crc32 keeps it stable across processes, unlike hash()"""
+        bucket = self._buckets.get(feature)
+        if bucket is None:
+            h = zlib.crc32(feature.encode("utf-8"))
+            bucket = (h >> 1) % self.dim if h & 1 else -((h >> 1) % self.dim) - 1
+            self._buckets[feature] = bucket
+        return bucket
+
+    def _features(self, text: str) -> Dict[str, float]:
+        words = [word for word in tokenize(text) if word not in STOPWORDS]
+        counts: Dict[str, float] = {}
+        for word in words:
+            counts[f"w:{word}"] = counts.get(f"w:{word}", 0.0) + 1.0
+            for gram in trigrams(word):
+                counts[gram] = counts.get(gram, 0.0) + 0.5
+        return counts
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature, count in self._features(text).items():
+                bucket = self._bucket(feature)
+                weight = 1.0 + np.log(count) if count >= 1 else count
+                if bucket >= 0:
+                    matrix[row, bucket] += weight
+                else:
+                    matrix[row, -bucket - 1] -= weight
+        return _normalize_rows(matrix)
+
+
+class LlamaEmbedder:
+    """Sentence embeddings from a local GGUF model via llama_cpp"""
+
+    def __init__(self, model_path: str):
+        from llama_cpp import Llama
+        self._llm = Llama(model_path=model_path, embedding=True, n_ctx=LLAMA_CONTEXT, verbose=False)
+        self._lock = threading.Lock()
+        self.name = f"llama-{os.path.basename(model_path)}"
+        self.dim = self._llm.n_embd()
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        rows = []
+        with self._lock:
+            for text in texts:
+                vector = np.asarray(self._llm.embed(text[:LLAMA_MAX_CHARS]), dtype=np.float32)
+                # Models without a pooling layer return one vector per token
+                rows.append(vector.mean(axis=0) if vector.ndim == 2 else vector)
+        return _normalize_rows(np.vstack(rows) if rows else np.zeros((0, self.dim), dtype=np.float32))
+
+
+_embedders: Dict[str, object] = {}
+_embedders_lock = threading.Lock()
+
+
+def get_embedder(model_path: Optional[str] = None):
+    """
+    The process-wide embedder for a model path
+
+    Falls back to HashingEmbedder when no model is given, and, with a
+    warning, when llama_cpp is not installed or the model fails to load.
+    """
+    key = model_path or ""
+    with _embedders_lock:
+        embedder = _embedders.get(key)
+        if embedder is None:
+            if model_path:
+                try:
+                    embedder = LlamaEmbedder(model_path)
+                    logger.info(f"Embedding with {model_path} through llama_cpp ({embedder.dim} dimensions)")
+                except Exception as e:
+                    logger.warning(f"Falling back to the hashing embedder: cannot load {model_path} "
+                                   f"with llama_cpp ({type(e).__name__}: {e}). Semantic search will only "
+                                   f"match shared words and word fragments, not synonyms.")
+            if embedder is None:
+                embedder = HashingEmbedder()
+            _embedders[key] = embedder
+        return embedder
+
@@ -9,6 +9,7 @@ import os
 from pathlib import Path
 from typing import Optional, List
 from ..config import get_config, get_database_path
+from .dir_cache import get_directory_cache
 
 
 def get_vault_path() -> str:
@@ -83,29 +84,19 @@ def get_lookup_file_path(category: str, filename: str) -> str:
 
 def ensure_directory_exists(path: str) -> None:
     """Ensure a directory exists, creating it if necessary"""
-    Path(path).mkdir(parents=True, exist_ok=True)
+    if not os.path.isdir(path):
+        Path(path).mkdir(parents=True, exist_ok=True)
+        get_directory_cache().invalidate(os.path.dirname(os.path.abspath(path)))
 
 
 def list_yaml_files(directory: str) -> List[str]:
     """List all YAML files in a directory"""
-    if not os.path.exists(directory):
-        return []
-    
-    return [
-        f for f in os.listdir(directory) 
-        if f.endswith('.yaml') and not f.startswith('_')
-    ]
+    return get_directory_cache().list_files(directory, '.yaml')
 
 
 def list_directories(parent_path: str) -> List[str]:
     """List all directories in a parent path"""
-    if not os.path.exists(parent_path):
-        return []
-    
-    return [
-        d for d in os.listdir(parent_path)
-        if os.path.isdir(os.path.join(parent_path, d))
-    ]
+    return get_directory_cache().list_directories(parent_path)
 
 
 def safe_filename(filename: str) -> str:
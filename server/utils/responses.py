@@ -5,8 +5,8 @@ This module provides standardized response formats, error handling,
 and validation helpers for consistent API responses across all endpoints.
 """
 
-from typing import Dict, Any, Optional, Union, List
-from flask import jsonify, Response
+from typing import Dict, Any, Iterable, Optional, Union, List
+from flask import jsonify, Response, stream_with_context
 import logging
 
 logger = logging.getLogger(__name__)
@@ -134,6 +134,17 @@ class APIResponse:
     def internal_error(message: str = "Internal server error", error_code: str = "INTERNAL_ERROR") -> Response:
         """Create a 500 Internal Server Error response"""
         return APIResponse.error(message, 500, error_code)
+    
+    @staticmethod
+    def stream(chunks: Iterable[str], mimetype: str, filename: Optional[str] = None) -> Response:
+        """
+        Create a streaming response that sends chunks as they are produced
+        
+        Used for exports, which bypass the JSON envelope; errors must be
+        reported before the first chunk is produced.
+        """
+        headers = {"Content-Disposition": f'attachment; filename="{filename}"'} if filename else None
+        return Response(stream_with_context(chunks), mimetype=mimetype, headers=headers)
 
 
 class ValidationError(Exception):
@@ -139,6 +139,35 @@ def get_pagination_params() -> Dict[str, int]:
     return {"page": page, "page_size": page_size}
 
 
+def get_cursor_pagination_params(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Extract cursor pagination and field projection parameters
+    
+    Reads cursor, limit and fields from the request body, falling back to the
+    query string. fields may be a list or a comma-separated string.
+    
+    Args:
+        data: Request data dictionary
+        
+    Returns:
+        Dictionary with cursor, limit (None when not paginating) and fields
+    """
+    cursor = data.get("cursor") or request.args.get("cursor", "")
+    limit = data.get("limit")
+    if limit is None:
+        limit = request.args.get("limit", None, type=int)
+    
+    # Same ceiling as page_size
+    if limit is not None:
+        limit = max(1, min(100, limit))
+    
+    fields = data.get("fields") or request.args.get("fields")
+    if isinstance(fields, str):
+        fields = [name.strip() for name in fields.split(",") if name.strip()]
+    
+    return {"cursor": cursor, "limit": limit, "fields": fields or None}
+
+
 def create_list_response(items: List[Any], total: Optional[int] = None, 
                         page: Optional[int] = None, page_size: Optional[int] = None) -> APIResponse:
     """
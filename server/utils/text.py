@@ -0,0 +1,90 @@
+"""
+Text normalization utilities for Oracle Forge
+
+Shared by the lookup and search indexes so that documents and queries are
+normalized and tokenized the same way.
+"""
+
+import re
+import unicodedata
+from typing import Any, Iterable, List, Set
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def normalize_text(text: Any) -> str:
+    """Lowercase text and strip accents so 'Élan' and 'elan' compare equal"""
+    if text is None:
+        return ""
+    if not isinstance(text, str):
+        text = str(text)
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def tokenize(text: Any) -> List[str]:
+    """Split text into normalized alphanumeric tokens"""
+    return _TOKEN_PATTERN.findall(normalize_text(text))
+
+
+def trigrams(text: Any) -> Set[str]:
+    """
+    Character trigrams of each token, padded the way pg_trgm pads words
+
+    Each token is padded with two leading spaces and one trailing space, so
+    'orc' yields '  o', ' or', 'orc' and 'rc '. Word starts weigh more than
+    the middle of a word, which suits typos in names.
+    """
+    result: Set[str] = set()
+    for token in tokenize(text):
+        padded = f"  {token} "
+        result.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return result
+
+
+_WORD_PATTERN = re.compile(r"\w+")
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def make_snippet(text: Any, terms: Iterable[str], width: int = 160, mark: str = "**") -> str:
+    """
+    Excerpt of text around the densest cluster of query terms
+
+    Words whose normalized tokens include one of terms are wrapped in mark.
+    Falls back to the start of text when no term occurs; an ellipsis marks
+    cut ends.
+    """
+    text = _WHITESPACE_PATTERN.sub(" ", "" if text is None else str(text)).strip()
+    if not text:
+        return ""
+    wanted = set(terms)
+    matches = [m for m in _WORD_PATTERN.finditer(text) if wanted.intersection(tokenize(m.group()))]
+
+    start = 0
+    if matches:
+        # Pick the match followed by the most matches within one window
+        best, best_count, j = 0, 0, 0
+        for i, match in enumerate(matches):
+            while j < len(matches) and matches[j].end() - match.start() <= width:
+                j += 1
+            if j - i > best_count:
+                best, best_count = i, j - i
+        start = max(0, matches[best].start() - width // 4)
+        if start:
+            space = text.rfind(" ", 0, start)
+            start = space + 1 if space >= 0 else 0
+    end = min(len(text), start + width)
+    if end < len(text):
+        space = text.rfind(" ", start, end)
+        if space > start:
+            end = space
+
+    parts, position = [], start
+    for match in matches:
+        if match.start() >= start and match.end() <= end:
+            parts.append(text[position:match.start()])
+            parts.append(f"{mark}{match.group()}{mark}")
+            position = match.end()
+    parts.append(text[position:end])
+    snippet = "".join(parts)
+    return ("…" if start else "") + snippet + ("…" if end < len(text) else "")
@@ -0,0 +1,59 @@
+"""
+Shared test setup for Oracle Forge
+
+The server validates its configuration on import and the oracle scripts read
+cwd-relative paths, so before anything from server/ or scripts/ is imported
+this points every vault path at a throwaway vault and moves into it.
+"""
+
+import os
+import sys
+import atexit
+import shutil
+import tempfile
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+VAULT_ROOT = tempfile.mkdtemp(prefix="oracle_forge_tests_")
+for directory in ("vault/adventures", "vault/templates", "vault/tables/oracle", "vault/tables/generators",
+                  "vault/lookup", "vault/rules", "vault/index", "models", "server/state"):
+    os.makedirs(os.path.join(VAULT_ROOT, directory))
+open(os.path.join(VAULT_ROOT, "models", "model.gguf"), "wb").close()
+
+os.environ.update({
+    "ORACLE_FORGE_VAULT_PATH": os.path.join(VAULT_ROOT, "vault"),
+    "ORACLE_FORGE_VAULT_TEMPLATES_PATH": os.path.join(REPO_ROOT, "vault_templates"),
+    "ORACLE_FORGE_ADVENTURES_PATH": os.path.join(VAULT_ROOT, "vault", "adventures"),
+    "ORACLE_FORGE_TEMPLATES_PATH": os.path.join(VAULT_ROOT, "vault", "templates"),
+    "ORACLE_FORGE_TABLES_PATH": os.path.join(VAULT_ROOT, "vault", "tables"),
+    "ORACLE_FORGE_LOOKUP_PATH": os.path.join(VAULT_ROOT, "vault", "lookup"),
+    "ORACLE_FORGE_RULES_PATH": os.path.join(VAULT_ROOT, "vault", "rules"),
+    "ORACLE_FORGE_INDEX_PATH": os.path.join(VAULT_ROOT, "vault", "index"),
+    "ORACLE_FORGE_MODEL_PATH": os.path.join(VAULT_ROOT, "models", "model.gguf"),
+})
+os.chdir(VAULT_ROOT)
+
+# Registered before the server is imported, so it runs after the server's own
+# exit handlers have saved indexes and embeddings into the vault
+atexit.register(shutil.rmtree, VAULT_ROOT, ignore_errors=True)
+
+
+@pytest.fixture(scope="session")
+def app():
+    from server.app import app as flask_app
+    flask_app.config["TESTING"] = True
+    return flask_app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def vault():
+    """Root of the throwaway vault the tests run in"""
+    return VAULT_ROOT
@@ -0,0 +1,65 @@
+"""Tests for the active session document of both adventure storage engines"""
+
+import os
+
+import pytest
+
+from server.data_access.adventure_data import AdventureDataAccess
+from server.data_access.adventure_sqlite import SQLiteAdventureDataAccess
+from server.data_access.session_journal import JOURNAL_SEQ_FIELD
+from server.utils.paths import get_adventure_path
+
+
+@pytest.fixture(params=[AdventureDataAccess, SQLiteAdventureDataAccess], ids=["yaml", "sqlite"])
+def adventure(request):
+    data_access = request.param()
+    name = f"active_session_{request.param.__name__}"
+    data_access.create_adventure(name)
+    yield data_access, name
+    data_access.delete_adventure(name)
+
+
+def test_active_session_hides_the_journal_sequence(adventure):
+    data_access, name = adventure
+    data_access.append_session_log(name, {"type": "note", "content": "first"})
+    data_access.compact_session_journal(name)
+    data_access.append_session_log(name, {"type": "note", "content": "second"})
+
+    session = data_access.get_active_session(name)
+    assert JOURNAL_SEQ_FIELD not in session
+    assert [entry["content"] for entry in session["log"]] == ["first", "second"]
+
+
+def test_update_active_session_leaves_the_callers_document_alone(adventure):
+    data_access, name = adventure
+    session = {"log": [{"type": "note", "content": "kept"}]}
+    data_access.update_active_session(name, session)
+    assert session == {"log": [{"type": "note", "content": "kept"}]}
+
+    data_access.append_session_log(name, {"type": "note", "content": "after"})
+    stored = data_access.get_active_session(name)
+    assert [entry["content"] for entry in stored["log"]] == ["kept", "after"]
+    assert JOURNAL_SEQ_FIELD not in stored
+
+
+def test_new_active_session_from_template(adventure):
+    data_access, name = adventure
+    session = data_access.new_active_session_from_template(name, "session_03")
+    assert session["adventure"] == name
+    assert session["session_id"] == "session_03"
+    assert session["log"] == []
+
+
+def test_archived_session_keeps_key_order_and_unicode():
+    data_access = AdventureDataAccess()
+    name = "archive_format"
+    data_access.create_adventure(name)
+    try:
+        data_access.save_session(name, "session_01.yaml", {"summary": "Élan at the café", "adventure": name,
+                                                           "log": []})
+        with open(os.path.join(get_adventure_path(name), "sessions", "session_01.yaml"), encoding="utf-8") as f:
+            text = f.read()
+        assert text.index("summary") < text.index("adventure") < text.index("log")
+        assert "Élan at the café" in text
+    finally:
+        data_access.delete_adventure(name)
@@ -0,0 +1,37 @@
+"""Tests for the meaning oracle's table selection"""
+
+import os
+
+import yaml
+import pytest
+
+from scripts.oracle.meanings import DEFAULT_MEANING_TABLE
+
+
+def write_tables(vault, filename, names, result):
+    tables = [{"name": name, "table": [{"range": [1, 100], "result": f"{result} {name}"}]} for name in names]
+    with open(os.path.join(vault, "vault", "tables", "oracle", filename), "w") as f:
+        yaml.safe_dump(tables, f)
+
+
+@pytest.fixture
+def oracle_tables(vault):
+    # aaa_event_focus.yaml sorts first, so a default that rolled every file in name order would pick it
+    write_tables(vault, "aaa_event_focus.yaml", ["Event Focus"], "Remote event")
+    write_tables(vault, "event_focus.yaml", ["Event Focus"], "Remote event")
+    write_tables(vault, DEFAULT_MEANING_TABLE, ["Action 1", "Action 2"], "Attain")
+    write_tables(vault, "descriptions.yaml", ["Descriptor 1", "Descriptor 2"], "Bold")
+
+
+def test_default_rolls_on_the_action_tables(client, oracle_tables):
+    for _ in range(5):
+        response = client.post("/oracle/meaning", json={"question": "What happens?"})
+        assert response.status_code == 200
+        keywords = response.get_json()["data"]["keywords"]
+        assert keywords == ["Attain Action 1", "Attain Action 2"]
+
+
+def test_named_table_is_rolled(client, oracle_tables):
+    response = client.post("/oracle/meaning", json={"question": "Who?", "table": "descriptions.yaml"})
+    assert response.status_code == 200
+    assert response.get_json()["data"]["keywords"] == ["Bold Descriptor 1", "Bold Descriptor 2"]
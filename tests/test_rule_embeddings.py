@@ -0,0 +1,45 @@
+"""Tests for semantic rule search over the rule section embeddings"""
+
+import os
+import threading
+
+from server.data_access.rules_data import RuleDataAccess
+from server.data_access.rule_embeddings import RuleEmbeddingIndex
+from server.utils.embeddings import HashingEmbedder
+
+
+class BlockingEmbedder(HashingEmbedder):
+    """Hashing embedder whose section batches wait until released"""
+
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+
+    def embed(self, texts):
+        if len(texts) != 1 or not texts[0].startswith("how"):
+            assert self.release.wait(10)
+        return super().embed(texts)
+
+
+def test_search_embeds_sections_in_the_background(vault):
+    rules = os.path.join(vault, "vault", "rules", "embedtest")
+    os.makedirs(rules)
+    with open(os.path.join(rules, "resting.md"), "w") as f:
+        f.write("# Resting\n\nA short rest restores stamina and hit dice.\n")
+
+    sections = RuleDataAccess().get_section_index()
+    sections.refresh()
+    embedder = BlockingEmbedder()
+    index = RuleEmbeddingIndex(sections, embedder)
+
+    # The first search returns at once instead of embedding every section inline
+    assert index.search("how do I restore stamina", system="embedtest") == []
+
+    embedder.release.set()
+    index._sync_thread.join(10)
+    hits = index.search("how do I restore stamina", system="embedtest")
+    assert [record["title"] for record, _ in hits] == ["Resting"]
+
+
+def test_unset_model_uses_the_hashing_embedder():
+    assert RuleDataAccess().get_embedding_index().embedder.name == HashingEmbedder().name
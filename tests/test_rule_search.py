@@ -0,0 +1,37 @@
+"""Tests for text search over rule sections"""
+
+import os
+
+import pytest
+
+from server.data_access.base_data import DataAccessError
+from server.data_access.rules_data import RuleDataAccess
+
+
+def write_rule(vault, system, filename, text):
+    directory = os.path.join(vault, "vault", "rules", system)
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, filename), "w") as f:
+        f.write(text)
+
+
+def test_category_matches_rule_file_text(vault):
+    write_rule(vault, "categorytest", "melee.md",
+               "# Melee\n\n## Attacks\n\nRoll to hit.\n\n## Wrestling\n\nA Grapple pins the foe.\n")
+    write_rule(vault, "categorytest", "travel.md", "# Travel\n\n## Attacks\n\nAmbushes roll to hit.\n")
+    rules = RuleDataAccess()
+    rules.get_index().refresh()
+    rules.get_section_index().refresh()
+
+    hits = rules.search_rules("roll hit", system="categorytest", category="grapple")
+    # The file mentions grappling, so its Attacks section matches even though the section does not
+    assert [(hit["filename"], hit["title"]) for hit in hits] == [("melee.md", "Attacks")]
+    assert len(rules.search_rules("roll hit", system="categorytest")) == 2
+    assert rules.search_rules("roll hit", system="categorytest", category="swimming") == []
+
+
+def test_import_rejects_names_mapping_to_one_file(vault):
+    rules = RuleDataAccess()
+    with pytest.raises(DataAccessError, match="both map to"):
+        rules.import_rule_system("collisiontest", {"Grapple Rules": "# One\n", "Grapple/Rules.md": "# Two\n"})
+    assert "Grapple_Rules.md" not in rules.list_rules("collisiontest")
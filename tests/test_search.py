@@ -0,0 +1,26 @@
+"""Tests for the vault-wide /search endpoint"""
+
+import pytest
+
+
+@pytest.mark.parametrize("value", [["goblin", "orc"], {"name": "goblin"}, None])
+def test_non_scalar_filter_is_rejected(client, value):
+    response = client.post("/search", json={"query": "goblin", "filters": {"type": value}})
+    assert response.status_code == 400
+    assert "Filter 'type'" in response.get_json()["error"]["message"]
+
+
+@pytest.mark.parametrize("facets", [[["type"]], [{"name": "type"}], [1]])
+def test_non_string_facet_is_rejected(client, facets):
+    response = client.post("/search", json={"query": "goblin", "facets": facets})
+    assert response.status_code == 400
+    assert "Facets" in response.get_json()["error"]["message"]
+
+
+def test_scalar_filters_and_facets_are_accepted(client):
+    response = client.post("/search", json={"query": "goblin", "filters": {"type": "humanoid", "cr": 1},
+                                            "facets": ["type"]})
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["success"] is True
+    assert body["data"]["hits"] == []
@@ -0,0 +1,157 @@
+"""
+Concurrency test for the session log
+
+Worker processes, each running several threads, append log entries to one
+adventure's active session while other threads read the log and call
+end_session(). Afterwards every entry a worker appended successfully must
+appear exactly once across the archived sessions and the active session, and
+every entry read back, during the run or after it, must be intact.
+
+Each entry's content is "<worker>:<n>:<padding>:<crc32>", so a torn or
+half-merged entry fails its checksum. The LLM summary is replaced with a
+short sleep, which widens the window in which entries land while a session
+is being summarized.
+"""
+
+import time
+import zlib
+import random
+import threading
+import multiprocessing
+
+import pytest
+
+from server.services.session_service import SessionService
+from server.data_access.adventure_data import AdventureDataAccess
+from server.data_access.adventure_sqlite import SQLiteAdventureDataAccess
+
+PROCESSES = 3
+THREADS = 3
+ENTRIES = 40
+PAUSE = 0.005
+END_INTERVAL = 0.1
+SUMMARY_DELAY = 0.05
+
+# end_session outcomes that are expected when several requests end the session at once
+EXPECTED_END_ERRORS = {
+    "No session log to summarize",
+    "Session was ended by another request while it was being summarized",
+}
+
+
+class StressSessionService(SessionService):
+    """SessionService pinned to one adventure and engine, with a sleep in place of the LLM summary"""
+
+    def __init__(self, engine, adventure_name):
+        super().__init__()
+        self.data_access = engine()
+        self.adventure_name = adventure_name
+
+    def get_active_adventure(self):
+        return self.adventure_name
+
+    def _summarize_log(self, log):
+        time.sleep(SUMMARY_DELAY)
+        return self._generate_fallback_summary(log)
+
+
+def make_content(tag):
+    padding = "x" * random.randint(0, 400)
+    body = f"{tag}:{padding}"
+    return f"{body}:{zlib.crc32(body.encode('utf-8')):08x}"
+
+
+def check_entry(entry):
+    """The tag of an intact entry, or None if it is torn"""
+    content = entry.get("content") if isinstance(entry, dict) else None
+    if not isinstance(content, str):
+        return None
+    body, _, crc = content.rpartition(":")
+    if crc != f"{zlib.crc32(body.encode('utf-8')):08x}":
+        return None
+    worker, n, _ = body.split(":", 2)
+    return f"{worker}:{n}"
+
+
+def appender(service, worker, appended, errors):
+    for n in range(ENTRIES):
+        time.sleep(random.uniform(0, PAUSE))
+        tag = f"{worker}:{n}"
+        result = service.append_session_log({"type": "stress", "content": make_content(tag)})
+        if result.get("success"):
+            appended.append(tag)
+        else:
+            errors.append(f"append {tag}: {result.get('error')}")
+
+
+def reader(service, stop, errors):
+    while not stop.is_set():
+        result = service.get_session_log()
+        if not result.get("success"):
+            errors.append(f"read: {result.get('error')}")
+            continue
+        torn = [entry for entry in result["log"] if check_entry(entry) is None]
+        if torn:
+            errors.append(f"read {len(torn)} torn entries, e.g. {torn[0]!r:.120}")
+
+
+def ender(service, stop, ended, errors):
+    while not stop.wait(END_INTERVAL):
+        result = service.end_session()
+        if result.get("success"):
+            ended.append(result["session_id"])
+        elif result.get("error") not in EXPECTED_END_ERRORS:
+            errors.append(f"end_session: {result.get('error')}")
+
+
+def run_worker(process, engine, adventure_name):
+    """One process: appender threads plus a reader and an end_session thread; returns (appended, ended, errors)"""
+    service = StressSessionService(engine, adventure_name)
+    appended, ended, errors = [], [], []
+    stop = threading.Event()
+    background = [threading.Thread(target=reader, args=(service, stop, errors)),
+                  threading.Thread(target=ender, args=(service, stop, ended, errors))]
+    workers = [threading.Thread(target=appender, args=(service, f"p{process}t{thread}", appended, errors))
+               for thread in range(THREADS)]
+    for thread in background + workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    stop.set()
+    for thread in background:
+        thread.join()
+    return appended, ended, errors
+
+
+def collect(data_access, adventure_name):
+    """Every log entry of the archived sessions and the active session"""
+    entries = []
+    for filename in data_access.list_sessions(adventure_name):
+        entries += data_access.get_session(adventure_name, filename).get("log") or []
+    entries += data_access.get_active_session(adventure_name).get("log") or []
+    return entries
+
+
+@pytest.mark.parametrize("engine", [AdventureDataAccess, SQLiteAdventureDataAccess], ids=["yaml", "sqlite"])
+def test_concurrent_appends_reads_and_end_session(engine):
+    adventure_name = f"session_stress_{engine.__name__}"
+    data_access = engine()
+    data_access.create_adventure(adventure_name)
+    try:
+        with multiprocessing.get_context("fork").Pool(PROCESSES) as pool:
+            results = pool.starmap(run_worker, [(process, engine, adventure_name) for process in range(PROCESSES)])
+
+        appended = [tag for tags, _, _ in results for tag in tags]
+        ended = [session_id for _, session_ids, _ in results for session_id in session_ids]
+        errors = [error for _, _, worker_errors in results for error in worker_errors]
+        assert errors == []
+        assert len(appended) == PROCESSES * THREADS * ENTRIES
+        assert ended, "no end_session call succeeded"
+        # Two end_session calls archiving under one session id overwrite each other
+        assert len(set(ended)) == len(ended)
+
+        tags = [check_entry(entry) for entry in collect(data_access, adventure_name)]
+        assert None not in tags, "torn entries in storage"
+        assert sorted(tags) == sorted(appended)
+    finally:
+        data_access.delete_adventure(adventure_name)
@@ -0,0 +1,27 @@
+"""GET /templates/<path> must not serve files outside vault_templates"""
+
+import pytest
+
+from server.data_access.template_registry import get_template_registry
+
+ESCAPES = [
+    "/templates/../../../../../../etc/passwd",
+    "/templates/..%2F..%2F..%2F..%2F..%2Fetc%2Fpasswd",
+    "/templates/..%2F..%2F..%2F..%2F..%2Fetc%2Fpasswd.yaml",
+    "/templates/%2Fetc%2Fpasswd",
+    "/templates/adventures/../../server/config.py",
+]
+
+
+@pytest.mark.parametrize("url", ESCAPES)
+def test_escape_is_refused(client, url):
+    response = client.get(url)
+    assert response.status_code != 200
+    assert "root:" not in response.get_data(as_text=True)
+    assert not [entry["name"] for entry in get_template_registry().list_templates() if ".." in entry["name"]]
+
+
+def test_template_is_served(client):
+    templates = get_template_registry().list_templates()
+    assert templates
+    assert client.get(f"/templates/{templates[0]['name']}").status_code == 200
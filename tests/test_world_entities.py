@@ -0,0 +1,33 @@
+"""Tests for the bulk world entity endpoint"""
+
+import pytest
+
+from server.services.adventure_service import AdventureService
+
+
+@pytest.fixture
+def adventure():
+    service = AdventureService()
+    service.data_access.create_adventure("bulk_world")
+    yield "bulk_world"
+    service.data_access.delete_adventure("bulk_world")
+
+
+def test_bulk_upsert_creates_and_updates(client, adventure):
+    url = f"/adventures/{adventure}/world/npcs"
+    response = client.post(url, json={"entities": [{"name": "Ann"}, {"name": "Bob"}]})
+    assert response.status_code == 200
+    assert response.get_json()["data"]["message"] == "2 created, 0 updated"
+
+    response = client.post(url, json={"entities": [{"name": "Ann", "mood": "wary"}]})
+    assert response.get_json()["data"]["message"] == "0 created, 1 updated"
+
+
+@pytest.mark.parametrize("names", [["Ann", "Ann"], ["Old Tom", "Old/Tom"]])
+def test_bulk_upsert_rejects_duplicate_names(client, adventure, names):
+    response = client.post(f"/adventures/{adventure}/world/npcs",
+                           json={"entities": [{"name": name, "role": str(n)} for n, name in enumerate(names)]})
+    assert response.status_code == 400
+    assert "index 0 and 1" in response.get_json()["error"]["message"]
+    listed = client.get(f"/adventures/{adventure}/world/npcs").get_json()["data"]
+    assert listed == []